@@ -17,6 +17,7 @@ from app.doctors.models import Doctor
 from app.pets.models import Pet
 from app.appointments.models import Appointment
 from app.clients.models import Client
+from app.core.leases import JobLease
 
 config = context.config
 
@@ -25,6 +26,11 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+
+def include_name(name, type_, parent_names) -> bool:
+    # The client search FTS5 table and its shadow tables are managed by hand (see app/clients/search.py).
+    return not (type_ == "table" and name.startswith("client_search"))
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
@@ -33,7 +39,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
-        render_as_batch=True
+        render_as_batch=True,
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -41,7 +48,9 @@ def run_migrations_offline() -> None:
 
 def do_run_migrations(connection: Connection) -> None:
     """Синхронная функция, которая выполняется внутри async-контекста"""
-    context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+    context.configure(
+        connection=connection, target_metadata=target_metadata, render_as_batch=True, include_name=include_name
+    )
 
     with context.begin_transaction():
         context.run_migrations()
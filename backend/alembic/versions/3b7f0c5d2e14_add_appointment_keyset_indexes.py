@@ -0,0 +1,34 @@
+"""Add appointment keyset indexes
+
+Revision ID: 3b7f0c5d2e14
+Revises: 8e4b6d21c9a7
+Create Date: 2026-10-18 14:05:12.408331
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7f0c5d2e14'
+down_revision: Union[str, Sequence[str], None] = '8e4b6d21c9a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.create_index('ix_appointments_client_id_date_time_id', ['client_id', 'date_time', 'id'], unique=False)
+        batch_op.create_index('ix_appointments_doctor_id_date_time_id', ['doctor_id', 'date_time', 'id'], unique=False)
+        batch_op.create_index('ix_appointments_date_time_id', ['date_time', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_index('ix_appointments_date_time_id')
+        batch_op.drop_index('ix_appointments_doctor_id_date_time_id')
+        batch_op.drop_index('ix_appointments_client_id_date_time_id')
@@ -0,0 +1,48 @@
+"""Add job leases and no-show appointment status
+
+Revision ID: 6d2a9f4c1b83
+Revises: 3b7f0c5d2e14
+Create Date: 2026-10-18 16:42:07.915204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d2a9f4c1b83'
+down_revision: Union[str, Sequence[str], None] = '3b7f0c5d2e14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE appointmentstatus ADD VALUE IF NOT EXISTS 'NO_SHOW'")
+
+    op.create_table(
+        'job_leases',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('holder', sa.String(length=128), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_appointments_planned_date_time', ['date_time'], unique=False,
+            sqlite_where=sa.text("status = 'PLANNED'"),
+            postgresql_where=sa.text("status = 'PLANNED'"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The enum value itself stays on PostgreSQL; no row uses it after this.
+    op.execute("UPDATE appointments SET status = 'PLANNED' WHERE status = 'NO_SHOW'")
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_index('ix_appointments_planned_date_time')
+    op.drop_table('job_leases')
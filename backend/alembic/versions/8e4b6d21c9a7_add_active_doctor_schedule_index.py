@@ -0,0 +1,36 @@
+"""Add active doctor schedule index
+
+Revision ID: 8e4b6d21c9a7
+Revises: 5c1e2a9d7f30
+Create Date: 2026-10-18 11:40:05.731094
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4b6d21c9a7'
+down_revision: Union[str, Sequence[str], None] = '5c1e2a9d7f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_appointments_doctor_id_date_time_active',
+            ['doctor_id', 'date_time'],
+            unique=False,
+            sqlite_where=sa.text("status != 'CANCELLED'"),
+            postgresql_where=sa.text("status != 'CANCELLED'"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_index('ix_appointments_doctor_id_date_time_active')
@@ -0,0 +1,53 @@
+"""Add doctor directory indexes
+
+Revision ID: 9a4e7c2f5d16
+Revises: 6d2a9f4c1b83
+Create Date: 2026-10-18 18:20:44.301957
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.search_keys import search_key
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4e7c2f5d16'
+down_revision: Union[str, Sequence[str], None] = '6d2a9f4c1b83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('doctors', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('full_name_key', sa.String(), nullable=True))
+
+    # Folded in Python, the same way the app writes it; SQL lower() would fold ASCII only.
+    doctors = sa.table('doctors', sa.column('id'), sa.column('full_name'), sa.column('full_name_key'))
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(doctors.c.id, doctors.c.full_name)).all()
+    if rows:
+        bind.execute(
+            doctors.update().where(doctors.c.id == sa.bindparam('doctor_id')).values(full_name_key=sa.bindparam('key')),
+            [{'doctor_id': doctor_id, 'key': search_key(full_name)} for doctor_id, full_name in rows],
+        )
+
+    with op.batch_alter_table('doctors', schema=None) as batch_op:
+        batch_op.alter_column('full_name_key', existing_type=sa.String(), nullable=False)
+        batch_op.create_index('ix_doctors_specialization_experience_years', ['specialization', 'experience_years'], unique=False)
+        batch_op.create_index('ix_doctors_specialization_full_name_key', ['specialization', 'full_name_key'], unique=False)
+        batch_op.create_index('ix_doctors_experience_years', ['experience_years'], unique=False)
+        batch_op.create_index('ix_doctors_full_name_key', ['full_name_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('doctors', schema=None) as batch_op:
+        batch_op.drop_index('ix_doctors_full_name_key')
+        batch_op.drop_index('ix_doctors_experience_years')
+        batch_op.drop_index('ix_doctors_specialization_full_name_key')
+        batch_op.drop_index('ix_doctors_specialization_experience_years')
+        batch_op.drop_column('full_name_key')
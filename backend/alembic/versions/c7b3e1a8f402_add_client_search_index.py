@@ -0,0 +1,55 @@
+"""Add client search index
+
+Revision ID: c7b3e1a8f402
+Revises: 9a4e7c2f5d16
+Create Date: 2026-10-18 19:05:31.662840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.clients.search import digits
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7b3e1a8f402'
+down_revision: Union[str, Sequence[str], None] = '9a4e7c2f5d16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # FTS5 is SQLite-only; other databases search with plain substring filters.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE client_search "
+        "USING fts5(full_name, phone_digits, email, tokenize='trigram')"
+    )
+    op.execute("INSERT INTO client_search (client_search, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)')")
+    # Phone digits come from the same digits() the app indexes with, not a SQL approximation of it.
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT c.id, c.full_name, c.phone_number, u.email FROM clients c JOIN users u ON u.id = c.user_id"
+    )).all()
+    if rows:
+        bind.execute(
+            sa.text(
+                "INSERT INTO client_search (rowid, full_name, phone_digits, email) "
+                "VALUES (:rowid, :full_name, :phone_digits, :email)"
+            ),
+            [
+                {"rowid": client_id, "full_name": full_name, "phone_digits": digits(phone), "email": email}
+                for client_id, full_name, phone, email in rows
+            ],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TABLE client_search")
@@ -0,0 +1,75 @@
+"""Add pet search indexes
+
+Revision ID: e2f8a4c6b931
+Revises: c7b3e1a8f402
+Create Date: 2026-10-18 20:41:27.363143
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.search_keys import search_key
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f8a4c6b931'
+down_revision: Union[str, Sequence[str], None] = 'c7b3e1a8f402'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _backfill(table_name: str, *sources: str) -> None:
+    """Fill <source>_key from <source> in Python, the same way the app writes it; SQL lower() folds ASCII only."""
+    table = sa.table(table_name, sa.column('id'), *(sa.column(name) for name in sources),
+                     *(sa.column(f'{name}_key') for name in sources))
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(table.c.id, *(table.c[name] for name in sources))).all()
+    if rows:
+        bind.execute(
+            table.update().where(table.c.id == sa.bindparam('row_id'))
+            .values({f'{name}_key': sa.bindparam(f'{name}_value') for name in sources}),
+            [
+                {'row_id': row[0], **{f'{name}_value': search_key(value) for name, value in zip(sources, row[1:])}}
+                for row in rows
+            ],
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('clients', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('full_name_key', sa.String(), nullable=True))
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('name_key', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('breed_key', sa.String(), nullable=True))
+
+    _backfill('clients', 'full_name')
+    _backfill('pets', 'name', 'breed')
+
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.alter_column('name_key', existing_type=sa.String(), nullable=False)
+        batch_op.create_index('ix_pets_name_key', ['name_key'], unique=False)
+        batch_op.create_index('ix_pets_species_name_key', ['species', 'name_key'], unique=False)
+        batch_op.create_index('ix_pets_breed_key_name_key', ['breed_key', 'name_key'], unique=False)
+        batch_op.create_index('ix_pets_owner_id_name_key', ['owner_id', 'name_key'], unique=False)
+
+    with op.batch_alter_table('clients', schema=None) as batch_op:
+        batch_op.alter_column('full_name_key', existing_type=sa.String(), nullable=False)
+        batch_op.create_index('ix_clients_full_name_key', ['full_name_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('clients', schema=None) as batch_op:
+        batch_op.drop_index('ix_clients_full_name_key')
+        batch_op.drop_column('full_name_key')
+
+    with op.batch_alter_table('pets', schema=None) as batch_op:
+        batch_op.drop_index('ix_pets_owner_id_name_key')
+        batch_op.drop_index('ix_pets_breed_key_name_key')
+        batch_op.drop_index('ix_pets_species_name_key')
+        batch_op.drop_index('ix_pets_name_key')
+        batch_op.drop_column('breed_key')
+        batch_op.drop_column('name_key')
@@ -0,0 +1,30 @@
+"""Add pet history index
+
+Revision ID: f4a1c9d7e253
+Revises: e2f8a4c6b931
+Create Date: 2026-10-18 21:32:05.918240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a1c9d7e253'
+down_revision: Union[str, Sequence[str], None] = 'e2f8a4c6b931'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.create_index('ix_appointments_pet_id_date_time_id', ['pet_id', 'date_time', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_index('ix_appointments_pet_id_date_time_id')
@@ -0,0 +1,162 @@
+import asyncio
+import json
+from collections import deque
+from datetime import datetime, timezone
+from typing import Hashable, Iterable
+
+from app.core import metrics
+from app.core.config import settings
+
+Topic = tuple[str, int]  # ("doctor", id) or ("client", id)
+
+
+def doctor_topic(doctor_id: int) -> Topic:
+    return ("doctor", doctor_id)
+
+
+def client_topic(client_id: int) -> Topic:
+    return ("client", client_id)
+
+
+class Subscription:
+    """Pending events of one subscriber, capped at `max_pending`.
+
+    An idle subscriber costs one empty deque and one asyncio.Event. A subscriber
+    that falls `max_pending` events behind is marked `overflowed` and dropped by
+    the bus; it should reload its data and reconnect.
+    """
+    __slots__ = ("topics", "overflowed", "_pending", "_max_pending", "_ready")
+
+    def __init__(self, topics: frozenset[Topic], max_pending: int):
+        self.topics = topics
+        self.overflowed = False
+        self._pending: deque[tuple[str, str]] = deque()
+        self._max_pending = max_pending
+        self._ready = asyncio.Event()
+
+    def push(self, event: tuple[str, str]) -> bool:
+        if len(self._pending) >= self._max_pending:
+            self.overflowed = True
+            self._pending.clear()
+            self._ready.set()
+            return False
+        self._pending.append(event)
+        self._ready.set()
+        return True
+
+    async def next_batch(self, timeout: float) -> list[tuple[str, str]]:
+        """Everything pending, waiting up to `timeout` seconds; [] on timeout or overflow."""
+        if not self._pending and not self.overflowed:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        self._ready.clear()
+        batch = list(self._pending)
+        self._pending.clear()
+        return batch
+
+
+class ScheduleEvents:
+    """In-process fan-out of appointment changes to subscribers of doctor and client topics.
+
+    Each event is serialized once and pushed without awaiting, so a write never
+    waits on a slow reader. Only writes handled by this worker are seen.
+    """
+
+    def __init__(self, max_subscribers: int, max_pending: int):
+        self.max_subscribers = max_subscribers
+        self.max_pending = max_pending
+        self._topics: dict[Hashable, set[Subscription]] = {}
+        self._count = 0
+
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.rejected = 0
+
+    @property
+    def full(self) -> bool:
+        return self._count >= self.max_subscribers
+
+    def subscribe(self, topics: Iterable[Topic]) -> Subscription | None:
+        """Register a subscriber; None once `max_subscribers` are connected."""
+        if self.full:
+            self.rejected += 1
+            return None
+        subscription = Subscription(frozenset(topics), self.max_pending)
+        for topic in subscription.topics:
+            self._topics.setdefault(topic, set()).add(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        removed = False
+        for topic in subscription.topics:
+            subscribers = self._topics.get(topic)
+            if subscribers is not None and subscription in subscribers:
+                subscribers.discard(subscription)
+                removed = True
+                if not subscribers:
+                    del self._topics[topic]
+        if removed:
+            self._count -= 1
+
+    def publish(self, kind: str, topics: Iterable[Topic], payload: dict) -> None:
+        self.published += 1
+        targets: set[Subscription] = set()
+        for topic in topics:
+            targets.update(self._topics.get(topic, ()))
+        if not targets:
+            return
+
+        event = (kind, json.dumps(payload, separators=(",", ":"), default=_json_default))
+        for subscription in targets:
+            if subscription.push(event):
+                self.delivered += 1
+            else:
+                self.dropped += 1
+                self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": self._count,
+            "topics": len(self._topics),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+        }
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        if value.tzinfo is None:  # naive datetimes are UTC throughout the app
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+schedule_events = ScheduleEvents(
+    max_subscribers=settings.EVENTS_MAX_SUBSCRIBERS,
+    max_pending=settings.EVENTS_QUEUE_SIZE,
+)
+metrics.register("schedule_events", schedule_events.stats)
+
+
+def publish_appointment(kind: str, appointment) -> None:
+    """Tell subscribers of the doctor and the client about a committed change.
+
+    `appointment` is an Appointment or a row with the same columns.
+    """
+    schedule_events.publish(
+        kind,
+        (doctor_topic(appointment.doctor_id), client_topic(appointment.client_id)),
+        {
+            "id": appointment.id,
+            "doctor_id": appointment.doctor_id,
+            "date_time": appointment.date_time,
+            "duration_minutes": appointment.duration_minutes,
+            "status": appointment.status.value,
+        },
+    )
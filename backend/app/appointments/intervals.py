@@ -0,0 +1,50 @@
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterable, Iterator
+
+
+class BusyIntervals:
+    """Busy time of one doctor as sorted, disjoint half-open [start, end) blocks.
+
+    Overlapping or touching bookings are merged on insert, so both `starts` and
+    `ends` stay sorted and every lookup is a binary search. Blocks cannot be
+    split again: after a cancellation, rebuild from the remaining bookings.
+    Works with any ordered values (datetimes, minutes since epoch, ...).
+    """
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, intervals: Iterable[tuple[Any, Any]] = ()):
+        self._starts: list = []
+        self._ends: list = []
+        for start, end in sorted(intervals):
+            if start >= end:
+                continue
+            if self._ends and start <= self._ends[-1]:
+                self._ends[-1] = max(self._ends[-1], end)
+            else:
+                self._starts.append(start)
+                self._ends.append(end)
+
+    def add(self, start, end) -> None:
+        if start >= end:
+            return
+        lo = bisect_left(self._ends, start)    # first block ending at or after `start`
+        hi = bisect_right(self._starts, end)   # blocks starting at or before `end`
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            end = max(end, self._ends[hi - 1])
+        self._starts[lo:hi] = [start]
+        self._ends[lo:hi] = [end]
+
+    def overlaps(self, start, end) -> bool:
+        """True if [start, end) shares any time with a busy block."""
+        i = bisect_right(self._ends, start)  # first block ending after `start`
+        return i < len(self._starts) and self._starts[i] < end and start < end
+
+    def __iter__(self) -> Iterator[tuple[Any, Any]]:
+        return zip(self._starts, self._ends)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __bool__(self) -> bool:
+        return bool(self._starts)
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey, Text, DateTime, Enum
+from sqlalchemy import ForeignKey, Text, DateTime, Enum, Index, literal_column, text
 
 from app.core.models import TimestampMixin
 from datetime import datetime, timezone
@@ -16,9 +16,32 @@ class AppointmentStatus(str, enum.Enum):
     PLANNED = "planned"
     COMPLETED = "completed"
     CANCELLED = "cancelled"
+    NO_SHOW = "no_show"  # set by the sweeper once a planned visit is long past
 
 class Appointment(Base, TimestampMixin):
     __tablename__ = "appointments"
+    __table_args__ = (
+        # Conflict and slot lookups only care about non-cancelled rows of one doctor.
+        Index(
+            "ix_appointments_doctor_id_date_time_active",
+            "doctor_id", "date_time",
+            sqlite_where=text("status != 'CANCELLED'"),
+            postgresql_where=text("status != 'CANCELLED'"),
+        ),
+        # Keyset pagination of the appointment list, per client, per doctor and for admins.
+        Index("ix_appointments_client_id_date_time_id", "client_id", "date_time", "id"),
+        Index("ix_appointments_doctor_id_date_time_id", "doctor_id", "date_time", "id"),
+        Index("ix_appointments_date_time_id", "date_time", "id"),
+        # A pet's medical history, newest first.
+        Index("ix_appointments_pet_id_date_time_id", "pet_id", "date_time", "id"),
+        # The sweeper scans planned rows by time; swept rows drop out, so this stays small.
+        Index(
+            "ix_appointments_planned_date_time",
+            "date_time",
+            sqlite_where=text("status = 'PLANNED'"),
+            postgresql_where=text("status = 'PLANNED'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     date_time: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -41,3 +64,9 @@ class Appointment(Base, TimestampMixin):
 
     def complete(self):
         self.status = AppointmentStatus.COMPLETED
+
+
+# Rendered as a literal rather than a bound parameter so the planner can match it
+# against the predicate of ix_appointments_doctor_id_date_time_active.
+ACTIVE_APPOINTMENT = Appointment.status != literal_column("'CANCELLED'")
+PLANNED_APPOINTMENT = Appointment.status == literal_column("'PLANNED'")
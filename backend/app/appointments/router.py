@@ -1,66 +1,178 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from typing import List, Optional
-from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from typing import Annotated, List, Literal, Optional, Union
+from datetime import date, datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from app.core.config import settings
 from app.core.db import SessionDep
+from app.core.etag import apply_etag
 from app.users.dependencies import get_current_user, get_current_admin
-from app.users.models import User
+from app.users.principal import Principal
 from app.appointments import schemas, service
+from app.core.totals import TotalsMode
+from app.doctors.models import DoctorSpecialization
 
 router = APIRouter(prefix="/appointments", tags=["Appointments"])
 
 
 class PaginatedAppointments(BaseModel):
+    view: Literal["full"] = "full"
     items: List[schemas.AppointmentRead]
-    total: int
+    total: Optional[int]
+    next_cursor: Optional[str] = None
+
+
+class PaginatedAppointmentSummaries(BaseModel):
+    view: Literal["compact"] = "compact"
+    items: List[schemas.AppointmentSummaryRead]
+    total: Optional[int]
+    next_cursor: Optional[str] = None
+
+
+AppointmentPage = Annotated[Union[PaginatedAppointments, PaginatedAppointmentSummaries], Field(discriminator="view")]
 
 
 @router.post("/", response_model=schemas.AppointmentRead)
 async def create_appointment(
         appointment_in: schemas.AppointmentCreate,
         db: SessionDep,
-        current_user: User = Depends(get_current_user),
+        current_user: Principal = Depends(get_current_user),
 ):
     """Create a new appointment. Only clients can book appointments."""
     return await service.create_appointment_for_client(db, appointment_in, current_user)
 
 
-@router.get("/", response_model=PaginatedAppointments)
+@router.post("/series", response_model=List[schemas.AppointmentRead])
+async def create_appointment_series(
+        series_in: schemas.AppointmentSeriesCreate,
+        db: SessionDep,
+        current_user: Principal = Depends(get_current_user),
+):
+    """Book a series of appointments (explicit dates or a recurrence rule), all or nothing."""
+    return await service.create_appointment_series_for_client(db, series_in, current_user)
+
+
+@router.get("/", response_model=AppointmentPage)
 async def read_appointments(
+        response: Response,
         db: SessionDep,
-        page: int = 1,
-        limit: int = 100,
+        page: int = Query(1, ge=1, description="Page number; prefer `cursor` for deep pages"),
+        limit: int = Query(100, ge=1, description=f"Rows per page; values above {service.MAX_PAGE_SIZE} are clamped"),
+        cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page"),
+        totals: TotalsMode = Query(TotalsMode.EXACT, description="exact, cached (kept current on writes) or none"),
+        view: schemas.AppointmentView = Query(schemas.AppointmentView.FULL, description="compact: ids and names only"),
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        current_user: User = Depends(get_current_user),
+        if_none_match: Optional[str] = Header(None),
+        current_user: Principal = Depends(get_current_user),
 ):
-    items, total = await service.get_appointments_for_user(
+    # Clamped rather than rejected: the list used to accept any limit, and old clients still send large ones.
+    limit = min(limit, service.MAX_PAGE_SIZE)
+    etag, total = await service.appointment_list_version(
+        db, current_user, page, limit, start_date, end_date, cursor, totals, view
+    )
+    apply_etag(response, if_none_match, etag, cache_control="private, no-cache")
+    items, total, next_cursor = await service.get_appointments_for_user(
         db,
         current_user,
         page,
         limit,
         start_date,
-        end_date
+        end_date,
+        cursor,
+        totals,
+        view,
+        total=total,
     )
-    return {"items": items, "total": total}
+    return {"view": view.value, "items": items, "total": total, "next_cursor": next_cursor}
 
 
 @router.get("/slots", response_model=List[str])
 async def get_available_slots(
+        response: Response,
         db: SessionDep,
         doctor_id: int = Query(..., description="Doctor ID"),
         date: str = Query(..., description="Date in YYYY-MM-DD format"),
+        if_none_match: Optional[str] = Header(None),
 ):
+    apply_etag(response, if_none_match, await service.slots_version(db, doctor_id, date))
     return await service.get_slots_by_date_string(db, doctor_id, date)
 
 
+@router.get("/slots/search", response_model=List[schemas.FreeSlot])
+async def search_free_slots(
+        db: SessionDep,
+        start_date: date = Query(..., description="First day to search (YYYY-MM-DD)"),
+        end_date: date = Query(..., description="Last day to search, inclusive (YYYY-MM-DD)"),
+        specialization: Optional[DoctorSpecialization] = None,
+        doctor_ids: Optional[List[int]] = Query(None, description="Restrict to these doctors"),
+        limit: int = Query(10, ge=1, le=100, description="How many slots to return"),
+):
+    """Earliest free slots across several doctors and days, ordered by time."""
+    return await service.find_free_slots(db, start_date, end_date, limit, specialization, doctor_ids)
+
+
+@router.get("/calendar", response_model=schemas.CalendarLoad)
+async def get_calendar_load(
+        response: Response,
+        db: SessionDep,
+        start_date: date = Query(..., description="First day (YYYY-MM-DD)"),
+        end_date: date = Query(..., description="Last day, inclusive (YYYY-MM-DD)"),
+        specialization: Optional[DoctorSpecialization] = None,
+        doctor_ids: Optional[List[int]] = Query(None, description="Restrict to these doctors"),
+        current_user: Principal = Depends(get_current_user),
+):
+    """How busy each doctor is on each day, for calendar heat-maps."""
+    response.headers["Cache-Control"] = f"private, max-age={int(settings.CALENDAR_CACHE_TTL_SECONDS)}"
+    return await service.get_calendar_load(db, start_date, end_date, specialization, doctor_ids)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_appointments(
+        format: Literal["ndjson", "csv"] = "ndjson",
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        doctor_ids: Optional[List[int]] = Query(None, description="Restrict to these doctors"),
+        cursor: Optional[str] = Query(None, description="Resume after the row carrying this cursor (last received)"),
+        admin: Principal = Depends(get_current_admin),
+):
+    """Stream every matching appointment, ordered by time, as NDJSON or CSV. Admin only.
+
+    Every row ends with its `cursor`; pass the last one received to resume an interrupted download.
+    """
+    stmt = service.build_export_query(start_date, end_date, doctor_ids, cursor)
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        service.stream_export(stmt, format, header=cursor is None),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="appointments.{format}"'},
+    )
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def schedule_events(
+        doctor_ids: Optional[List[int]] = Query(None, description="Doctors to watch, besides your own profile"),
+        current_user: Principal = Depends(get_current_user),
+):
+    """Server-sent `booked`, `cancelled`, `completed`, `no_show` and `deleted` events.
+
+    Replaces polling slots and lists.
+    """
+    topics = service.schedule_topics(current_user, doctor_ids)
+    return StreamingResponse(
+        service.stream_schedule_events(topics),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{appointment_id}", response_model=schemas.AppointmentRead)
 async def read_appointment(
         appointment_id: int,
         db: SessionDep,
-        current_user: User = Depends(get_current_user),
+        current_user: Principal = Depends(get_current_user),
 ):
     return await service.get_appointment_or_404(db, appointment_id)
 
@@ -69,7 +181,7 @@ async def read_appointment(
 async def cancel_appointment(
         appointment_id: int,
         db: SessionDep,
-        current_user: User = Depends(get_current_user),
+        current_user: Principal = Depends(get_current_user),
 ):
     return await service.cancel_appointment(db, appointment_id, current_user)
 
@@ -78,7 +190,7 @@ async def cancel_appointment(
 async def complete_appointment(
         appointment_id: int,
         db: SessionDep,
-        current_user: User = Depends(get_current_user),
+        current_user: Principal = Depends(get_current_user),
 ):
     """Complete an appointment. Only doctors can complete appointments."""
     return await service.complete_appointment(db, appointment_id, current_user)
@@ -88,6 +200,6 @@ async def complete_appointment(
 async def delete_appointment(
         appointment_id: int,
         db: SessionDep,
-        admin: User = Depends(get_current_admin),
+        admin: Principal = Depends(get_current_admin),
 ):
     await service.delete_appointment(db, appointment_id)
\ No newline at end of file
@@ -0,0 +1,286 @@
+import sys
+import time
+from array import array
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.appointments.intervals import BusyIntervals
+from app.appointments.models import ACTIVE_APPOINTMENT, Appointment
+from app.core import metrics
+from app.core.config import settings
+
+APPOINTMENT_DURATION = timedelta(minutes=45)
+MIN_APPOINTMENT_MINUTES = 15
+MAX_APPOINTMENT_MINUTES = 240
+MAX_APPOINTMENT_DURATION = timedelta(minutes=MAX_APPOINTMENT_MINUTES)
+WORK_START = 9
+WORK_END = 17
+
+SLOT_MINUTES = int(APPOINTMENT_DURATION.total_seconds() // 60)
+SLOTS_PER_DAY = -(-(WORK_END - WORK_START) * 60 // SLOT_MINUTES)  # 9:00 .. 16:30 -> 11
+DAY_BITS = 16  # one array('H') cell per day
+FULL_DAY = (1 << SLOTS_PER_DAY) - 1
+
+
+def slot_start(day: date, slot: int) -> datetime:
+    """Naive UTC start of slot `slot` on `day`."""
+    return datetime(day.year, day.month, day.day, WORK_START) + slot * APPOINTMENT_DURATION
+
+
+def slot_mask(start: datetime, duration: timedelta) -> int:
+    """Bits of the day grid overlapped by [start, start + duration); `start` is naive UTC."""
+    day_open = datetime(start.year, start.month, start.day, WORK_START)
+    first = (start - day_open) // APPOINTMENT_DURATION
+    last = -(-(start + duration - day_open) // APPOINTMENT_DURATION)
+    first, last = max(first, 0), min(last, SLOTS_PER_DAY)
+    if first >= last:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def busy_mask(busy: BusyIntervals) -> int:
+    """Grid slots of one day blocked by any busy block (naive UTC datetimes)."""
+    mask = 0
+    for start, end in busy:
+        mask |= slot_mask(start, end - start)
+    return mask
+
+
+def iter_bits(mask: int) -> Iterable[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class _DoctorDays:
+    """Contiguous per-day arrays for one doctor, addressed by date ordinal."""
+    __slots__ = ("base", "booked", "loaded_at")
+
+    def __init__(self):
+        self.base = 0
+        self.booked = array("H")
+        self.loaded_at = array("d")
+
+    def ensure_span(self, first: int, last: int, max_days: int) -> None:
+        """Cover days first..last, keeping at most `max_days` by dropping days from the far end."""
+        if last - first + 1 > max_days:
+            raise ValueError(f"Cannot hold more than {max_days} days per doctor")
+        if not self.booked:
+            lo, hi = first, last
+        else:
+            lo, hi = min(first, self.base), max(last, self.base + len(self.booked) - 1)
+            if hi - lo + 1 > max_days:
+                # Slide the window towards the requested days.
+                if last > self.base + len(self.booked) - 1:
+                    lo = hi - max_days + 1
+                else:
+                    hi = lo + max_days - 1
+            if lo == self.base and hi == self.base + len(self.booked) - 1:
+                return
+
+        booked = array("H", bytes(2 * (hi - lo + 1)))
+        loaded_at = array("d", bytes(8 * (hi - lo + 1)))
+        keep_lo, keep_hi = max(lo, self.base), min(hi, self.base + len(self.booked) - 1)
+        if keep_lo <= keep_hi:
+            booked[keep_lo - lo:keep_hi - lo + 1] = self.booked[keep_lo - self.base:keep_hi - self.base + 1]
+            loaded_at[keep_lo - lo:keep_hi - lo + 1] = self.loaded_at[keep_lo - self.base:keep_hi - self.base + 1]
+        self.base, self.booked, self.loaded_at = lo, booked, loaded_at
+
+
+class ScheduleIndex:
+    """Booked-slot bitmaps per doctor-day, loaded lazily from `appointments`.
+
+    Each day is an 11-bit mask in a 16-bit array cell, so a run of days packs
+    into one Python int with a single `int.from_bytes` and availability over
+    many days is one `&`/`~` per doctor. Days expire after `ttl_seconds` to pick
+    up writes made by other workers; bookings here set bits immediately, while
+    cancellations and deletions mark the day for reload.
+
+    Memory is bounded: at most `max_doctors` doctors (least recently loaded are
+    evicted) with at most `max_days` days each. Callers validate doctor ids and
+    dates before loading (see appointments/service._check_schedule_window).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_doctors: int,
+        max_days: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_doctors = max_doctors
+        self.max_days = max_days
+        self._clock = clock
+        self._doctors: OrderedDict[int, _DoctorDays] = OrderedDict()
+        self._writes = 0
+
+        self.hits = 0
+        self.loads = 0
+        self.rows_loaded = 0
+        self.evicted = 0
+
+    def _days(self, doctor_id: int) -> _DoctorDays:
+        days = self._doctors.get(doctor_id)
+        if days is None:
+            days = self._doctors[doctor_id] = _DoctorDays()
+            while len(self._doctors) > self.max_doctors:
+                self._doctors.popitem(last=False)
+                self.evicted += 1
+        return days
+
+    def __contains__(self, doctor_id: int) -> bool:
+        return doctor_id in self._doctors
+
+    def forget(self, doctor_id: int) -> None:
+        self._doctors.pop(doctor_id, None)
+
+    def clear(self) -> None:
+        self._doctors.clear()
+
+    def _is_fresh(self, days: _DoctorDays, ordinal: int, now: float) -> bool:
+        i = ordinal - days.base
+        return 0 <= i < len(days.loaded_at) and days.loaded_at[i] > now - self.ttl_seconds
+
+    async def ensure_loaded(self, db: AsyncSession, doctor_ids: Iterable[int], first_day: date, last_day: date) -> None:
+        """Load every stale or missing doctor-day in the range with at most one query."""
+        now = self._clock()
+        first, last = first_day.toordinal(), last_day.toordinal()
+        if last - first + 1 > self.max_days:
+            raise ValueError(f"Cannot load more than {self.max_days} days at once")
+        doctor_ids = set(doctor_ids)
+        for doctor_id in doctor_ids:
+            if doctor_id in self._doctors:
+                self._doctors.move_to_end(doctor_id)
+        stale = [
+            doctor_id for doctor_id in doctor_ids
+            if doctor_id not in self._doctors
+            or not all(self._is_fresh(self._doctors[doctor_id], o, now) for o in range(first, last + 1))
+        ]
+        if not stale:
+            self.hits += 1
+            return
+
+        writes_before = self._writes
+        window_start = datetime.combine(first_day, datetime.min.time())
+        # Appointments from the previous evening cannot reach into the working day, so the window is exact.
+        stmt = select(Appointment.doctor_id, Appointment.date_time, Appointment.duration_minutes).where(
+            Appointment.doctor_id.in_(stale),
+            ACTIVE_APPOINTMENT,
+            Appointment.date_time >= window_start,
+            Appointment.date_time < window_start + timedelta(days=last - first + 1),
+        )
+        rows = (await db.execute(stmt)).all()
+
+        spans: dict[tuple[int, int], list] = {}
+        for doctor_id, starts_at, duration in rows:
+            if starts_at.tzinfo is not None:
+                starts_at = starts_at.astimezone(timezone.utc).replace(tzinfo=None)
+            spans.setdefault((doctor_id, starts_at.toordinal()), []).append(
+                (starts_at, starts_at + timedelta(minutes=duration))
+            )
+        masks = {key: busy_mask(BusyIntervals(day_spans)) for key, day_spans in spans.items()}
+
+        # A write that landed while the query ran may be missing from `rows`: keep the data but don't trust it.
+        loaded_at = self._clock() if self._writes == writes_before else 0.0
+        for doctor_id in stale:
+            days = self._days(doctor_id)
+            days.ensure_span(first, last, self.max_days)
+            for o in range(first, last + 1):
+                days.booked[o - days.base] = masks.get((doctor_id, o), 0)
+                days.loaded_at[o - days.base] = loaded_at
+
+        self.loads += 1
+        self.rows_loaded += len(rows)
+
+    def mark_booked(self, doctor_id: int, starts_at: datetime, duration: timedelta) -> None:
+        self._writes += 1
+        days = self._doctors.get(doctor_id)
+        i = starts_at.toordinal() - days.base if days else -1
+        if days and 0 <= i < len(days.booked):
+            days.booked[i] |= slot_mask(starts_at, duration)
+
+    def mark_released(self, doctor_id: int, starts_at: datetime) -> None:
+        # Another booking may still cover the freed slots, so reload the day instead of clearing bits.
+        self._writes += 1
+        days = self._doctors.get(doctor_id)
+        i = starts_at.toordinal() - days.base if days else -1
+        if days and 0 <= i < len(days.loaded_at):
+            days.loaded_at[i] = 0.0
+
+    def free_bits(self, doctor_id: int, first_day: date, days: int, not_before: datetime | None = None) -> int:
+        """Free slots of `days` consecutive days packed DAY_BITS per day, first day in the low bits.
+
+        Call ensure_loaded first; unloaded days read as fully free.
+        """
+        entry = self._doctors.get(doctor_id)
+        first = first_day.toordinal()
+        booked = 0
+        if entry and entry.booked:
+            lo = max(first, entry.base)
+            hi = min(first + days, entry.base + len(entry.booked))
+            if lo < hi:
+                chunk = entry.booked[lo - entry.base:hi - entry.base]
+                booked = int.from_bytes(chunk.tobytes(), sys.byteorder) << (DAY_BITS * (lo - first))
+
+        free = _full_pattern(days) & ~booked
+        if not_before is not None:
+            free &= ~_elapsed_mask(first_day, days, not_before)
+        return free
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.loads
+        return {
+            "doctors": len(self._doctors),
+            "days": sum(len(d.booked) for d in self._doctors.values()),
+            "evicted": self.evicted,
+            "hits": self.hits,
+            "loads": self.loads,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "rows_loaded": self.rows_loaded,
+        }
+
+
+_patterns: dict[int, int] = {}
+
+
+def _full_pattern(days: int) -> int:
+    pattern = _patterns.get(days)
+    if pattern is None:
+        pattern = int.from_bytes(array("H", [FULL_DAY] * days).tobytes(), sys.byteorder)
+        if len(_patterns) < 512:
+            _patterns[days] = pattern
+    return pattern
+
+
+def _elapsed_mask(first_day: date, days: int, not_before: datetime) -> int:
+    """Bits of slots in the range that start at or before `not_before` (naive UTC)."""
+    offset = not_before.toordinal() - first_day.toordinal()
+    if offset < 0:
+        return 0
+    if offset >= days:
+        return _full_pattern(days)
+    today = 0
+    for slot in range(SLOTS_PER_DAY):
+        if slot_start(not_before.date(), slot) <= not_before:
+            today |= 1 << slot
+    return _full_pattern(offset) | (today << (DAY_BITS * offset))
+
+
+def unpack_days(bits: int, days: int) -> list[int]:
+    """Split a packed bitmap back into one mask per day."""
+    return list(array("H", bits.to_bytes(2 * days, sys.byteorder))) if days else []
+
+
+schedule_index = ScheduleIndex(
+    ttl_seconds=settings.SCHEDULE_INDEX_TTL_SECONDS,
+    max_doctors=settings.SCHEDULE_INDEX_MAX_DOCTORS,
+    # Yesterday through the booking horizon, plus a day of slack for the UTC date rolling over.
+    max_days=settings.BOOKING_HORIZON_DAYS + 3,
+)
+metrics.register("schedule_index", schedule_index.stats)
@@ -1,31 +1,30 @@
-from pydantic import BaseModel, ConfigDict, Field, field_validator
-from datetime import datetime, timezone
+import enum
+from typing import NamedTuple
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from datetime import date, datetime, timedelta, timezone
 from app.appointments.models import AppointmentStatus
+from app.appointments.schedule import MAX_APPOINTMENT_MINUTES, MIN_APPOINTMENT_MINUTES
 
 from app.users.schemas import UserResponse
 from app.clients.schemas import ClientRead
 from app.pets.schemas import PetRead
 from app.doctors.schemas import DoctorRead
+from app.doctors.models import DoctorSpecialization
 
 class AppointmentCreate(BaseModel):
     doctor_id: int = Field(..., gt=0, description="Doctor ID must be positive")
     pet_id: int = Field(..., gt=0, description="Pet ID must be positive")
     date_time: datetime = Field(..., description="Appointment date and time")
+    duration_minutes: int = Field(
+        45, ge=MIN_APPOINTMENT_MINUTES, le=MAX_APPOINTMENT_MINUTES, description="Appointment length in minutes"
+    )
     reason: str | None = Field(None, max_length=500, description="Appointment reason (max 500 characters)")
 
     @field_validator('date_time')
     @classmethod
     def validate_date_time(cls, v: datetime) -> datetime:
-        now = datetime.now(timezone.utc)
-        
-        if v.tzinfo is None:
-            v = v.replace(tzinfo=timezone.utc)
-        else:
-            v = v.astimezone(timezone.utc)
-        
-        if v <= now:
-            raise ValueError('Appointment date and time must be in the future')
-        return v
+        return _future_utc(v)
 
     @field_validator('reason')
     @classmethod
@@ -38,6 +37,76 @@ class AppointmentCreate(BaseModel):
                 return None
         return v
 
+
+def _future_utc(v: datetime) -> datetime:
+    now = datetime.now(timezone.utc)
+
+    if v.tzinfo is None:
+        v = v.replace(tzinfo=timezone.utc)
+    else:
+        v = v.astimezone(timezone.utc)
+
+    if v <= now:
+        raise ValueError('Appointment date and time must be in the future')
+    return v
+
+
+MAX_SERIES_LENGTH = 12
+
+
+class AppointmentRecurrence(BaseModel):
+    first: datetime = Field(..., description="Date and time of the first appointment")
+    every_days: int = Field(..., ge=1, le=365, description="Days between consecutive appointments")
+    count: int = Field(..., ge=1, le=MAX_SERIES_LENGTH, description="Number of appointments")
+
+    @field_validator('first')
+    @classmethod
+    def validate_first(cls, v: datetime) -> datetime:
+        return _future_utc(v)
+
+
+class AppointmentSeriesCreate(BaseModel):
+    """Several appointments with the same doctor and pet, booked all-or-nothing.
+
+    Give either explicit `date_times` or a `recurrence` rule.
+    """
+    doctor_id: int = Field(..., gt=0, description="Doctor ID must be positive")
+    pet_id: int = Field(..., gt=0, description="Pet ID must be positive")
+    date_times: list[datetime] | None = Field(None, min_length=1, max_length=MAX_SERIES_LENGTH)
+    recurrence: AppointmentRecurrence | None = None
+    duration_minutes: int = Field(
+        45, ge=MIN_APPOINTMENT_MINUTES, le=MAX_APPOINTMENT_MINUTES, description="Length of every appointment"
+    )
+    reason: str | None = Field(None, max_length=500, description="Appointment reason (max 500 characters)")
+
+    @field_validator('date_times')
+    @classmethod
+    def validate_date_times(cls, v: list[datetime] | None) -> list[datetime] | None:
+        if v is None:
+            return v
+        v = sorted(_future_utc(dt) for dt in v)
+        if len(set(v)) != len(v):
+            raise ValueError('Appointment dates must be unique')
+        return v
+
+    @field_validator('reason')
+    @classmethod
+    def validate_reason(cls, v: str | None) -> str | None:
+        return AppointmentCreate.validate_reason(v)
+
+    @model_validator(mode='after')
+    def validate_schedule(self):
+        if (self.date_times is None) == (self.recurrence is None):
+            raise ValueError('Provide either date_times or recurrence')
+        return self
+
+    def occurrences(self) -> list[datetime]:
+        """Start times of the series in UTC, earliest first."""
+        if self.date_times is not None:
+            return list(self.date_times)
+        step = timedelta(days=self.recurrence.every_days)
+        return [self.recurrence.first + i * step for i in range(self.recurrence.count)]
+
 class AppointmentUpdate(BaseModel):
     doctor_notes: str = Field(..., min_length=1, max_length=2000, description="Doctor notes (1-2000 characters)")
 
@@ -60,4 +129,91 @@ class AppointmentRead(BaseModel):
     doctor: DoctorRead
     pet: PetRead
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class AppointmentView(str, enum.Enum):
+    FULL = "full"          # AppointmentRead with nested client, doctor and pet
+    COMPACT = "compact"    # AppointmentSummary: ids and names only
+
+
+class AppointmentSummary(NamedTuple):
+    """One row of the compact list view, read straight from a column-only select."""
+    id: int
+    date_time: datetime
+    duration_minutes: int
+    status: AppointmentStatus
+    reason: str | None
+    client_id: int
+    client_name: str
+    doctor_id: int
+    doctor_name: str
+    pet_id: int
+    pet_name: str
+
+
+class AppointmentSummaryRead(BaseModel):
+    id: int
+    date_time: datetime
+    duration_minutes: int
+    status: AppointmentStatus
+    reason: str | None = None
+    client_id: int
+    client_name: str
+    doctor_id: int
+    doctor_name: str
+    pet_id: int
+    pet_name: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PetVisit(NamedTuple):
+    """One entry of a pet's medical history, read straight from a column-only select."""
+    id: int
+    date_time: datetime
+    duration_minutes: int
+    status: AppointmentStatus
+    reason: str | None
+    doctor_notes: str | None
+    doctor_id: int
+    doctor_name: str
+
+
+class PetVisitRead(BaseModel):
+    id: int
+    date_time: datetime
+    duration_minutes: int
+    status: AppointmentStatus
+    reason: str | None = None
+    doctor_notes: str | None = None
+    doctor_id: int
+    doctor_name: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PetHistoryPage(BaseModel):
+    items: list[PetVisitRead]
+    next_cursor: str | None = None
+
+
+class DoctorCalendarLoad(BaseModel):
+    """Per-day counts of one doctor; index i is start_date + i days."""
+    doctor_id: int
+    booked: list[int]
+    free_slots: list[int]
+
+
+class CalendarLoad(BaseModel):
+    """Day-by-day load of a date range. Doctors not listed have no bookings in it."""
+    start_date: date
+    end_date: date
+    slots_per_day: int
+    doctors: list[DoctorCalendarLoad]
+
+
+class FreeSlot(BaseModel):
+    doctor_id: int
+    doctor_name: str
+    specialization: DoctorSpecialization
+    date_time: datetime
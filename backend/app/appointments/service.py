@@ -1,20 +1,43 @@
+import csv
+import io
+import json
 import logging
-from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from datetime import date, datetime, timedelta, timezone
+from typing import AsyncIterator, List, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Date, Select, and_, case, extract, func, insert, or_, select, tuple_, update
+from sqlalchemy.orm import joinedload, selectinload
 from fastapi import HTTPException, status
 
-from app.appointments.models import Appointment
-from app.appointments.schemas import AppointmentCreate
-from app.users.models import User, UserRole
-from app.clients.service import get_client_by_user_id
+from app.appointments.events import Topic, client_topic, doctor_topic, publish_appointment, schedule_events
+from app.appointments.models import ACTIVE_APPOINTMENT, Appointment, AppointmentStatus
+from app.appointments.intervals import BusyIntervals
+from app.appointments.schedule import (
+    APPOINTMENT_DURATION, MAX_APPOINTMENT_DURATION, SLOT_MINUTES, SLOTS_PER_DAY, WORK_START,
+    busy_mask, iter_bits, schedule_index, slot_start, unpack_days,
+)
+from app.appointments.schemas import AppointmentCreate, AppointmentSeriesCreate, AppointmentSummary, AppointmentView, PetVisit
+from app.clients.models import Client
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.db import async_session_factory
+from app.core.etag import make_etag
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.totals import TotalsMode, count_total, row_counts
+from app.doctors.models import Doctor, DoctorSpecialization
+from app.pets.models import Pet
+from app.users.models import UserRole
+from app.users.principal import Principal
 
 logger = logging.getLogger(__name__)
 
-APPOINTMENT_DURATION = timedelta(minutes=45)
+MAX_SEARCH_DAYS = 62
+
+# Calendar heat-map responses keyed by their query; any appointment write clears it.
+calendar_cache = TTLCache(max_size=settings.CALENDAR_CACHE_MAX_SIZE, ttl_seconds=settings.CALENDAR_CACHE_TTL_SECONDS)
+metrics.register("calendar_cache", calendar_cache.stats)
 
 
 def ensure_utc(dt: datetime) -> datetime:
@@ -27,33 +50,57 @@ def ensure_naive_utc(dt: datetime) -> datetime:
     return ensure_utc(dt).replace(tzinfo=None)
 
 
-async def check_availability(db: AsyncSession, doctor_id: int, new_time: datetime) -> bool:
-    new_start = ensure_naive_utc(new_time)
-    search_start = new_start.replace(hour=0, minute=0, second=0)
-    search_end = search_start + timedelta(days=1)
+def overlap_candidates_query(doctor_id: int, start: datetime, end: datetime) -> Select:
+    """Active bookings of the doctor that could overlap [start, end).
 
-    stmt = select(Appointment).filter(
+    Only bookings starting less than MAX_APPOINTMENT_DURATION before `start` can reach
+    into it, so this is one range probe on the (doctor_id, date_time) partial index.
+    """
+    return select(Appointment.date_time, Appointment.duration_minutes).where(
         Appointment.doctor_id == doctor_id,
-        Appointment.status != "cancelled",
-        Appointment.date_time >= search_start,
-        Appointment.date_time < search_end
+        ACTIVE_APPOINTMENT,
+        Appointment.date_time > start - MAX_APPOINTMENT_DURATION,
+        Appointment.date_time < end,
     )
-    result = await db.execute(stmt)
-    existing_appointments = result.scalars().all()
 
-    for appt in existing_appointments:
-        appt_start = ensure_naive_utc(appt.date_time)
-        appt_end = appt_start + APPOINTMENT_DURATION
-        new_end = new_start + APPOINTMENT_DURATION
-        if new_start < appt_end and new_end > appt_start:
-            return False
-    return True
+
+async def check_availability(
+    db: AsyncSession,
+    doctor_id: int,
+    new_time: datetime,
+    duration: timedelta = APPOINTMENT_DURATION,
+) -> bool:
+    """True if no active appointment of the doctor overlaps [new_time, new_time + duration).
+
+    The candidates come from overlap_candidates_query; their own durations are then
+    checked with an interval lookup.
+    """
+    new_start = ensure_naive_utc(new_time)
+    new_end = new_start + duration
+    busy = busy_intervals((await db.execute(overlap_candidates_query(doctor_id, new_start, new_end))).all())
+    return not busy.overlaps(new_start, new_end)
+
+
+def _count_appointments(client_id: int, doctor_id: int, delta: int) -> None:
+    """Keep the cached list totals of everyone who sees these appointments current."""
+    row_counts.adjust(("appointments", "client", client_id), delta)
+    row_counts.adjust(("appointments", "doctor", doctor_id), delta)
+    row_counts.adjust(("appointments", "all"), delta)
+
+
+def busy_intervals(rows) -> BusyIntervals:
+    """Merge (date_time, duration_minutes) rows into naive UTC busy blocks."""
+    spans = []
+    for starts_at, duration_minutes in rows:
+        starts_at = ensure_naive_utc(starts_at)
+        spans.append((starts_at, starts_at + timedelta(minutes=duration_minutes)))
+    return BusyIntervals(spans)
 
 
 async def create_appointment_for_client(
     db: AsyncSession,
     appointment_in: AppointmentCreate,
-    current_user: User
+    current_user: Principal
 ) -> Appointment:
     """Create an appointment for the current client user."""
     if current_user.role != UserRole.CLIENT:
@@ -62,7 +109,7 @@ async def create_appointment_for_client(
             detail="Only clients can book appointments"
         )
     
-    client = await get_client_by_user_id(db, current_user.id)
+    client = current_user.client_profile
     if not client:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -80,7 +127,9 @@ async def create_appointment(
     """Create an appointment (internal use)."""
     appt_time = ensure_naive_utc(appointment_in.date_time)
 
-    is_available = await check_availability(db, appointment_in.doctor_id, appt_time)
+    duration = timedelta(minutes=appointment_in.duration_minutes)
+
+    is_available = await check_availability(db, appointment_in.doctor_id, appt_time, duration)
     if not is_available:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -98,60 +147,322 @@ async def create_appointment(
     )
     db.add(db_appointment)
     await db.commit()
-    return await get_appointment_or_404(db, db_appointment.id)
+    schedule_index.mark_booked(appointment_in.doctor_id, appt_time, duration)
+    _count_appointments(client_id, appointment_in.doctor_id, +1)
+    calendar_cache.clear()
+    appointment = await get_appointment_or_404(db, db_appointment.id)
+    publish_appointment("booked", appointment)
+    return appointment
 
-async def get_appointments_for_user(
-        db: AsyncSession,
-        user: User,
-        page: int,
-        limit: int,
+def series_conflict_query(doctor_id: int, starts: list[datetime], duration: timedelta) -> Select:
+    """Bookings of the doctor that could overlap any of `starts`: one index range per occurrence.
+
+    A single range from the first to the last occurrence would read every booking
+    in between, up to a year of them for a long series.
+    """
+    return select(Appointment.date_time, Appointment.duration_minutes).where(
+        or_(*(
+            and_(
+                Appointment.doctor_id == doctor_id,
+                ACTIVE_APPOINTMENT,
+                Appointment.date_time > start - MAX_APPOINTMENT_DURATION,
+                Appointment.date_time < start + duration,
+            )
+            for start in starts
+        )),
+    )
+
+
+async def create_appointment_series_for_client(
+    db: AsyncSession,
+    series_in: AppointmentSeriesCreate,
+    current_user: Principal
+) -> List[Appointment]:
+    """Book every appointment of a series for the current client, or none of them.
+
+    All requested intervals are checked with one query (see series_conflict_query),
+    inserted in a single transaction and read back in one joined query.
+    """
+    if current_user.role != UserRole.CLIENT:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only clients can book appointments"
+        )
+
+    client = current_user.client_profile
+    if not client:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Client profile not found"
+        )
+
+    duration = timedelta(minutes=series_in.duration_minutes)
+    starts = [ensure_naive_utc(dt) for dt in series_in.occurrences()]
+
+    requested = BusyIntervals()
+    for start in starts:
+        if requested.overlaps(start, start + duration):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Appointments of the series overlap each other"
+            )
+        requested.add(start, start + duration)
+
+    busy = busy_intervals((await db.execute(series_conflict_query(series_in.doctor_id, starts, duration))).all())
+    taken = [start for start in starts if busy.overlaps(start, start + duration)]
+    if taken:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"These time slots are already booked: {', '.join(t.isoformat() for t in taken)}"
+        )
+
+    reason_value = series_in.reason if series_in.reason is not None else "No description provided"
+    rows = [
+        {
+            "doctor_id": series_in.doctor_id,
+            "pet_id": series_in.pet_id,
+            "client_id": client.id,
+            "date_time": start,
+            "duration_minutes": series_in.duration_minutes,
+            "reason": reason_value,
+        }
+        for start in starts
+    ]
+    ids = (await db.scalars(insert(Appointment).returning(Appointment.id), rows)).all()
+    await db.commit()
+    for start in starts:
+        schedule_index.mark_booked(series_in.doctor_id, start, duration)
+    _count_appointments(client.id, series_in.doctor_id, len(ids))
+    calendar_cache.clear()
+
+    query = select(Appointment).filter(Appointment.id.in_(ids)).options(
+        joinedload(Appointment.client),
+        joinedload(Appointment.doctor),
+        joinedload(Appointment.pet)
+    ).order_by(Appointment.date_time.asc())
+    result = await db.execute(query)
+    appointments = list(result.scalars().all())
+    for appointment in appointments:
+        publish_appointment("booked", appointment)
+    return appointments
+
+
+_UNCOUNTED = object()
+
+
+def _list_conditions(
+        user: Principal,
         start_date: Optional[datetime],
-        end_date: Optional[datetime]
-) -> tuple[List[Appointment], int]:
-    """Get appointments for a user. Filters by role (CLIENT sees their appointments, DOCTOR sees their appointments)."""
-    from app.doctors.service import get_doctor_by_user_id
-    
-    query = select(Appointment)
+        end_date: Optional[datetime],
+) -> tuple[list, Optional[tuple]]:
+    """WHERE conditions of the user's appointment list and the counter holding its total."""
+    conditions = []
+    counter_key = ("appointments", "all")
 
     if user.role == UserRole.CLIENT:
-        client = await get_client_by_user_id(db, user.id)
+        client = user.client_profile
         if client:
-            query = query.filter(Appointment.client_id == client.id)
+            conditions.append(Appointment.client_id == client.id)
+            counter_key = ("appointments", "client", client.id)
     elif user.role == UserRole.DOCTOR:
-        doctor = await get_doctor_by_user_id(db, user.id)
+        doctor = user.doctor_profile
         if doctor:
-            query = query.filter(Appointment.doctor_id == doctor.id)
-
-    if start_date and end_date:
-        s_date = ensure_naive_utc(start_date)
-        e_date = ensure_naive_utc(end_date)
-        query = query.filter(and_(Appointment.date_time >= s_date, Appointment.date_time <= e_date))
-        skip = 0
-        limit = 1000
-    else:
-        skip = (page - 1) * limit
+            conditions.append(Appointment.doctor_id == doctor.id)
+            counter_key = ("appointments", "doctor", doctor.id)
 
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query) or 0
+    if start_date:
+        conditions.append(Appointment.date_time >= ensure_naive_utc(start_date))
+    if end_date:
+        conditions.append(Appointment.date_time <= ensure_naive_utc(end_date))
+    if start_date or end_date:
+        counter_key = None
+    return conditions, counter_key
 
-    query = query.options(
-        selectinload(Appointment.client),
-        selectinload(Appointment.doctor),
-        selectinload(Appointment.pet)
-    ).order_by(Appointment.date_time.asc())
 
-    if limit > 0:
-        query = query.offset(skip).limit(limit)
+MAX_PAGE_SIZE = 500  # larger `limit` values are clamped by the list endpoint
+
+
+def _page_query(query: Select, conditions: list, page: int, limit: int, cursor: Optional[str]) -> Select:
+    """Restrict `query` to one page (plus one row to detect the next page) in list order."""
+    conditions = list(conditions)
+    if cursor:
+        after_time, after_id = decode_cursor(cursor, datetime, int)
+        conditions.append(tuple_(Appointment.date_time, Appointment.id) > (ensure_naive_utc(after_time), after_id))
+    elif page > 1:
+        query = query.offset((page - 1) * limit)
+    return query.where(*conditions).order_by(Appointment.date_time.asc(), Appointment.id.asc()).limit(limit + 1)
+
+
+async def appointment_list_version(
+        db: AsyncSession,
+        user: Principal,
+        page: int,
+        limit: int,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        cursor: Optional[str] = None,
+        totals: TotalsMode = TotalsMode.EXACT,
+        view: AppointmentView = AppointmentView.FULL,
+) -> tuple[str, Optional[int]]:
+    """ETag of one list page and the total it reports.
+
+    The page's version is one aggregate over its row ids: how many rows, which ones,
+    and the latest `updated_at` of the appointments and of the clients, doctors and
+    pets whose names they embed. No rows are loaded or serialized.
+    """
+    conditions, counter_key = _list_conditions(user, start_date, end_date)
+    count_query = select(func.count()).select_from(Appointment).where(*conditions)
+    total = await count_total(db, totals, count_query, counter_key)
+
+    page_ids = _page_query(select(Appointment.id), conditions, page, limit, cursor).scalar_subquery()
+    stmt = (
+        select(
+            func.count(),
+            func.sum(Appointment.id),
+            func.max(Appointment.updated_at),
+            func.max(Client.updated_at),
+            func.max(Doctor.updated_at),
+            func.max(Pet.updated_at),
+        )
+        .select_from(Appointment)
+        .join(Client, Client.id == Appointment.client_id)
+        .join(Doctor, Doctor.id == Appointment.doctor_id)
+        .join(Pet, Pet.id == Appointment.pet_id)
+        .where(Appointment.id.in_(page_ids))
+    )
+    version = tuple((await db.execute(stmt)).one())
+    etag = make_etag("appointments", user.id, page, limit, start_date, end_date, cursor, view.value, total, version)
+    return etag, total
+
+
+async def get_appointments_for_user(
+        db: AsyncSession,
+        user: Principal,
+        page: int,
+        limit: int,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        cursor: Optional[str] = None,
+        totals: TotalsMode = TotalsMode.EXACT,
+        view: AppointmentView = AppointmentView.FULL,
+        total: Optional[int] | object = _UNCOUNTED,
+) -> tuple[list, Optional[int], Optional[str]]:
+    """Get appointments for a user. Filters by role (CLIENT sees their appointments, DOCTOR sees their appointments).
+
+    Pages are ordered by (date_time, id). With a `cursor` the page starts right after the
+    row it encodes, which is an index seek at any depth; `page` alone falls back to OFFSET
+    for older clients. The returned cursor is None on the last page.
+
+    The compact view returns AppointmentSummary tuples from one joined column select
+    instead of ORM objects with their relationships loaded. Pass `total` when it is
+    already known (see appointment_list_version) to skip counting again.
+    """
+    conditions, counter_key = _list_conditions(user, start_date, end_date)
+    if total is _UNCOUNTED:
+        count_query = select(func.count()).select_from(Appointment).where(*conditions)
+        total = await count_total(db, totals, count_query, counter_key)
+
+    if view == AppointmentView.COMPACT:
+        query = (
+            select(*SUMMARY_COLUMNS)
+            .join(Client, Client.id == Appointment.client_id)
+            .join(Doctor, Doctor.id == Appointment.doctor_id)
+            .join(Pet, Pet.id == Appointment.pet_id)
+        )
+    else:
+        query = select(Appointment).options(
+            selectinload(Appointment.client),
+            selectinload(Appointment.doctor),
+            selectinload(Appointment.pet)
+        )
+    query = _page_query(query, conditions, page, limit, cursor)
 
     result = await db.execute(query)
-    return result.scalars().all(), total
+    if view == AppointmentView.COMPACT:
+        items = [AppointmentSummary._make(row) for row in result]
+    else:
+        items = list(result.scalars().all())
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(ensure_naive_utc(items[-1].date_time), items[-1].id)
+    return items, total, next_cursor
+
+SUMMARY_COLUMNS = (
+    Appointment.id,
+    Appointment.date_time,
+    Appointment.duration_minutes,
+    Appointment.status,
+    Appointment.reason,
+    Appointment.client_id,
+    Client.full_name,
+    Appointment.doctor_id,
+    Doctor.full_name,
+    Appointment.pet_id,
+    Pet.name,
+)
+
+
+PET_VISIT_COLUMNS = (
+    Appointment.id,
+    Appointment.date_time,
+    Appointment.duration_minutes,
+    Appointment.status,
+    Appointment.reason,
+    Appointment.doctor_notes,
+    Appointment.doctor_id,
+    Doctor.full_name,
+)
+
+
+def build_pet_history_query(pet_id: int, before: Optional[tuple[datetime, int]] = None) -> Select:
+    """PET_VISIT_COLUMNS of the pet's appointments, newest first, older than `before` (date_time, id) if given."""
+    query = (
+        select(*PET_VISIT_COLUMNS)
+        .join(Doctor, Doctor.id == Appointment.doctor_id)
+        .where(Appointment.pet_id == pet_id)
+    )
+    if before is not None:
+        query = query.where(tuple_(Appointment.date_time, Appointment.id) < before)
+    return query.order_by(Appointment.date_time.desc(), Appointment.id.desc())
+
+
+async def get_pet_history(
+        db: AsyncSession,
+        pet_id: int,
+        user: Principal,
+        limit: int,
+        cursor: Optional[str] = None,
+) -> tuple[list[PetVisit], Optional[str]]:
+    """One page of a pet's appointments, newest first, and the cursor of the next (older) page.
+
+    Doctors and admins see any pet, clients only their own. The page is a single
+    column select seeking on ix_appointments_pet_id_date_time_id, so its cost does
+    not grow with the length of the history or the depth of the cursor.
+    """
+    owner_id = await db.scalar(select(Pet.owner_id).where(Pet.id == pet_id))
+    if owner_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pet not found")
+    if user.role == UserRole.CLIENT and (not user.client_profile or user.client_profile.id != owner_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this pet")
+
+    before = decode_cursor(cursor, datetime, int) if cursor else None
+    query = build_pet_history_query(pet_id, before).limit(limit + 1)
+
+    items = [PetVisit._make(row) for row in await db.execute(query)]
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(ensure_naive_utc(items[-1].date_time), items[-1].id)
+    return items, next_cursor
+
 
 async def get_appointment_or_404(db: AsyncSession, appointment_id: int) -> Appointment:
-    """Get an appointment by ID. Raises 404 if not found."""
+    """Get an appointment by ID with client, doctor and pet in one joined query. Raises 404 if not found."""
     query = select(Appointment).filter(Appointment.id == appointment_id).options(
-        selectinload(Appointment.client),
-        selectinload(Appointment.doctor),
-        selectinload(Appointment.pet)
+        joinedload(Appointment.client),
+        joinedload(Appointment.doctor),
+        joinedload(Appointment.pet)
     )
     result = await db.execute(query)
     appointment = result.scalars().first()
@@ -166,97 +477,500 @@ async def get_appointment_or_404(db: AsyncSession, appointment_id: int) -> Appoi
 async def cancel_appointment(
     db: AsyncSession, 
     appointment_id: int, 
-    current_user: User
+    current_user: Principal
 ) -> Appointment:
     """Cancel an appointment. Only the client who owns the appointment can cancel it."""
-    appointment = await get_appointment_or_404(db, appointment_id)
-    
     # Only clients can cancel appointments
     if current_user.role != UserRole.CLIENT:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only clients can cancel appointments"
         )
-    
-    client = await get_client_by_user_id(db, current_user.id)
-    if not client or appointment.client_id != client.id:
+
+    client = current_user.client_profile
+    if not client:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have permission to cancel this appointment"
         )
 
-    appointment.cancel()
-    await db.commit()
-    await db.refresh(appointment)
+    appointment = await _transition(
+        db, appointment_id, AppointmentStatus.CANCELLED, Appointment.client_id == client.id,
+        forbidden="You do not have permission to cancel this appointment",
+    )
+    schedule_index.mark_released(appointment.doctor_id, ensure_naive_utc(appointment.date_time))
+    calendar_cache.clear()
+    publish_appointment("cancelled", appointment)
     return appointment
 
 
 async def complete_appointment(
     db: AsyncSession, 
     appointment_id: int,
-    current_user: User
+    current_user: Principal
 ) -> Appointment:
-    """Complete an appointment. Only doctors can complete appointments."""
-    if current_user.role != UserRole.DOCTOR:
+    """Complete an appointment. Only the doctor of the appointment can complete it."""
+    if current_user.role != UserRole.DOCTOR or not current_user.doctor_profile:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only doctors can complete appointments"
         )
-    
+
+    # Visits the sweeper already marked as no-shows can still be closed late by their doctor.
+    appointment = await _transition(
+        db, appointment_id, AppointmentStatus.COMPLETED, Appointment.doctor_id == current_user.doctor_profile.id,
+        forbidden="You do not have permission to complete this appointment",
+        from_statuses=(AppointmentStatus.PLANNED, AppointmentStatus.NO_SHOW),
+    )
+    publish_appointment("completed", appointment)
+    return appointment
+
+
+async def _transition(
+    db: AsyncSession,
+    appointment_id: int,
+    new_status: AppointmentStatus,
+    owner_check,
+    forbidden: str,
+    from_statuses: tuple[AppointmentStatus, ...] = (AppointmentStatus.PLANNED,),
+) -> Appointment:
+    """Move an appointment in one of `from_statuses` to `new_status` with one conditional UPDATE ... RETURNING.
+
+    The status and ownership checks are part of the WHERE clause, so of two concurrent
+    transitions only one matches the row. Only a failed update pays for a second
+    lookup, to tell 404, 403 and 409 apart.
+    """
+    stmt = (
+        update(Appointment)
+        .where(Appointment.id == appointment_id, Appointment.status.in_(from_statuses), owner_check)
+        .values(status=new_status)
+        .returning(Appointment.id)
+        .execution_options(synchronize_session="fetch")  # a copy already in the session must not stay stale
+    )
+    if await db.scalar(stmt) is None:
+        await db.rollback()
+        current = (await db.execute(
+            select(Appointment.status, owner_check).where(Appointment.id == appointment_id)
+        )).first()
+        if current is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Appointment not found")
+        if not current[1]:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=forbidden)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"A {current[0].value} appointment cannot be marked {new_status.value}"
+        )
+
     appointment = await get_appointment_or_404(db, appointment_id)
-    appointment.complete()
     await db.commit()
-    await db.refresh(appointment)
     return appointment
 
+
 async def delete_appointment(db: AsyncSession, appointment_id: int) -> None:
     """Delete an appointment (admin only)."""
     appointment = await get_appointment_or_404(db, appointment_id)
     await db.delete(appointment)
     await db.commit()
+    _count_appointments(appointment.client_id, appointment.doctor_id, -1)
+    schedule_index.mark_released(appointment.doctor_id, ensure_naive_utc(appointment.date_time))
+    calendar_cache.clear()
+    publish_appointment("deleted", appointment)
 
-async def get_slots_by_date_string(db: AsyncSession, doctor_id: int, date_str: str) -> List[str]:
+def _parse_slot_date(date_str: str) -> datetime:
     try:
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        return datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
     except ValueError as e:
         logger.error(f"Invalid date format: {date_str}, error: {str(e)}")
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
 
+
+async def _slot_day(db: AsyncSession, doctor_id: int, date_str: str) -> date:
+    """The requested day, once it is within the booking window and the doctor exists (400/404 otherwise).
+
+    Doctors already in the schedule index were checked when they were loaded.
+    """
+    day = _parse_slot_date(date_str).date()
+    _check_schedule_window(day, day)
+    if doctor_id not in schedule_index and await db.scalar(select(Doctor.id).where(Doctor.id == doctor_id)) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Doctor not found")
+    return day
+
+
+async def get_slots_by_date_string(db: AsyncSession, doctor_id: int, date_str: str) -> List[str]:
+    day = await _slot_day(db, doctor_id, date_str)
+
     try:
-        slots = await _calculate_available_slots(db, doctor_id, date_obj)
+        slots = await _calculate_available_slots(db, doctor_id, day)
         return [slot.isoformat() for slot in slots]
     except Exception as e:
         logger.error(f"Error calculating slots: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Error calculating slots")
 
 
-async def _calculate_available_slots(db: AsyncSession, doctor_id: int, date: datetime) -> list[datetime]:
-    date_utc = ensure_utc(date)
-    date_start = ensure_naive_utc(date_utc.replace(hour=0, minute=0, second=0, microsecond=0))
-    date_end = date_start + timedelta(days=1)
+async def slots_version(db: AsyncSession, doctor_id: int, date_str: str) -> str:
+    """ETag of a doctor's free slots on one day: the free-slot bitmap itself, from the schedule index."""
+    day = await _slot_day(db, doctor_id, date_str)
+    return make_etag("slots", doctor_id, day, await _free_slot_bits(db, doctor_id, day))
 
-    stmt = select(Appointment).filter(
-        Appointment.doctor_id == doctor_id,
-        Appointment.status != "cancelled",
-        Appointment.date_time >= date_start,
-        Appointment.date_time < date_end
-    )
-    result = await db.execute(stmt)
-    existing_appointments = result.scalars().all()
 
-    booked_slots = {ensure_naive_utc(appt.date_time) for appt in existing_appointments}
-    available_slots = []
+async def _free_slot_bits(db: AsyncSession, doctor_id: int, day: date) -> int:
+    await schedule_index.ensure_loaded(db, [doctor_id], day, day)
+
+    now_naive = ensure_naive_utc(datetime.now(timezone.utc))
+    return schedule_index.free_bits(doctor_id, day, 1, not_before=now_naive)
+
 
-    WORK_START = 9
-    WORK_END = 17
+async def _calculate_available_slots(db: AsyncSession, doctor_id: int, day: date) -> list[datetime]:
+    free = await _free_slot_bits(db, doctor_id, day)
+    return [slot_start(day, slot).replace(tzinfo=timezone.utc) for slot in iter_bits(free)]
 
-    current_time = date_start.replace(hour=WORK_START, minute=0)
-    end_time = date_start.replace(hour=WORK_END, minute=0)
+
+async def find_free_slots(
+    db: AsyncSession,
+    start_date: date,
+    end_date: date,
+    limit: int,
+    specialization: Optional[DoctorSpecialization] = None,
+    doctor_ids: Optional[List[int]] = None,
+) -> list[dict]:
+    """Earliest `limit` free slots across the selected doctors between two dates (inclusive).
+
+    Availability for the whole window is one bitmap per doctor from the schedule index,
+    which queries appointments only for doctor-days it has not loaded recently.
+    """
+    if not specialization and not doctor_ids:
+        raise HTTPException(status_code=400, detail="Provide a specialization or doctor_ids")
+    _check_date_range(start_date, end_date)
+    _check_schedule_window(start_date, end_date)
+
+    stmt = select(Doctor.id, Doctor.full_name, Doctor.specialization).order_by(Doctor.id)
+    if specialization:
+        stmt = stmt.where(Doctor.specialization == specialization)
+    if doctor_ids:
+        stmt = stmt.where(Doctor.id.in_(doctor_ids))
+    doctors = (await db.execute(stmt)).all()
+    if not doctors:
+        return []
+
+    await schedule_index.ensure_loaded(db, [doctor.id for doctor in doctors], start_date, end_date)
+
+    days = (end_date - start_date).days + 1
     now_naive = ensure_naive_utc(datetime.now(timezone.utc))
+    free_by_day = [
+        unpack_days(schedule_index.free_bits(doctor.id, start_date, days, not_before=now_naive), days)
+        for doctor in doctors
+    ]
+
+    found = []
+    for offset in range(days):
+        day = start_date + timedelta(days=offset)
+        day_masks = [free[offset] for free in free_by_day]
+        any_free = 0
+        for mask in day_masks:
+            any_free |= mask
+        for slot in iter_bits(any_free):
+            starts_at = slot_start(day, slot).replace(tzinfo=timezone.utc)
+            for doctor, mask in zip(doctors, day_masks):
+                if not mask >> slot & 1:
+                    continue
+                found.append({
+                    "doctor_id": doctor.id,
+                    "doctor_name": doctor.full_name,
+                    "specialization": doctor.specialization,
+                    "date_time": starts_at,
+                })
+                if len(found) == limit:
+                    return found
+    return found
+
+
+def _check_date_range(start_date: date, end_date: date) -> None:
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    if (end_date - start_date).days >= MAX_SEARCH_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_SEARCH_DAYS} days")
+
+
+def _check_schedule_window(start_date: date, end_date: date) -> None:
+    """Days served from the schedule index must lie between yesterday and BOOKING_HORIZON_DAYS ahead (UTC).
+
+    Keeps arbitrary dates from public requests out of the index.
+    """
+    today = datetime.now(timezone.utc).date()
+    if start_date < today - timedelta(days=1) or end_date > today + timedelta(days=settings.BOOKING_HORIZON_DAYS):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Dates must be between yesterday and {settings.BOOKING_HORIZON_DAYS} days ahead"
+        )
+
+
+async def get_calendar_load(
+    db: AsyncSession,
+    start_date: date,
+    end_date: date,
+    specialization: Optional[DoctorSpecialization] = None,
+    doctor_ids: Optional[List[int]] = None,
+) -> dict:
+    """Booked appointments and free slots per doctor and day between two dates (inclusive).
+
+    Free slots are the grid slots no booking overlaps, the same grid /slots offers.
+    One GROUP BY over doctors counts every day; only days with off-grid bookings
+    have their intervals merged in Python. Counts are arrays per doctor to keep month views small.
+    """
+    _check_date_range(start_date, end_date)
+    key = (start_date, end_date, specialization, tuple(sorted(set(doctor_ids or ()))))
+    doctors = await calendar_cache.get_or_load(
+        key, lambda: _load_calendar(db, start_date, end_date, specialization, doctor_ids)
+    )
+    return {"start_date": start_date, "end_date": end_date, "slots_per_day": SLOTS_PER_DAY, "doctors": doctors}
+
+
+def _on_grid():
+    """True for a booking that is exactly one grid slot, so it blocks one slot and no other."""
+    minutes = extract("hour", Appointment.date_time) * 60 + extract("minute", Appointment.date_time)
+    offset = minutes - WORK_START * 60
+    return and_(
+        Appointment.duration_minutes == SLOT_MINUTES,
+        extract("second", Appointment.date_time) == 0,
+        offset >= 0,
+        offset < SLOTS_PER_DAY * SLOT_MINUTES,
+        offset % SLOT_MINUTES == 0,
+    )
+
+
+def build_calendar_query(
+    start_date: date,
+    end_date: date,
+    specialization: Optional[DoctorSpecialization] = None,
+    doctor_ids: Optional[List[int]] = None,
+) -> Select:
+    """(doctor_id, day, booked, off_grid) per doctor and booked day; day is None for a doctor with no bookings.
+
+    Driven from `doctors` with an outer join, so every selected doctor is listed.
+    `off_grid` counts bookings that are not exactly one grid slot.
+    """
+    window_start = datetime.combine(start_date, datetime.min.time())
+    window_end = datetime.combine(end_date, datetime.min.time()) + timedelta(days=1)
+    day = func.date(Appointment.date_time, type_=Date)
+    stmt = (
+        select(
+            Doctor.id,
+            day,
+            func.count(Appointment.id),
+            func.coalesce(func.sum(case((_on_grid(), 0), else_=1)), 0),
+        )
+        .select_from(Doctor)
+        .outerjoin(Appointment, and_(
+            Appointment.doctor_id == Doctor.id,
+            ACTIVE_APPOINTMENT,
+            Appointment.date_time >= window_start,
+            Appointment.date_time < window_end,
+        ))
+        .group_by(Doctor.id, day)
+        .order_by(Doctor.id)
+    )
+    if specialization:
+        stmt = stmt.where(Doctor.specialization == specialization)
+    if doctor_ids:
+        stmt = stmt.where(Doctor.id.in_(doctor_ids))
+    return stmt
+
 
-    while current_time < end_time:
-        if current_time not in booked_slots and current_time > now_naive:
-            available_slots.append(current_time.replace(tzinfo=timezone.utc))
-        current_time += APPOINTMENT_DURATION
+CALENDAR_MERGE_CHUNK = 200  # (doctor, day) ranges per query when merging off-grid days
 
-    return available_slots
\ No newline at end of file
+
+async def _load_calendar(
+    db: AsyncSession,
+    start_date: date,
+    end_date: date,
+    specialization: Optional[DoctorSpecialization],
+    doctor_ids: Optional[List[int]],
+) -> list[dict]:
+    days = (end_date - start_date).days + 1
+    doctors: dict[int, dict] = {}
+    off_grid_days: list[tuple[int, date]] = []
+    rows = await db.execute(build_calendar_query(start_date, end_date, specialization, doctor_ids))
+    for doctor_id, booked_day, booked, off_grid in rows:
+        entry = doctors.get(doctor_id)
+        if entry is None:
+            entry = doctors[doctor_id] = {
+                "doctor_id": doctor_id, "booked": [0] * days, "free_slots": [SLOTS_PER_DAY] * days,
+            }
+        if booked_day is None:
+            continue
+        offset = (booked_day - start_date).days
+        entry["booked"][offset] = booked
+        # Distinct one-slot bookings (the booking checks prevent overlaps) block one slot each.
+        entry["free_slots"][offset] = SLOTS_PER_DAY - booked
+        if off_grid:
+            off_grid_days.append((doctor_id, booked_day))
+
+    # Only days with bookings that are off the grid or longer than a slot need their intervals merged.
+    for chunk_start in range(0, len(off_grid_days), CALENDAR_MERGE_CHUNK):
+        chunk = off_grid_days[chunk_start:chunk_start + CALENDAR_MERGE_CHUNK]
+        stmt = select(Appointment.doctor_id, Appointment.date_time, Appointment.duration_minutes).where(
+            ACTIVE_APPOINTMENT,
+            or_(*(
+                and_(
+                    Appointment.doctor_id == doctor_id,
+                    Appointment.date_time >= datetime.combine(day, datetime.min.time()),
+                    Appointment.date_time < datetime.combine(day + timedelta(days=1), datetime.min.time()),
+                )
+                for doctor_id, day in chunk
+            )),
+        )
+        day_rows: dict[tuple[int, date], list] = {}
+        for doctor_id, starts_at, duration_minutes in (await db.execute(stmt)).all():
+            day_rows.setdefault((doctor_id, ensure_naive_utc(starts_at).date()), []).append(
+                (starts_at, duration_minutes)
+            )
+        for (doctor_id, day), spans in day_rows.items():
+            blocked = busy_mask(busy_intervals(spans)).bit_count()
+            doctors[doctor_id]["free_slots"][(day - start_date).days] = SLOTS_PER_DAY - blocked
+    return list(doctors.values())
+
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = (
+    Appointment.id,
+    Appointment.date_time,
+    Appointment.duration_minutes,
+    Appointment.status,
+    Appointment.reason,
+    Appointment.doctor_notes,
+    Appointment.client_id,
+    Client.full_name.label("client_name"),
+    Appointment.doctor_id,
+    Doctor.full_name.label("doctor_name"),
+    Appointment.pet_id,
+    Pet.name.label("pet_name"),
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS] + ["cursor"]
+
+
+def build_export_query(
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    doctor_ids: Optional[List[int]],
+    cursor: Optional[str],
+) -> Select:
+    """Export rows ordered by (date_time, id); `cursor` resumes right after the row it was taken from.
+
+    The cursor carries the row's own (date_time, id), so resuming still works after that row is deleted.
+    """
+    stmt = (
+        select(*EXPORT_COLUMNS)
+        .join(Client, Client.id == Appointment.client_id)
+        .join(Doctor, Doctor.id == Appointment.doctor_id)
+        .join(Pet, Pet.id == Appointment.pet_id)
+        .order_by(Appointment.date_time.asc(), Appointment.id.asc())
+    )
+    if start_date:
+        stmt = stmt.where(Appointment.date_time >= ensure_naive_utc(start_date))
+    if end_date:
+        stmt = stmt.where(Appointment.date_time <= ensure_naive_utc(end_date))
+    if doctor_ids:
+        stmt = stmt.where(Appointment.doctor_id.in_(doctor_ids))
+    if cursor:
+        after_time, after_id = decode_cursor(cursor, datetime, int)
+        stmt = stmt.where(tuple_(Appointment.date_time, Appointment.id) > (ensure_naive_utc(after_time), after_id))
+    return stmt
+
+
+async def stream_export(stmt: Select, fmt: str, header: bool = True) -> AsyncIterator[str]:
+    """Yield the export as NDJSON or CSV text, one chunk per EXPORT_BATCH_SIZE rows.
+
+    Runs on its own session and a server-side cursor, so memory stays flat and the
+    request's session is not held open while the client downloads.
+    """
+    async with async_session_factory() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        if fmt == "csv" and header:
+            yield ",".join(EXPORT_FIELDS) + "\r\n"
+        async for rows in result.partitions():
+            yield _format_csv(rows) if fmt == "csv" else _format_ndjson(rows)
+
+
+def _format_ndjson(rows) -> str:
+    lines = []
+    for row in rows:
+        record = dict(zip(EXPORT_FIELDS, row))
+        record["date_time"] = ensure_utc(record["date_time"]).isoformat()
+        record["status"] = record["status"].value
+        record["cursor"] = _export_cursor(row)
+        lines.append(json.dumps(record, ensure_ascii=False))
+    return "\n".join(lines) + "\n"
+
+
+def _format_csv(rows) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        row = list(row)
+        row.append(_export_cursor(row))
+        row[1] = ensure_utc(row[1]).isoformat()
+        row[3] = row[3].value
+        writer.writerow(row)
+    return buffer.getvalue()
+
+
+def _export_cursor(row) -> str:
+    """Resume token for an export row, the same (date_time, id) cursor the list pages use."""
+    return encode_cursor(ensure_naive_utc(row[1]), row[0])
+
+
+MAX_EVENT_DOCTORS = 100
+
+
+def schedule_topics(current_user: Principal, doctor_ids: Optional[List[int]]) -> frozenset[Topic]:
+    """Topics for the given doctors plus the user's own client or doctor profile.
+
+    Everything that can fail is checked here, before the response starts; the
+    subscription itself is made by stream_schedule_events.
+    """
+    doctor_ids = doctor_ids or []
+    if len(doctor_ids) > MAX_EVENT_DOCTORS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_EVENT_DOCTORS} doctors per subscription"
+        )
+
+    topics = {doctor_topic(doctor_id) for doctor_id in doctor_ids}
+    if current_user.client_profile:
+        topics.add(client_topic(current_user.client_profile.id))
+    if current_user.doctor_profile:
+        topics.add(doctor_topic(current_user.doctor_profile.id))
+    if not topics:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Nothing to subscribe to")
+    if schedule_events.full:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many event subscribers")
+    return frozenset(topics)
+
+
+async def stream_schedule_events(topics: frozenset[Topic]) -> AsyncIterator[str]:
+    """Server-sent events for the topics, with a keep-alive comment while idle.
+
+    Subscribes only once the response is being sent, so a client that goes away
+    before that leaves nothing behind. Ends with an `overflow` event if the reader
+    fell too far behind; the client should then reload what it shows and reconnect.
+    If the subscriber limit was reached since the request was checked, the stream
+    ends at once and the client retries after the advertised delay.
+    """
+    subscription = None
+    try:
+        yield "retry: 5000\n\n"
+        subscription = schedule_events.subscribe(topics)
+        if subscription is None:
+            return
+        while True:
+            batch = await subscription.next_batch(settings.EVENTS_HEARTBEAT_SECONDS)
+            if subscription.overflowed:
+                yield "event: overflow\ndata: {}\n\n"
+                return
+            if not batch:
+                yield ": ping\n\n"
+                continue
+            yield "".join(f"event: {kind}\ndata: {data}\n\n" for kind, data in batch)
+    finally:
+        if subscription is not None:
+            schedule_events.unsubscribe(subscription)
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.appointments.events import publish_appointment
+from app.appointments.models import PLANNED_APPOINTMENT, Appointment, AppointmentStatus
+from app.core import metrics
+from app.core.config import settings
+from app.core.db import async_session_factory
+from app.core.leases import acquire_lease, release_lease
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "appointment_sweeper"
+
+
+class AppointmentSweeper:
+    """Periodically marks planned appointments older than `grace` as no-shows.
+
+    Each run updates at most `batch_size` rows per transaction, so a large backlog
+    never holds one long write lock. Runs only while this worker holds the
+    `appointment_sweeper` lease; the lease is renewed between chunks and lost
+    leases stop the run, so with several workers exactly one of them sweeps.
+    Each moved row is published as a `no_show` event once its chunk is committed.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        grace: timedelta,
+        batch_size: int,
+        lease_seconds: float,
+        session_factory: async_sessionmaker = async_session_factory,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.interval_seconds = interval_seconds
+        self.grace = grace
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._session_factory = session_factory
+        self._clock = clock
+        self._task: asyncio.Task | None = None
+
+        self.runs = 0
+        self.skipped = 0
+        self.errors = 0
+        self.swept = 0
+        self.batches = 0
+        self.last_swept = 0
+        self.last_run_at: datetime | None = None
+        self.last_duration_ms = 0.0
+        self.lease_held = False
+
+    async def sweep_once(self, now: datetime | None = None) -> int:
+        """One run: take the lease, then sweep chunk by chunk. Returns the number of rows moved."""
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - self.grace
+        started = self._clock()
+        swept = 0
+        async with self._session_factory() as db:
+            self.lease_held = await acquire_lease(db, LEASE_NAME, self.holder, self.lease_seconds)
+            if not self.lease_held:
+                self.skipped += 1
+                return 0
+
+            while True:
+                moved = await self._sweep_batch(db, cutoff)
+                swept += moved
+                self.batches += 1
+                if moved < self.batch_size:
+                    break
+                # Yield to request handlers, and make sure the lease didn't pass to another worker meanwhile.
+                await asyncio.sleep(0)
+                self.lease_held = await acquire_lease(db, LEASE_NAME, self.holder, self.lease_seconds)
+                if not self.lease_held:
+                    break
+
+        self.runs += 1
+        self.swept += swept
+        self.last_swept = swept
+        self.last_run_at = now
+        self.last_duration_ms = round((self._clock() - started) * 1000, 2)
+        if swept:
+            logger.info("Marked %d past planned appointments as no-show", swept)
+        return swept
+
+    async def _sweep_batch(self, db: AsyncSession, cutoff: datetime) -> int:
+        batch = (
+            select(Appointment.id)
+            .where(PLANNED_APPOINTMENT, Appointment.date_time < cutoff)
+            .order_by(Appointment.date_time)
+            .limit(self.batch_size)
+        )
+        stmt = (
+            update(Appointment)
+            # Re-checked in the UPDATE itself: a doctor may complete a row between the two.
+            .where(Appointment.id.in_(batch.scalar_subquery()), PLANNED_APPOINTMENT)
+            .values(status=AppointmentStatus.NO_SHOW)
+            .returning(
+                Appointment.id, Appointment.doctor_id, Appointment.client_id,
+                Appointment.date_time, Appointment.duration_minutes, Appointment.status,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        moved = (await db.execute(stmt)).all()
+        await db.commit()
+        for row in moved:
+            publish_appointment("no_show", row)
+        return len(moved)
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.sweep_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                logger.exception("Appointment sweep failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run_forever(), name=LEASE_NAME)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self.lease_held:
+            async with self._session_factory() as db:
+                await release_lease(db, LEASE_NAME, self.holder)
+            self.lease_held = False
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "lease_held": self.lease_held,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "batches": self.batches,
+            "swept": self.swept,
+            "last_swept": self.last_swept,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_duration_ms": self.last_duration_ms,
+        }
+
+
+appointment_sweeper = AppointmentSweeper(
+    interval_seconds=settings.SWEEPER_INTERVAL_SECONDS,
+    grace=timedelta(hours=settings.SWEEPER_GRACE_HOURS),
+    batch_size=settings.SWEEPER_BATCH_SIZE,
+    lease_seconds=settings.SWEEPER_LEASE_SECONDS,
+)
+metrics.register("appointment_sweeper", appointment_sweeper.stats)
@@ -1,8 +1,9 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import String, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from app.core.db import Base
 from app.core.models import TimestampMixin
+from app.core.search_keys import search_key, search_key_column
 if TYPE_CHECKING:
     from app.users.models import User
     from app.pets.models import Pet
@@ -10,6 +11,9 @@ if TYPE_CHECKING:
 
 class Client(Base, TimestampMixin):
     __tablename__ = "clients"
+    __table_args__ = (
+        Index("ix_clients_full_name_key", "full_name_key"),  # owner filter of the pet search
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -17,9 +21,15 @@ class Client(Base, TimestampMixin):
     user: Mapped["User"] = relationship(back_populates="client_profile", cascade="all, delete-orphan",single_parent=True)
 
     full_name: Mapped[str] = mapped_column(String(100))
+    full_name_key: Mapped[str] = search_key_column("full_name")
     address: Mapped[str | None] = mapped_column(String, nullable=True)
     phone_number: Mapped[str | None] = mapped_column(String(20), nullable=True)
 
     pets: Mapped[list["Pet"]] = relationship(back_populates="owner", cascade="all, delete-orphan")
 
-    appointments: Mapped[list["Appointment"]] = relationship(back_populates="client", cascade="all, delete-orphan")
\ No newline at end of file
+    appointments: Mapped[list["Appointment"]] = relationship(back_populates="client", cascade="all, delete-orphan")
+
+    @validates("full_name")
+    def _set_full_name_key(self, key, value):
+        self.full_name_key = search_key(value)
+        return value
@@ -1,10 +1,10 @@
 from typing import List
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Query, status, Depends
 from app.core.db import SessionDep
 from app.users import service as user_service
 from app.clients import schemas, service
 from app.users.dependencies import get_current_admin
-from app.users.models import User
+from app.users.principal import Principal
 
 router = APIRouter(prefix="/clients", tags=["Clients"])
 
@@ -22,16 +22,34 @@ async def read_clients(
     db: SessionDep,
     skip: int = 0,
     limit: int = 100,
-    admin: User = Depends(get_current_admin)
+    admin: Principal = Depends(get_current_admin)
 ):
     return await service.get_clients(db, skip=skip, limit=limit)
 
 
+@router.get("/search", response_model=schemas.ClientSearchPage)
+async def search_clients(
+    db: SessionDep,
+    q: str = Query(..., min_length=3, max_length=100, description="Part of a name, phone number or email"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    admin: Principal = Depends(get_current_admin)
+):
+    """Ranked client lookup for the front desk. Admin only.
+
+    `total` counts the matches. Only the best 1000 can be paged through; when a term is
+    shared by more clients than that (say "gmail"), `truncated` is true and the query
+    needs another term.
+    """
+    items, total, truncated = await service.search_clients(db, q, skip=skip, limit=limit)
+    return {"items": items, "total": total, "truncated": truncated}
+
+
 @router.get("/{client_id}", response_model=schemas.ClientRead)
 async def get_client(
     client_id: int,
     db: SessionDep,
-    admin: User = Depends(get_current_admin)
+    admin: Principal = Depends(get_current_admin)
 ):
     """Get a client by ID. Admin only."""
     return await service.get_client_or_404(db, client_id)
@@ -42,7 +60,7 @@ async def update_client(
     client_id: int,
     client_update: schemas.ClientUpdate,
     db: SessionDep,
-    admin: User = Depends(get_current_admin)
+    admin: Principal = Depends(get_current_admin)
 ):
     """Update a client. Admin only."""
     return await service.update_client_or_404(db, client_id, client_update)
@@ -52,7 +70,7 @@ async def update_client(
 async def delete_client(
     client_id: int,
     db: SessionDep,
-    admin: User = Depends(get_current_admin)
+    admin: Principal = Depends(get_current_admin)
 ):
     """Delete a client. Admin only."""
     await service.delete_client_or_404(db, client_id)
\ No newline at end of file
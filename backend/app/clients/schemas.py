@@ -1,3 +1,5 @@
+from typing import List
+
 from pydantic import EmailStr, Field, BaseModel, field_validator
 
 
@@ -81,3 +83,9 @@ class ClientRead(BaseModel):
     full_name: str
     phone_number: str
     address: str | None = None
+
+
+class ClientSearchPage(BaseModel):
+    items: List[ClientRead]
+    total: int          # matches found; at most MAX_RANKED_MATCHES when truncated
+    truncated: bool     # more clients matched than were ranked; refine the query
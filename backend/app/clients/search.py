@@ -0,0 +1,117 @@
+import re
+
+from sqlalchemy import Connection, Select, column, delete, func, insert, literal_column, or_, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.clients.models import Client
+from app.users.models import User
+
+# SQLite FTS5 table with the trigram tokenizer, so any 3+ character substring of a
+# name, phone number (digits only) or email is an index lookup. rowid = clients.id.
+# Created outside Base.metadata (create_all cannot make virtual tables) and kept in
+# step with `clients` by clients/service.py.
+SEARCH_TABLE = "client_search"
+search_table = table(SEARCH_TABLE, column("rowid"), column("full_name"), column("phone_digits"), column("email"))
+
+MIN_TERM_LENGTH = 3  # trigram: shorter substrings match nothing
+# Every match is ranked, but only the best this many can be paged through; a term like
+# "gmail" hits far more clients than anyone reads and needs refining anyway. Searches
+# that hit more say so with `truncated`.
+MAX_RANKED_MATCHES = 1000
+# bm25 column weights: a hit in the name counts most, then the phone, then the email.
+RANK_FUNCTION = "bm25(10.0, 5.0, 1.0)"
+
+
+def digits(value: str | None) -> str:
+    return re.sub(r"\D", "", value or "")
+
+
+def is_supported(bind) -> bool:
+    return bind.dialect.name == "sqlite"
+
+
+def create_search_table(conn: Connection) -> bool:
+    """Create the FTS5 table if missing (sync, for run_sync); True if it was created."""
+    if not is_supported(conn) or conn.dialect.has_table(conn, SEARCH_TABLE):
+        return False
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE {SEARCH_TABLE} "
+        "USING fts5(full_name, phone_digits, email, tokenize='trigram')"
+    ))
+    conn.execute(text(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}, rank) VALUES ('rank', '{RANK_FUNCTION}')"))
+    return True
+
+
+async def rebuild_search_index(db: AsyncSession) -> None:
+    """Re-index every client from `clients` and `users`, e.g. after bulk inserts. Does not commit."""
+    if not is_supported(db.bind):
+        return
+    await db.execute(delete(search_table))
+    rows = (await db.execute(
+        select(Client.id, Client.full_name, Client.phone_number, User.email).join(User, User.id == Client.user_id)
+    )).all()
+    if rows:
+        await db.execute(insert(search_table), [
+            {"rowid": client_id, "full_name": name, "phone_digits": digits(phone), "email": email}
+            for client_id, name, phone, email in rows
+        ])
+
+
+async def search_index_is_stale(db: AsyncSession) -> bool:
+    if not is_supported(db.bind):
+        return False
+    indexed = await db.scalar(select(func.count()).select_from(search_table))
+    return indexed != await db.scalar(select(func.count()).select_from(Client))
+
+
+async def index_client(db: AsyncSession, client_id: int, full_name: str, phone_number: str | None, email: str) -> None:
+    """Insert or replace one client's search row in the caller's transaction."""
+    if not is_supported(db.bind):
+        return
+    await unindex_client(db, client_id)
+    await db.execute(insert(search_table).values(
+        rowid=client_id, full_name=full_name, phone_digits=digits(phone_number), email=email,
+    ))
+
+
+async def unindex_client(db: AsyncSession, client_id: int) -> None:
+    if not is_supported(db.bind):
+        return
+    await db.execute(delete(search_table).where(search_table.c.rowid == client_id))
+
+
+def search_terms(query: str) -> list[str]:
+    """Split a front-desk query into terms; phone-like terms are reduced to their digits."""
+    terms = []
+    for term in query.split():
+        if not re.search(r"[^\d\s()+\-.]", term):
+            term = digits(term)
+        if len(term) >= MIN_TERM_LENGTH:
+            terms.append(term.lower())
+    return terms
+
+
+def build_ranked_ids_query(terms: list[str]) -> Select:
+    """SQLite: ids of clients matching every term, best first, one past MAX_RANKED_MATCHES to detect truncation.
+
+    FTS5 orders the whole match by rank before the LIMIT applies, so the cap keeps the best matches.
+    """
+    # Each term is a quoted phrase, so punctuation in emails and names is taken literally.
+    match = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+    return (
+        select(search_table.c.rowid)
+        .where(literal_column(SEARCH_TABLE).op("MATCH")(match))
+        .order_by(literal_column("rank"), search_table.c.rowid)
+        .limit(MAX_RANKED_MATCHES + 1)
+    )
+
+
+def build_substring_query(terms: list[str]) -> Select:
+    """Clients matching every term, by name; for databases without FTS5."""
+    # Plain substring filters (pg_trgm GIN indexes would make them fast on PostgreSQL).
+    stmt = select(Client).join(User, User.id == Client.user_id)
+    phone_digits = func.regexp_replace(Client.phone_number, r"\D", "", "g")
+    for term in terms:
+        pattern = f"%{term}%"
+        stmt = stmt.where(or_(Client.full_name.ilike(pattern), phone_digits.like(pattern), User.email.ilike(pattern)))
+    return stmt.order_by(Client.full_name, Client.id)
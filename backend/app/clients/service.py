@@ -1,12 +1,21 @@
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
+from app.appointments.models import ACTIVE_APPOINTMENT, Appointment
+from app.appointments.schedule import schedule_index
+from app.appointments.service import calendar_cache
 from app.users.models import User, UserRole
 from app.users.service import get_user_by_email
 from app.clients.models import Client
 from app.clients.schemas import ClientCreate, ClientUpdate
-from app.core.security import get_password_hash
+from app.clients.search import (
+    MAX_RANKED_MATCHES, MIN_TERM_LENGTH, build_ranked_ids_query, build_substring_query, index_client,
+    is_supported, search_terms, unindex_client,
+)
+from app.core.hashing import password_hasher
+from app.core.totals import row_counts
+from app.users.principal import invalidate_user
 
 
 async def create_client_with_validation(
@@ -28,7 +37,7 @@ async def create_client(db: AsyncSession, client_in: ClientCreate) -> Client:
     """Create a new client (internal use)."""
     db_user = User(
         email=str(client_in.email),
-        password_hash=get_password_hash(client_in.password),
+        password_hash=await password_hasher.hash(client_in.password),
         role=UserRole.CLIENT
     )
     db.add(db_user)
@@ -41,6 +50,8 @@ async def create_client(db: AsyncSession, client_in: ClientCreate) -> Client:
         address=client_in.address
     )
     db.add(db_client)
+    await db.flush()
+    await index_client(db, db_client.id, db_client.full_name, db_client.phone_number, db_user.email)
 
     await db.commit()
     await db.refresh(db_client)
@@ -60,6 +71,39 @@ async def get_clients(db: AsyncSession, skip: int = 0, limit: int = 5) -> list[C
     return result.scalars().all()
 
 
+async def search_clients(
+    db: AsyncSession, query: str, skip: int = 0, limit: int = 20
+) -> tuple[list[Client], int, bool]:
+    """Clients whose name, phone digits or email contain every term of `query`, best match first.
+
+    Returns the page, the number of matches and whether that number was capped: on SQLite
+    only the best MAX_RANKED_MATCHES are kept (see clients/search.py).
+    """
+    terms = search_terms(query)
+    if not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Search needs at least one term of {MIN_TERM_LENGTH} or more characters"
+        )
+    if not is_supported(db.bind):
+        stmt = build_substring_query(terms)
+        total = await db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+        result = await db.execute(stmt.offset(skip).limit(limit))
+        return list(result.scalars().all()), total, False
+
+    ids = list((await db.execute(build_ranked_ids_query(terms))).scalars().all())
+    truncated = len(ids) > MAX_RANKED_MATCHES
+    ids = ids[:MAX_RANKED_MATCHES]
+    page_ids = ids[skip:skip + limit]
+    if not page_ids:
+        return [], len(ids), truncated
+    clients = {
+        client.id: client
+        for client in (await db.execute(select(Client).where(Client.id.in_(page_ids)))).scalars()
+    }
+    return [clients[client_id] for client_id in page_ids if client_id in clients], len(ids), truncated
+
+
 async def get_client_by_id(db: AsyncSession, client_id: int) -> Client | None:
     """Get a client by ID. Returns None if not found."""
     query = select(Client).where(Client.id == client_id)
@@ -91,8 +135,12 @@ async def update_client(
     update_data = client_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(client, field, value)
+    if update_data.keys() & {"full_name", "phone_number"}:
+        email = await db.scalar(select(User.email).where(User.id == client.user_id))
+        await index_client(db, client.id, client.full_name, client.phone_number, email)
     
     await db.commit()
+    invalidate_user(client.user_id)
     await db.refresh(client)
     return client
 
@@ -118,8 +166,19 @@ async def delete_client(db: AsyncSession, client_id: int) -> bool:
     client = result.scalar_one_or_none()
 
     if client:
+        # The delete cascades to the client's appointments; their slots must show as free again.
+        booked = (await db.execute(
+            select(Appointment.doctor_id, Appointment.date_time)
+            .where(Appointment.client_id == client.id, ACTIVE_APPOINTMENT)
+        )).all()
         await db.delete(client)
+        await unindex_client(db, client.id)
         await db.commit()
+        invalidate_user(client.user_id)
+        for doctor_id, starts_at in booked:
+            schedule_index.mark_released(doctor_id, starts_at)
+        calendar_cache.clear()
+        row_counts.clear()  # the delete cascaded to appointments and pets of many scopes
     return True
 
 
@@ -0,0 +1,133 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded in-process LRU cache whose entries expire after a TTL.
+
+    Not thread-safe: it is meant to be used from the event loop of a single
+    worker, where every operation runs without interleaving.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._loading: dict[Hashable, asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.coalesced = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl_seconds: float | None = None,
+    ) -> Any:
+        """Return the cached value or run `loader` once for all concurrent callers of the same key.
+
+        If the key is invalidated while the loader runs, its result is still returned to
+        the callers already waiting but is not stored.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            value = await loader()
+        except BaseException as exc:
+            if self._loading.get(key) is future:
+                del self._loading[key]
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                future.exception()  # waiters re-raise it; don't warn when there are none
+            raise
+
+        if self._loading.get(key) is future:
+            del self._loading[key]
+            self.set(key, value, ttl_seconds)
+        future.set_result(value)
+        return value
+
+    def update(self, key: Hashable, fn: Callable[[Any], Any]) -> None:
+        """Replace a live entry's value with fn(value), keeping its expiry; missing keys are left alone.
+
+        A load in flight for the key is invalidated, since its result may predate the change.
+        """
+        self._loading.pop(key, None)
+        entry = self._entries.get(key, _MISSING)
+        if entry is not _MISSING and entry[0] > self._clock():
+            self._entries[key] = (entry[0], fn(entry[1]))
+
+    def pop(self, key: Hashable) -> None:
+        self._loading.pop(key, None)
+        if self._entries.pop(key, _MISSING) is not _MISSING:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._loading.clear()
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key, _MISSING)
+        return entry is not _MISSING and entry[0] > self._clock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "coalesced": self.coalesced,
+        }
@@ -11,6 +11,55 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     ALGORITHM: str = "HS256"
 
+    # Password hashing pool: "thread", "process" or "inline" (runs on the event loop, tests only)
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 256
+
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30
+
+    # Issue tokens carrying uid/role/profile ids so requests are authorized without a user lookup
+    STATELESS_TOKENS: bool = False
+    TOKEN_VERSION_CACHE_TTL_SECONDS: float = 30
+
+    # Verified JWT claims kept until the token expires; 0 disables the cache
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+
+    # Seconds a loaded doctor-day in the schedule index is trusted before re-reading it
+    SCHEDULE_INDEX_TTL_SECONDS: float = 60
+    # Doctors kept in the schedule index (least recently used are evicted)
+    SCHEDULE_INDEX_MAX_DOCTORS: int = 2_000
+    # Slot lookups and searches accept days from yesterday up to this many days ahead
+    BOOKING_HORIZON_DAYS: int = 365
+
+    # Per-(doctor, day) calendar aggregates; cleared on every appointment write
+    CALENDAR_CACHE_MAX_SIZE: int = 1_000
+    CALENDAR_CACHE_TTL_SECONDS: float = 30
+
+    # Cached list totals (totals=cached); writes adjust them in place, the TTL bounds drift from other workers
+    TOTALS_CACHE_MAX_SIZE: int = 50_000
+    TOTALS_CACHE_TTL_SECONDS: float = 300
+
+    # Background job marking planned appointments older than the grace period as no-shows.
+    # One worker at a time holds the lease; it renews it every run, so keep it above the interval.
+    SWEEPER_ENABLED: bool = True
+    SWEEPER_INTERVAL_SECONDS: float = 300
+    SWEEPER_GRACE_HOURS: float = 24
+    SWEEPER_BATCH_SIZE: int = 500
+    SWEEPER_LEASE_SECONDS: float = 600
+
+    # Serialized pages of the public doctor list, per filter combination; cleared on doctor writes, the TTL bounds staleness across workers
+    DOCTOR_DIRECTORY_CACHE_MAX_SIZE: int = 512
+    DOCTOR_DIRECTORY_CACHE_TTL_SECONDS: float = 60
+
+    # Server-sent schedule events: subscribers per worker, events a subscriber may fall behind
+    # before it is dropped, and how often idle streams get a keep-alive comment
+    EVENTS_MAX_SUBSCRIBERS: int = 10_000
+    EVENTS_QUEUE_SIZE: int = 64
+    EVENTS_HEARTBEAT_SECONDS: float = 15
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
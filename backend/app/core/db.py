@@ -5,7 +5,9 @@ from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, Asyn
 from sqlalchemy.orm import DeclarativeBase
 from app.core.config import settings
 
-db_url = settings.DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://")
+db_url = settings.DATABASE_URL
+if db_url.startswith("sqlite://"):
+    db_url = db_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
 
 engine = create_async_engine(
     db_url,
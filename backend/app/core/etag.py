@@ -0,0 +1,29 @@
+import hashlib
+
+from fastapi import HTTPException, Response, status
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over the data versions a response is built from (ids, counts, timestamps, ...)."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match uses the weak comparison, so W/ prefixes (added by some proxies) are ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def apply_etag(response: Response, if_none_match: str | None, etag: str, cache_control: str = "no-cache") -> None:
+    """Tag `response`, or raise 304 Not Modified if the client already holds this representation.
+
+    Call it before loading and serializing the body, so a 304 costs only the version lookup.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
@@ -11,10 +11,23 @@ from app.doctors.models import DoctorSpecialization, Doctor
 from app.users.models import User, UserRole
 from app.pets.models import Pet, PetSpecies
 from app.clients.models import Client
+from app.clients.search import create_search_table, rebuild_search_index, search_index_is_stale
 from app.appointments.models import Appointment, AppointmentStatus
 from app.core.security import get_password_hash
 
 
+def _password_hasher():
+    """Hash each distinct plaintext once; every demo account shares one of two passwords."""
+    hashes: dict[str, str] = {}
+
+    def hash_password(password: str) -> str:
+        if password not in hashes:
+            hashes[password] = get_password_hash(password)
+        return hashes[password]
+
+    return hash_password
+
+
 async def init_db(db: AsyncSession):
     admin_email = "admin@vet.com"
     result = await db.execute(select(User).filter(User.email == admin_email))
@@ -37,6 +50,7 @@ async def init_db(db: AsyncSession):
         return
 
     print("\n📝 Creating test data...")
+    hash_password = _password_hasher()
 
     doctors_data = [
         {
@@ -90,14 +104,11 @@ async def init_db(db: AsyncSession):
     for doc_data in doctors_data:
         user = User(
             email=doc_data["email"],
-            password_hash=get_password_hash(doc_data["password"]),
+            password_hash=hash_password(doc_data["password"]),
             role=UserRole.DOCTOR,
         )
-        db.add(user)
-        await db.flush()
-
         doctor = Doctor(
-            user_id=user.id,
+            user=user,
             full_name=doc_data["full_name"],
             specialization=doc_data["specialization"],
             experience_years=doc_data["experience_years"],
@@ -105,11 +116,8 @@ async def init_db(db: AsyncSession):
             bio=doc_data["bio"]
         )
         db.add(doctor)
-        await db.flush()
         created_doctors.append(doctor)
 
-    await db.commit()
-
     clients_data = [
         {
             "email": "alice@example.com",
@@ -145,25 +153,19 @@ async def init_db(db: AsyncSession):
     for client_data in clients_data:
         user = User(
             email=client_data["email"],
-            password_hash=get_password_hash(client_data["password"]),
+            password_hash=hash_password(client_data["password"]),
             role=UserRole.CLIENT,
         )
-        db.add(user)
-        await db.flush()
-
         client = Client(
-            user_id=user.id,
+            user=user,
             full_name=client_data["full_name"],
             phone_number=client_data["phone_number"],
             address=client_data["address"]
         )
         db.add(client)
-        await db.flush()
         created_clients.append(client)
         print(f"  ✅ Client created: {client_data['full_name']} ({client_data['email']} / {client_data['password']})")
 
-    await db.commit()
-
     pets_data = [
         {"name": "Rex", "species": PetSpecies.DOG, "breed": "German Shepherd", "birth_date": date(2019, 5, 15),
          "owner_idx": 0},
@@ -190,15 +192,12 @@ async def init_db(db: AsyncSession):
             species=pet_data["species"],
             breed=pet_data["breed"],
             birth_date=pet_data["birth_date"],
-            owner_id=created_clients[pet_data["owner_idx"]].id
+            owner=created_clients[pet_data["owner_idx"]]
         )
         db.add(pet)
-        await db.flush()
         created_pets.append(pet)
         print(f"  ✅ Pet created: {pet_data['name']} ({pet_data['breed']})")
 
-    await db.commit()
-
     now = datetime.now(timezone.utc)
     appointments_data = [
         {"date_time": now + timedelta(days=1, hours=10), "doctor_idx": 0, "client_idx": 0, "pet_idx": 0,
@@ -229,9 +228,9 @@ async def init_db(db: AsyncSession):
     for apt_data in appointments_data:
         appointment = Appointment(
             date_time=apt_data["date_time"],
-            doctor_id=created_doctors[apt_data["doctor_idx"]].id,
-            client_id=created_clients[apt_data["client_idx"]].id,
-            pet_id=created_pets[apt_data["pet_idx"]].id,
+            doctor=created_doctors[apt_data["doctor_idx"]],
+            client=created_clients[apt_data["client_idx"]],
+            pet=created_pets[apt_data["pet_idx"]],
             reason=apt_data["reason"],
             status=apt_data["status"],
             doctor_notes=apt_data.get("doctor_notes")
@@ -249,9 +248,13 @@ async def init_db(db: AsyncSession):
 async def setup():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_search_table)
 
     async with async_session_factory() as db:
         await init_db(db)
+        if await search_index_is_stale(db):
+            await rebuild_search_index(db)
+            await db.commit()
 
 
 if __name__ == "__main__":
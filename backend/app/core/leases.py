@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import DateTime, String, delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class JobLease(Base):
+    """Named lease that lets one worker out of several run a periodic job."""
+    __tablename__ = "job_leases"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(128))
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+async def acquire_lease(db: AsyncSession, name: str, holder: str, ttl_seconds: float) -> bool:
+    """Take or renew lease `name` for `ttl_seconds`; False while another holder's lease is live.
+
+    A single INSERT ... ON CONFLICT DO UPDATE ... RETURNING, so two workers racing
+    for an expired lease cannot both win. Commits.
+    """
+    now = datetime.now(timezone.utc)
+    insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+    stmt = insert(JobLease).values(name=name, holder=holder, expires_at=now + timedelta(seconds=ttl_seconds))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[JobLease.name],
+        set_={"holder": stmt.excluded.holder, "expires_at": stmt.excluded.expires_at},
+        where=(JobLease.expires_at < now) | (JobLease.holder == stmt.excluded.holder),
+    ).returning(JobLease.holder)
+    won = await db.scalar(stmt)
+    await db.commit()
+    return won == holder
+
+
+async def release_lease(db: AsyncSession, name: str, holder: str) -> None:
+    """Give up the lease early so another worker can take it without waiting for expiry."""
+    await db.execute(delete(JobLease).where(JobLease.name == name, JobLease.holder == holder))
+    await db.commit()
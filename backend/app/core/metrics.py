@@ -0,0 +1,12 @@
+from typing import Callable
+
+_providers: dict[str, Callable[[], dict]] = {}
+
+
+def register(name: str, provider: Callable[[], dict]) -> None:
+    """Register a callable returning a snapshot of counters under `name`."""
+    _providers[name] = provider
+
+
+def collect() -> dict[str, dict]:
+    return {name: provider() for name, provider in _providers.items()}
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends
+
+from app.core import metrics
+from app.users.dependencies import get_current_admin
+from app.users.principal import Principal
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/")
+async def read_metrics(admin: Principal = Depends(get_current_admin)):
+    """In-process counters of caches and worker pools. Admin only."""
+    return metrics.collect()
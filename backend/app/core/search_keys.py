@@ -0,0 +1,37 @@
+import unicodedata
+
+from sqlalchemy import String
+from sqlalchemy.orm import MappedColumn, mapped_column
+
+# Names are searched by case-insensitive prefix. SQLite's lower() folds ASCII only,
+# so lower(full_name) cannot match "іва" to "Іванов". Each searchable name is stored
+# a second time, folded in Python, in an indexed `*_key` column, and queries fold
+# the prefix the same way.
+
+_PREFIX_END = "\U0010ffff"  # sorts after every character a key can continue with
+
+
+def search_key(value: str | None) -> str | None:
+    """Caseless form of a name: NFKC-normalized, then str.casefold()."""
+    if value is None:
+        return None
+    return unicodedata.normalize("NFKC", value).casefold()
+
+
+def search_key_column(source: str, nullable: bool = False) -> MappedColumn:
+    """Column holding search_key(<source>).
+
+    The default covers Core inserts that leave the key out; models keep it in step
+    on ORM writes with a @validates hook on the source attribute.
+    """
+    return mapped_column(
+        String,
+        nullable=nullable,
+        default=lambda context: search_key(context.get_current_parameters().get(source)),
+    )
+
+
+def starts_with(key_column, prefix: str) -> list:
+    """Prefix match on a search key column as a range, so it is a seek on the column's indexes."""
+    key = search_key(prefix)
+    return [key_column >= key, key_column < key + _PREFIX_END]
@@ -1,6 +1,11 @@
 from datetime import timedelta, datetime, timezone
+from hashlib import sha256
+from types import MappingProxyType
+import time
 import jwt
 import bcrypt
+from app.core import metrics
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 
@@ -30,4 +35,23 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     to_encode.update({"exp": expire})
 
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
+
+
+# Verified claims keyed by a digest of the raw token; each entry lives until the token's exp.
+_verified_tokens = TTLCache(max_size=settings.TOKEN_CACHE_MAX_SIZE, ttl_seconds=0)
+metrics.register("verified_token_cache", _verified_tokens.stats)
+
+
+def decode_access_token(token: str) -> MappingProxyType:
+    """Verify a token and return its claims (read-only). Raises jwt.PyJWTError if invalid."""
+    key = sha256(token.encode("utf-8")).digest()
+    payload = _verified_tokens.get(key)
+    if payload is not None:
+        return payload
+
+    payload = MappingProxyType(jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]))
+    exp = payload.get("exp")
+    if exp is not None:
+        _verified_tokens.set(key, payload, ttl_seconds=exp - time.time())
+    return payload
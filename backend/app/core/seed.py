@@ -0,0 +1,245 @@
+"""Synthetic dataset generator for capacity testing.
+
+    python -m app.core.seed --clients 50000 --appointments 2000000 --seed 42
+
+Rows are generated deterministically from --seed and written with Core
+executemany inserts, one transaction per --batch-size rows. Primary keys are
+assigned up front so foreign keys never need a round trip. Every synthetic
+account shares one password, hashed once.
+
+Without scale flags it only runs the demo bootstrap from initial_data.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+sys.path.append(os.getcwd())
+
+import bcrypt
+from sqlalchemy import func, insert, select, text
+
+from app.core.db import Base, async_session_factory, engine
+from app.core.initial_data import init_db
+from app.users.models import User, UserRole
+from app.doctors.models import Doctor, DoctorSpecialization
+from app.clients.models import Client
+from app.clients.search import create_search_table, rebuild_search_index
+from app.pets.models import Pet, PetSpecies
+from app.appointments.models import Appointment, AppointmentStatus
+
+SEED_EMAIL_DOMAIN = "seed.vet"
+SYNTHETIC_PASSWORD = "password123"
+
+WORK_START_HOUR = 9
+SLOT_MINUTES = 45
+SLOTS_PER_DAY = 11  # 9:00 .. 16:30
+
+FIRST_NAMES = ["Olivia", "Liam", "Emma", "Noah", "Ava", "Elijah", "Sophia", "James", "Mia", "Lucas",
+               "Amelia", "Mason", "Harper", "Ethan", "Evelyn", "Logan", "Abigail", "Jacob", "Ella", "Oliver"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Wilson", "Moore",
+              "Taylor", "Anderson", "Thomas", "Jackson", "White", "Harris", "Martin", "Thompson", "Lee", "Clark"]
+PET_NAMES = ["Rex", "Luna", "Bailey", "Simba", "Charlie", "Snowball", "Jack", "Max", "Bella", "Coco",
+             "Milo", "Daisy", "Rocky", "Nala", "Oscar", "Ginger", "Toby", "Pepper", "Buddy", "Ziggy"]
+BREEDS = {
+    PetSpecies.DOG: ["Labrador", "Beagle", "German Shepherd", "Poodle", "Bulldog"],
+    PetSpecies.CAT: ["Persian", "Maine Coon", "Siamese", "British Shorthair", "Sphynx"],
+    PetSpecies.RABBIT: ["Angora", "Rex", "Lionhead"],
+    PetSpecies.BIRD: ["Budgie", "Cockatiel", "Canary"],
+    PetSpecies.HAMSTER: ["Syrian", "Roborovski"],
+}
+REASONS = ["Routine Checkup", "Vaccination", "Dental cleaning", "Skin rash", "Follow-up", "Limping",
+           "Surgery consultation", "Heart checkup", "Eye infection", "Allergy"]
+
+
+def _batched(rows: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _next_id(model) -> int:
+    async with engine.connect() as conn:
+        return (await conn.scalar(select(func.max(model.id))) or 0) + 1
+
+
+async def _bulk_insert(model, rows: Iterator[dict], batch_size: int, label: str) -> int:
+    table = model.__table__
+    written = 0
+    started = time.perf_counter()
+    for batch in _batched(rows, batch_size):
+        async with engine.begin() as conn:
+            await conn.execute(insert(table), batch)
+        written += len(batch)
+    elapsed = time.perf_counter() - started
+    print(f"  ✅ {label}: {written:,} rows in {elapsed:.1f}s ({written / elapsed if elapsed else 0:,.0f} rows/s)")
+    return written
+
+
+async def seed(
+    doctors: int,
+    clients: int,
+    pets_per_client: int,
+    appointments: int,
+    days_back: int,
+    days_ahead: int,
+    rng_seed: int,
+    batch_size: int,
+    bcrypt_rounds: int,
+    now: datetime | None = None,
+) -> None:
+    """Write the synthetic dataset; `now` (default: the current time) anchors timestamps and the schedule."""
+    async with engine.connect() as conn:
+        already = await conn.scalar(
+            select(func.count()).select_from(User).where(User.email.like(f"%@{SEED_EMAIL_DOMAIN}"))
+        )
+    if already:
+        print(f"⚠️ Synthetic data already present ({already:,} users), skipping.")
+        return
+
+    days = days_back + days_ahead
+    capacity = doctors * days * SLOTS_PER_DAY
+    if appointments > capacity:
+        raise SystemExit(f"{appointments:,} appointments do not fit into {doctors} doctors x {days} days "
+                         f"x {SLOTS_PER_DAY} slots ({capacity:,}); add doctors or days.")
+
+    rng = random.Random(rng_seed)
+    now = (now or datetime.now(timezone.utc)).replace(microsecond=0)
+    password_hash = bcrypt.hashpw(SYNTHETIC_PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=bcrypt_rounds)).decode("utf-8")
+
+    first_user = await _next_id(User)
+    first_doctor = await _next_id(Doctor)
+    first_client = await _next_id(Client)
+    first_pet = await _next_id(Pet)
+    first_appointment = await _next_id(Appointment)
+    specializations = list(DoctorSpecialization)
+    species = list(BREEDS)
+
+    def user_rows():
+        for i in range(doctors):
+            yield {"id": first_user + i, "email": f"doctor{i}@{SEED_EMAIL_DOMAIN}", "password_hash": password_hash,
+                   "role": UserRole.DOCTOR, "token_version": 1, "created_at": now, "updated_at": now}
+        for i in range(clients):
+            yield {"id": first_user + doctors + i, "email": f"client{i}@{SEED_EMAIL_DOMAIN}",
+                   "password_hash": password_hash, "role": UserRole.CLIENT, "token_version": 1,
+                   "created_at": now, "updated_at": now}
+
+    def doctor_rows():
+        for i in range(doctors):
+            yield {"id": first_doctor + i, "user_id": first_user + i,
+                   "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                   "experience_years": rng.randint(0, 35), "phone_number": f"+1555{i:07d}", "bio": None,
+                   "specialization": specializations[i % len(specializations)],
+                   "created_at": now, "updated_at": now}
+
+    def client_rows():
+        for i in range(clients):
+            yield {"id": first_client + i, "user_id": first_user + doctors + i,
+                   "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                   "phone_number": f"+1666{i:07d}", "address": None, "created_at": now, "updated_at": now}
+
+    def pet_rows():
+        today = now.date()
+        for i in range(clients):
+            for k in range(pets_per_client):
+                kind = rng.choice(species)
+                yield {"id": first_pet + i * pets_per_client + k, "owner_id": first_client + i,
+                       "name": rng.choice(PET_NAMES), "species": kind, "breed": rng.choice(BREEDS[kind]),
+                       "birth_date": today - timedelta(days=rng.randint(90, 15 * 365)),
+                       "weight": round(rng.uniform(0.1, 60), 1), "created_at": now, "updated_at": now}
+
+    def appointment_rows():
+        # Each appointment takes a distinct (doctor, day, slot) cell, so the seeded schedule has no overlaps.
+        day_zero = now.replace(hour=0, minute=0, second=0) - timedelta(days=days_back)
+        cells = rng.sample(range(capacity), appointments)
+        cells.sort()
+        for n, cell in enumerate(cells):
+            doctor_idx, rest = divmod(cell, days * SLOTS_PER_DAY)
+            day_idx, slot_idx = divmod(rest, SLOTS_PER_DAY)
+            start = day_zero + timedelta(days=day_idx, hours=WORK_START_HOUR, minutes=slot_idx * SLOT_MINUTES)
+            client_idx = rng.randrange(clients)
+            if start < now:
+                status = AppointmentStatus.CANCELLED if rng.random() < 0.08 else AppointmentStatus.COMPLETED
+            else:
+                status = AppointmentStatus.CANCELLED if rng.random() < 0.05 else AppointmentStatus.PLANNED
+            yield {"id": first_appointment + n, "date_time": start, "duration_minutes": SLOT_MINUTES,
+                   "status": status, "reason": rng.choice(REASONS),
+                   "doctor_notes": "Seeded visit." if status == AppointmentStatus.COMPLETED else None,
+                   "client_id": first_client + client_idx, "doctor_id": first_doctor + doctor_idx,
+                   "pet_id": first_pet + client_idx * pets_per_client + rng.randrange(pets_per_client),
+                   "created_at": now, "updated_at": now}
+
+    print(f"\n📝 Seeding synthetic data (seed={rng_seed})...")
+    async with engine.begin() as conn:
+        # Durability is irrelevant for a throwaway capacity database.
+        if engine.dialect.name == "sqlite":
+            await conn.execute(text("PRAGMA journal_mode=WAL"))
+            await conn.execute(text("PRAGMA synchronous=OFF"))
+
+    await _bulk_insert(User, user_rows(), batch_size, "Users")
+    await _bulk_insert(Doctor, doctor_rows(), batch_size, "Doctors")
+    await _bulk_insert(Client, client_rows(), batch_size, "Clients")
+    if pets_per_client:
+        await _bulk_insert(Pet, pet_rows(), batch_size, "Pets")
+    if appointments:
+        await _bulk_insert(Appointment, appointment_rows(), batch_size, "Appointments")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(create_search_table)
+    async with async_session_factory() as db:
+        await rebuild_search_index(db)
+        await db.commit()
+    print(f"\n✅ Synthetic accounts use password '{SYNTHETIC_PASSWORD}', e.g. client0@{SEED_EMAIL_DOMAIN}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    if not args.no_bootstrap:
+        async with async_session_factory() as db:
+            await init_db(db)
+
+    if args.clients or args.appointments:
+        if args.appointments and not (args.clients and args.pets_per_client and args.doctors):
+            raise SystemExit("Appointments need at least one doctor, client and pet per client.")
+        await seed(
+            doctors=args.doctors,
+            clients=args.clients,
+            pets_per_client=args.pets_per_client,
+            appointments=args.appointments,
+            days_back=args.days_back,
+            days_ahead=args.days_ahead,
+            rng_seed=args.seed,
+            batch_size=args.batch_size,
+            bcrypt_rounds=args.bcrypt_rounds,
+        )
+    await engine.dispose()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--doctors", type=int, default=300)
+    parser.add_argument("--clients", type=int, default=0)
+    parser.add_argument("--pets-per-client", type=int, default=2)
+    parser.add_argument("--appointments", type=int, default=0)
+    parser.add_argument("--days-back", type=int, default=730, help="history length in days")
+    parser.add_argument("--days-ahead", type=int, default=60, help="booking horizon in days")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed; same seed, same dataset")
+    parser.add_argument("--batch-size", type=int, default=20_000, help="rows per insert transaction")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="cost of the shared synthetic password hash")
+    parser.add_argument("--no-bootstrap", action="store_true", help="skip the demo admin/doctors/clients")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
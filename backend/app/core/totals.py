@@ -0,0 +1,64 @@
+import enum
+from typing import Hashable
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+class TotalsMode(str, enum.Enum):
+    EXACT = "exact"     # count(*) on every request
+    CACHED = "cached"   # per-owner/per-doctor counter, adjusted on writes
+    NONE = "none"       # skip the count, total is null
+
+
+class RowCounters:
+    """Exact row counts per scope, e.g. ("appointments", "doctor", 7).
+
+    A counter is loaded with one count(*) on first use and afterwards adjusted
+    by the services that insert or delete rows in its scope, so reading it is
+    O(1). Counters expire after the TTL to pick up writes from other workers.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._cache = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    async def get_or_count(self, db: AsyncSession, key: Hashable, count_query: Select) -> int:
+        async def load():
+            return await db.scalar(count_query) or 0
+
+        return await self._cache.get_or_load(key, load)
+
+    def adjust(self, key: Hashable, delta: int) -> None:
+        self._cache.update(key, lambda count: count + delta)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+row_counts = RowCounters(max_size=settings.TOTALS_CACHE_MAX_SIZE, ttl_seconds=settings.TOTALS_CACHE_TTL_SECONDS)
+metrics.register("row_counts", row_counts.stats)
+
+
+async def count_total(
+    db: AsyncSession,
+    mode: TotalsMode,
+    count_query: Select,
+    key: Hashable | None = None,
+) -> int | None:
+    """Total for a list endpoint under the requested mode.
+
+    `key` names the counter that holds this exact total; without one (e.g. a
+    date-filtered list) cached mode falls back to an exact count.
+    """
+    if mode == TotalsMode.NONE:
+        return None
+    if mode == TotalsMode.CACHED and key is not None:
+        return await row_counts.get_or_count(db, key, count_query)
+    return await db.scalar(count_query) or 0
@@ -1,6 +1,7 @@
-from sqlalchemy import String, Integer, ForeignKey, Text, Enum as SqlEnum
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Integer, ForeignKey, Text, Enum as SqlEnum, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from app.core.models import TimestampMixin
+from app.core.search_keys import search_key, search_key_column
 from typing import TYPE_CHECKING
 from app.core.db import Base
 import enum
@@ -18,6 +19,13 @@ class DoctorSpecialization(str, enum.Enum):
 
 class Doctor(Base, TimestampMixin):
     __tablename__ = "doctors"
+    __table_args__ = (
+        # Directory filters and sorts: by specialization, experience and case-insensitive name.
+        Index("ix_doctors_specialization_experience_years", "specialization", "experience_years"),
+        Index("ix_doctors_specialization_full_name_key", "specialization", "full_name_key"),
+        Index("ix_doctors_experience_years", "experience_years"),
+        Index("ix_doctors_full_name_key", "full_name_key"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -25,10 +33,16 @@ class Doctor(Base, TimestampMixin):
     user: Mapped["User"] = relationship(back_populates="doctor_profile", lazy="joined", cascade="all, delete-orphan", single_parent=True)
 
     full_name: Mapped[str] = mapped_column(String(100))
+    full_name_key: Mapped[str] = search_key_column("full_name")  # name filter and sort, see app/core/search_keys.py
     experience_years: Mapped[int] = mapped_column(Integer, default=0)
     phone_number: Mapped[str | None] = mapped_column(String(20), nullable=True)
     bio: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     specialization: Mapped[DoctorSpecialization] = mapped_column(SqlEnum(DoctorSpecialization), default=DoctorSpecialization.THERAPIST)
 
-    appointments: Mapped[list["Appointment"]] = relationship(back_populates="doctor", cascade="all, delete-orphan")
\ No newline at end of file
+    appointments: Mapped[list["Appointment"]] = relationship(back_populates="doctor", cascade="all, delete-orphan")
+
+    @validates("full_name")
+    def _set_full_name_key(self, key, value):
+        self.full_name_key = search_key(value)
+        return value
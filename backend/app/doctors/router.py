@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 
 from app.core.db import SessionDep
+from app.core.etag import etag_matches
 from app.users.dependencies import get_current_admin
-from app.users.models import User
+from app.users.principal import Principal
 from app.doctors import schemas, service
+from app.doctors.models import DoctorSpecialization
 
 router = APIRouter(prefix="/doctors", tags=["Doctors"])
 
@@ -12,7 +16,7 @@ router = APIRouter(prefix="/doctors", tags=["Doctors"])
 async def create_doctor(
         doctor_in: schemas.DoctorCreate,
         db: SessionDep,
-        admin: User = Depends(get_current_admin)
+        admin: Principal = Depends(get_current_admin)
 ):
     """Create a new doctor. Admin only."""
     return await service.create_doctor(db, doctor_in)
@@ -22,16 +26,34 @@ async def create_doctor(
 async def get_doctors(
     db: SessionDep,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    specialization: Optional[DoctorSpecialization] = None,
+    min_experience: Optional[int] = Query(None, ge=0, description="Minimum years of experience"),
+    max_experience: Optional[int] = Query(None, ge=0, description="Maximum years of experience"),
+    name: Optional[str] = Query(None, min_length=1, max_length=100, description="Case-insensitive name prefix"),
+    sort: schemas.DoctorSort = schemas.DoctorSort.ID,
+    if_none_match: Optional[str] = Header(None),
 ):
-    return await service.get_doctors(db, skip=skip, limit=limit)
+    """Public doctor list, served pre-serialized from an in-process cache."""
+    filters = schemas.DoctorFilters(
+        specialization=specialization,
+        min_experience=min_experience,
+        max_experience=max_experience,
+        name=name,
+        sort=sort,
+    )
+    etag, body = await service.get_doctor_directory(db, skip, limit, filters)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/{doctor_id}", response_model=schemas.DoctorRead)
 async def get_doctor(
     doctor_id: int,
     db: SessionDep,
-    admin: User = Depends(get_current_admin)
+    admin: Principal = Depends(get_current_admin)
 ):
     doctor = await service.get_doctor_by_id(db, doctor_id)
     if not doctor:
@@ -44,7 +66,7 @@ async def update_doctor(
     doctor_id: int,
     doctor_update: schemas.DoctorUpdate,
     db: SessionDep,
-    admin: User = Depends(get_current_admin)
+    admin: Principal = Depends(get_current_admin)
 ):
     """Update a doctor. Admin only."""
     return await service.update_doctor_or_404(db, doctor_id, doctor_update)
@@ -54,7 +76,7 @@ async def update_doctor(
 async def delete_doctor(
     doctor_id: int,
     db: SessionDep,
-    admin: User = Depends(get_current_admin)
+    admin: Principal = Depends(get_current_admin)
 ):
     """Delete a doctor. Admin only."""
     await service.delete_doctor_or_404(db, doctor_id)
\ No newline at end of file
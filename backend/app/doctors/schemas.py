@@ -1,3 +1,5 @@
+import enum
+
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
 from app.doctors.models import DoctorSpecialization
 
@@ -29,4 +31,22 @@ class DoctorRead(BaseModel):
     experience_years: int | None = None
     bio: str | None = None
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DoctorSort(str, enum.Enum):
+    ID = "id"
+    NAME = "name"                        # case-insensitive, A-Z
+    EXPERIENCE = "experience"            # least experienced first
+    EXPERIENCE_DESC = "-experience"      # most experienced first
+
+
+class DoctorFilters(BaseModel):
+    """Filters and order of the doctor list; hashable, so it can key the directory cache."""
+    specialization: DoctorSpecialization | None = None
+    min_experience: int | None = None
+    max_experience: int | None = None
+    name: str | None = None              # case-insensitive prefix of full_name
+    sort: DoctorSort = DoctorSort.ID
+
+    model_config = ConfigDict(frozen=True)
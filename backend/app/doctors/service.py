@@ -3,9 +3,28 @@ from fastapi import HTTPException, status
 from app.users.models import User, UserRole
 from app.users.service import get_user_by_email
 from app.doctors.models import Doctor
-from app.doctors.schemas import DoctorCreate, DoctorUpdate
-from app.core.security import get_password_hash
-from sqlalchemy import select
+from app.doctors.schemas import DoctorCreate, DoctorFilters, DoctorRead, DoctorSort, DoctorUpdate
+from pydantic import TypeAdapter
+from app.appointments.schedule import schedule_index
+from app.appointments.service import calendar_cache
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.etag import make_etag
+from app.core.hashing import password_hasher
+from app.core.search_keys import starts_with
+from app.core.totals import row_counts
+from app.users.principal import invalidate_user
+from sqlalchemy import Select, select
+from sqlalchemy.orm import lazyload
+
+# Serialized GET /doctors/ bodies with their ETags, per (filters, skip, limit); cleared on every doctor write.
+directory_cache = TTLCache(
+    max_size=settings.DOCTOR_DIRECTORY_CACHE_MAX_SIZE,
+    ttl_seconds=settings.DOCTOR_DIRECTORY_CACHE_TTL_SECONDS,
+)
+metrics.register("doctor_directory", directory_cache.stats)
+_directory_adapter = TypeAdapter(list[DoctorRead])
 
 
 async def create_doctor(db: AsyncSession, doctor_in: DoctorCreate) -> Doctor:
@@ -18,10 +37,11 @@ async def create_doctor(db: AsyncSession, doctor_in: DoctorCreate) -> Doctor:
             detail="Email already registered"
         )
     
+    password_hash = await password_hasher.hash(doctor_in.password)
     try:
         db_user = User(
             email=str(doctor_in.email),
-            password_hash=get_password_hash(doctor_in.password),
+            password_hash=password_hash,
             role=UserRole.DOCTOR
         )
         db.add(db_user)
@@ -37,6 +57,7 @@ async def create_doctor(db: AsyncSession, doctor_in: DoctorCreate) -> Doctor:
         )
         db.add(db_doctor)
         await db.commit()
+        directory_cache.clear()
         await db.refresh(db_doctor)
         return db_doctor
     except Exception as e:
@@ -47,12 +68,68 @@ async def create_doctor(db: AsyncSession, doctor_in: DoctorCreate) -> Doctor:
         )
 
 
-async def get_doctors(db: AsyncSession, skip: int = 0, limit: int = 5) -> list[Doctor]:
-    query = select(Doctor).offset(skip).limit(limit)
+_SORT_ORDER = {
+    DoctorSort.ID: (Doctor.id,),
+    DoctorSort.NAME: (Doctor.full_name_key, Doctor.id),
+    DoctorSort.EXPERIENCE: (Doctor.experience_years, Doctor.id),
+    DoctorSort.EXPERIENCE_DESC: (Doctor.experience_years.desc(), Doctor.id.desc()),
+}
+
+
+def build_doctor_query(filters: DoctorFilters) -> Select:
+    """Doctor list query; every filter and sort combination is served by an index on `doctors`."""
+    if (
+        filters.min_experience is not None and filters.max_experience is not None
+        and filters.min_experience > filters.max_experience
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_experience must not exceed max_experience"
+        )
+
+    # DoctorRead needs no user fields, so skip the joined load of Doctor.user.
+    query = select(Doctor).options(lazyload(Doctor.user))
+    if filters.specialization:
+        query = query.where(Doctor.specialization == filters.specialization)
+    if filters.min_experience is not None:
+        query = query.where(Doctor.experience_years >= filters.min_experience)
+    if filters.max_experience is not None:
+        query = query.where(Doctor.experience_years <= filters.max_experience)
+    if filters.name:
+        query = query.where(*starts_with(Doctor.full_name_key, filters.name))
+    return query.order_by(*_SORT_ORDER[filters.sort])
+
+
+async def get_doctors(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 5,
+    filters: DoctorFilters = DoctorFilters(),
+) -> list[Doctor]:
+    query = build_doctor_query(filters).offset(skip).limit(limit)
     result = await db.execute(query)
     return result.scalars().all()
 
 
+async def get_doctor_directory(
+    db: AsyncSession,
+    skip: int,
+    limit: int,
+    filters: DoctorFilters = DoctorFilters(),
+) -> tuple[str, bytes]:
+    """ETag and serialized JSON body of one page of the public doctor list.
+
+    Served from `directory_cache`; concurrent misses for the same page share one
+    query. Other workers' writes show up after DOCTOR_DIRECTORY_CACHE_TTL_SECONDS.
+    """
+    async def load() -> tuple[str, bytes]:
+        doctors = await get_doctors(db, skip=skip, limit=limit, filters=filters)
+        body = _directory_adapter.dump_json(_directory_adapter.validate_python(doctors, from_attributes=True))
+        return make_etag("doctors", body), body
+
+    return await directory_cache.get_or_load((filters, skip, limit), load)
+
+
 async def get_doctor_by_user_id(db: AsyncSession, user_id: int) -> Doctor | None:
     query = select(Doctor).filter(Doctor.user_id == user_id)
     result = await db.execute(query)
@@ -88,6 +165,8 @@ async def update_doctor(db: AsyncSession, doctor_id: int, doctor_update: DoctorU
         setattr(doctor, field, value)
     
     await db.commit()
+    invalidate_user(doctor.user_id)
+    directory_cache.clear()
     await db.refresh(doctor)
     return doctor
 
@@ -115,6 +194,11 @@ async def delete_doctor(db: AsyncSession, doctor_id: int) -> bool:
     if doctor:
         await db.delete(doctor)
         await db.commit()
+        invalidate_user(doctor.user_id)
+        directory_cache.clear()
+        schedule_index.forget(doctor_id)
+        calendar_cache.clear()
+        row_counts.clear()  # the delete cascaded to appointments of many scopes
         return True
     return False
 
@@ -3,6 +3,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 #routers
 from app.core.initial_data import setup
+from app.core.hashing import password_hasher
+from app.appointments.sweeper import appointment_sweeper
+from app.core.config import settings
+from app.core.router import router as metrics_router
 from app.users.router import router as users_router
 from app.doctors.router import router as doctors_router
 from app.pets.router import router as pet_router
@@ -14,11 +18,16 @@ from app.doctors import models as doctor_models
 from app.pets import models as pet_models
 from app.appointments import models as appointment_models
 from app.clients import models as client_models
+from app.core import leases as lease_models
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await setup()
+    if settings.SWEEPER_ENABLED:
+        appointment_sweeper.start()
     yield
+    await appointment_sweeper.stop()
+    password_hasher.shutdown()
 
 app = FastAPI(title="VetClinic CRM", lifespan=lifespan)
 
@@ -41,4 +50,5 @@ app.include_router(users_router)
 app.include_router(doctors_router)
 app.include_router(clients_router)
 app.include_router(pet_router)
-app.include_router(appointment_router)
\ No newline at end of file
+app.include_router(appointment_router)
+app.include_router(metrics_router)
\ No newline at end of file
@@ -1,7 +1,8 @@
 from enum import Enum
-from sqlalchemy import String, ForeignKey, Date, Enum as SqlEnum, Float
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, ForeignKey, Date, Enum as SqlEnum, Float, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from app.core.models import TimestampMixin
+from app.core.search_keys import search_key, search_key_column
 from typing import TYPE_CHECKING
 from app.core.db import Base
 from datetime import date
@@ -28,11 +29,21 @@ class PetSpecies(str, Enum):
 
 class Pet(Base, TimestampMixin):
     __tablename__ = "pets"
+    # Staff pet search (pets/service.build_pet_search_query) orders by (name_key, id);
+    # each filter has an index whose trailing columns keep that order.
+    __table_args__ = (
+        Index("ix_pets_name_key", "name_key"),
+        Index("ix_pets_species_name_key", "species", "name_key"),
+        Index("ix_pets_breed_key_name_key", "breed_key", "name_key"),
+        Index("ix_pets_owner_id_name_key", "owner_id", "name_key"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(50))
+    name_key: Mapped[str] = search_key_column("name")
     species: Mapped[PetSpecies] = mapped_column(SqlEnum(PetSpecies),default=PetSpecies.DOG)
     breed: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    breed_key: Mapped[str | None] = search_key_column("breed", nullable=True)
     birth_date: Mapped[date | None] = mapped_column(Date, nullable=True)
     weight: Mapped[float | None] = mapped_column(Float, nullable=True)
 
@@ -41,6 +52,11 @@ class Pet(Base, TimestampMixin):
 
     appointments: Mapped[list["Appointment"]] = relationship(back_populates="pet")
 
+    @validates("name", "breed")
+    def _set_search_key(self, key, value):
+        setattr(self, f"{key}_key", search_key(value))
+        return value
+
     @property
     def age(self) -> dict | None:
         """Calculate age from birth_date in years and months."""
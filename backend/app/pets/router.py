@@ -1,7 +1,13 @@
+from typing import Optional
+
 from fastapi import APIRouter, status, HTTPException, Query
+from app.appointments import service as appointment_service
+from app.appointments.schemas import PetHistoryPage
 from app.core.db import SessionDep
-from app.users.dependencies import CurrentUser
+from app.users.dependencies import CurrentStaff, CurrentUser
+from app.core.totals import TotalsMode
 from app.pets import schemas, service as pet_service
+from app.pets.models import PetSpecies
 
 router = APIRouter(prefix="/pets", tags=["Pets"])
 
@@ -23,7 +29,8 @@ async def get_my_pets(
         db: SessionDep,
         current_user: CurrentUser,
         page: int = Query(1, ge=1),
-        limit: int = Query(5, ge=1, le=100) # По умолчанию 5
+        limit: int = Query(5, ge=1, le=100), # По умолчанию 5
+        totals: TotalsMode = Query(TotalsMode.EXACT, description="exact, cached (kept current on writes) or none")
 ):
     if not current_user.client_profile:
         return {"items": [], "total": 0}
@@ -34,11 +41,42 @@ async def get_my_pets(
         db=db,
         owner_id=current_user.client_profile.id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        totals=totals
     )
 
     return {"items": items, "total": total}
 
+@router.get("/search", response_model=schemas.PetSearchPage)
+async def search_pets(
+        db: SessionDep,
+        staff: CurrentStaff,
+        name: Optional[str] = Query(None, min_length=1, max_length=50, description="Case-insensitive name prefix"),
+        species: Optional[PetSpecies] = None,
+        breed: Optional[str] = Query(None, min_length=1, max_length=50, description="Case-insensitive breed"),
+        owner: Optional[str] = Query(None, min_length=1, max_length=100, description="Case-insensitive owner name prefix"),
+        limit: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page"),
+):
+    """Clinic-wide pet search with owners, ordered by name. Doctors and admins only."""
+    filters = schemas.PetSearchFilters(name=name, species=species, breed=breed, owner=owner)
+    items, next_cursor = await pet_service.search_pets(db, filters, limit, cursor)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/{pet_id}/history", response_model=PetHistoryPage)
+async def get_pet_history(
+        pet_id: int,
+        db: SessionDep,
+        current_user: CurrentUser,
+        limit: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page"),
+):
+    """A pet's visits, newest first: reason, notes, status and doctor. Staff, or the pet's owner."""
+    items, next_cursor = await appointment_service.get_pet_history(db, pet_id, current_user, limit, cursor)
+    return {"items": items, "next_cursor": next_cursor}
+
+
 @router.delete("/{pet_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_pet(
         pet_id: int,
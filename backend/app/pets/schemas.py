@@ -1,7 +1,8 @@
-from typing import List
+from typing import List, Optional
 from datetime import date
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, computed_field
+from app.clients.schemas import ClientRead
 from app.pets.models import PetSpecies
 
 
@@ -139,4 +140,23 @@ class PetRead(BaseModel):
 
 class PaginatedPets(BaseModel):
     items: List[PetRead]
-    total: int
\ No newline at end of file
+    total: int | None
+
+
+class PetSearchFilters(BaseModel):
+    """Filters of the staff pet search; results are always ordered by name, then id."""
+    name: str | None = None              # case-insensitive prefix of the pet's name
+    species: PetSpecies | None = None
+    breed: str | None = None             # case-insensitive, whole breed
+    owner: str | None = None             # case-insensitive prefix of the owner's full name
+
+    model_config = ConfigDict(frozen=True)
+
+
+class PetWithOwner(PetRead):
+    owner: ClientRead
+
+
+class PetSearchPage(BaseModel):
+    items: List[PetWithOwner]
+    next_cursor: Optional[str] = None
@@ -1,15 +1,20 @@
-from sqlalchemy import select, func
+from sqlalchemy import Select, select, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
 from fastapi import HTTPException, status
+from app.clients.models import Client
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.search_keys import search_key, starts_with
+from app.core.totals import TotalsMode, count_total, row_counts
 from app.pets.models import Pet
-from app.pets.schemas import PetCreate, PetUpdate
-from app.users.models import User
+from app.pets.schemas import PetCreate, PetSearchFilters, PetUpdate
+from app.users.principal import Principal
 
 
 async def create_pet_for_client(
     db: AsyncSession, 
     pet: PetCreate, 
-    current_user: User
+    current_user: Principal
 ) -> Pet:
     """Create a pet for the current client user."""
     if not current_user.client_profile:
@@ -21,6 +26,7 @@ async def create_pet_for_client(
     db_pet = Pet(**pet.model_dump(exclude_unset=True), owner_id=current_user.client_profile.id)
     db.add(db_pet)
     await db.commit()
+    row_counts.adjust(owner_pets_key(db_pet.owner_id), +1)
     await db.refresh(db_pet)
     return db_pet
 
@@ -30,21 +36,27 @@ async def create_pet(db: AsyncSession, pet: PetCreate, owner_id: int) -> Pet:
     db_pet = Pet(**pet.model_dump(exclude_unset=True), owner_id=owner_id)
     db.add(db_pet)
     await db.commit()
+    row_counts.adjust(owner_pets_key(owner_id), +1)
     await db.refresh(db_pet)
     return db_pet
 
 
+def owner_pets_key(owner_id: int) -> tuple:
+    return ("pets", "owner", owner_id)
+
+
 async def get_pets_by_owner(
         db: AsyncSession,
         owner_id: int,
         skip: int = 0,
-        limit: int = 100
-) -> tuple[list[Pet], int]:
+        limit: int = 100,
+        totals: TotalsMode = TotalsMode.EXACT
+) -> tuple[list[Pet], int | None]:
 
     query = select(Pet).where(Pet.owner_id == owner_id)
 
     count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query) or 0
+    total = await count_total(db, totals, count_query, owner_pets_key(owner_id))
 
     query = query.offset(skip).limit(limit)
     result = await db.execute(query)
@@ -52,6 +64,50 @@ async def get_pets_by_owner(
     return result.scalars().all(), total
 
 
+def build_pet_search_query(filters: PetSearchFilters, after: tuple[str, int] | None = None) -> Select:
+    """(Pet, sort key) rows matching `filters` in (name_key, id) order, owners joined in the same query.
+
+    `after` is the sort key and id of the last row already served. Every filter has a
+    composite index on `pets` (or `clients` for the owner name) ending in name_key.
+    """
+    sort_key = Pet.name_key
+    query = (
+        select(Pet, sort_key.label("sort_key"))
+        .join(Pet.owner)
+        .options(contains_eager(Pet.owner))
+    )
+    if filters.name:
+        query = query.where(*starts_with(Pet.name_key, filters.name))
+    if filters.species:
+        query = query.where(Pet.species == filters.species)
+    if filters.breed:
+        query = query.where(Pet.breed_key == search_key(filters.breed))
+    if filters.owner:
+        query = query.where(*starts_with(Client.full_name_key, filters.owner))
+    if after is not None:
+        query = query.where(tuple_(sort_key, Pet.id) > after)
+    return query.order_by(sort_key, Pet.id)
+
+
+async def search_pets(
+    db: AsyncSession,
+    filters: PetSearchFilters,
+    limit: int = 20,
+    cursor: str | None = None,
+) -> tuple[list[Pet], str | None]:
+    """One page of the clinic-wide pet search and the cursor of the next one (None on the last page)."""
+    after = decode_cursor(cursor, str, int) if cursor else None
+    query = build_pet_search_query(filters, after).limit(limit + 1)
+    rows = (await db.execute(query)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_pet, last_key = rows[-1]
+        next_cursor = encode_cursor(last_key, last_pet.id)
+    return [pet for pet, _ in rows], next_cursor
+
+
 async def get_pet(db: AsyncSession, pet_id: int) -> Pet | None:
     return await db.get(Pet, pet_id)
 
@@ -59,7 +115,7 @@ async def get_pet(db: AsyncSession, pet_id: int) -> Pet | None:
 async def delete_pet_by_id(
     db: AsyncSession, 
     pet_id: int, 
-    current_user: User
+    current_user: Principal
 ) -> None:
     """Delete a pet by ID with authorization check."""
     if not current_user.client_profile:
@@ -81,21 +137,21 @@ async def delete_pet_by_id(
             detail="Not authorized to delete this pet"
         )
     
-    await db.delete(pet)
-    await db.commit()
+    await delete_pet(db, pet)
 
 
 async def delete_pet(db: AsyncSession, pet: Pet) -> None:
     """Delete a pet (internal use)."""
     await db.delete(pet)
     await db.commit()
+    row_counts.adjust(owner_pets_key(pet.owner_id), -1)
 
 
 async def update_pet_by_id(
     db: AsyncSession,
     pet_id: int,
     pet_update: PetUpdate,
-    current_user: User
+    current_user: Principal
 ) -> Pet:
     """Update a pet by ID with authorization check."""
     if not current_user.client_profile:
@@ -3,16 +3,17 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 import jwt
 
-from app.core.config import settings
+from app.core import security
 from app.core.db import SessionDep
 from app.users import service, models, User, UserRole
+from app.users.principal import Principal, ProfileRef, principal_cache, token_versions
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login")
 
 async def get_current_user(
         token: Annotated[str, Depends(oauth2_scheme)],
         db: SessionDep
-) -> models.User:
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -20,22 +21,40 @@ async def get_current_user(
     )
 
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = security.decode_access_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
     except jwt.PyJWTError:
         raise credentials_exception
 
+    if "uid" in payload:
+        # Stateless token: identity comes from the signed claims, only the version is checked.
+        try:
+            principal = Principal.from_claims(payload)
+            version = int(payload["ver"])
+        except (KeyError, ValueError, TypeError):
+            raise credentials_exception
+        if not await token_versions.is_current(db, principal.id, version):
+            raise credentials_exception
+        return principal
+
+    role = payload.get("role")
+    principal = principal_cache.get(email, role)
+    if principal is not None:
+        return principal
+
     user = await service.get_user_by_email(db, email=email)
     if user is None:
         raise credentials_exception
 
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.set(email, role, principal)
+    return principal
 
 async def get_current_admin(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -44,28 +63,32 @@ async def get_current_admin(
     return current_user
 
 
-from sqlalchemy import select
-from app.doctors.models import Doctor
-
 async def get_current_doctor(
-    db: SessionDep,
-    current_user: User = Depends(get_current_user)
-) -> Doctor:
+    current_user: Principal = Depends(get_current_user)
+) -> ProfileRef:
     if current_user.role != UserRole.DOCTOR:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not a doctor"
         )
-    
-    result = await db.execute(select(Doctor).filter(Doctor.user_id == current_user.id))
-    doctor = result.scalars().first()
-    
-    if not doctor:
+
+    if not current_user.doctor_profile:
          raise HTTPException(
             status_code=404,
             detail="Doctor profile not found"
         )
-    return doctor
+    return current_user.doctor_profile
+
+async def get_current_staff(
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
+    if current_user.role not in (UserRole.ADMIN, UserRole.DOCTOR):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return current_user
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
-CurrentDoctor = Annotated[Doctor, Depends(get_current_doctor)]
\ No newline at end of file
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
+CurrentStaff = Annotated[Principal, Depends(get_current_staff)]
+CurrentDoctor = Annotated[ProfileRef, Depends(get_current_doctor)]
\ No newline at end of file
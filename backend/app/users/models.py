@@ -22,6 +22,7 @@ class User(Base, TimestampMixin):
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True)
     password_hash: Mapped[str] = mapped_column(String)
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), default=UserRole.CLIENT)
+    token_version: Mapped[int] = mapped_column(default=1, server_default="1")
 
     doctor_profile: Mapped["Doctor | None"] = relationship(back_populates="user", uselist=False)
     client_profile: Mapped["Client | None"] = relationship(back_populates="user", uselist=False)
\ No newline at end of file
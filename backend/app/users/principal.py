@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.users.models import User, UserRole
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileRef:
+    id: int
+    full_name: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Immutable snapshot of the authenticated user.
+
+    Attribute names mirror `User` so handlers and `UserResponse` can use it
+    in place of the ORM object without holding a session.
+    """
+    id: int
+    email: str
+    role: UserRole
+    client_profile: ProfileRef | None = None
+    doctor_profile: ProfileRef | None = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        client = user.client_profile
+        doctor = user.doctor_profile
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            client_profile=ProfileRef(client.id, client.full_name) if client else None,
+            doctor_profile=ProfileRef(doctor.id, doctor.full_name) if doctor else None,
+        )
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "Principal":
+        """Build a principal from the signed claims of a stateless token. Raises KeyError/ValueError if malformed."""
+        client_id = payload.get("cid")
+        doctor_id = payload.get("did")
+        return cls(
+            id=int(payload["uid"]),
+            email=payload["sub"],
+            role=UserRole(payload["role"]),
+            client_profile=ProfileRef(int(client_id)) if client_id is not None else None,
+            doctor_profile=ProfileRef(int(doctor_id)) if doctor_id is not None else None,
+        )
+
+
+def principal_claims(user: User) -> dict:
+    """Claims for a stateless access token; `ver` must match users.token_version when presented."""
+    claims = {"sub": user.email, "uid": user.id, "role": user.role.value, "ver": user.token_version}
+    if user.client_profile:
+        claims["cid"] = user.client_profile.id
+    if user.doctor_profile:
+        claims["did"] = user.doctor_profile.id
+    return claims
+
+
+class PrincipalCache:
+    """Principals keyed by (token subject, role), with a reverse index by user id for invalidation."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._cache = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self._keys_by_user: dict[int, set[tuple]] = {}
+
+    def get(self, subject: str, role: str | None) -> Principal | None:
+        return self._cache.get((subject, role))
+
+    def set(self, subject: str, role: str | None, principal: Principal) -> None:
+        key = (subject, role)
+        self._cache.set(key, principal)
+        self._keys_by_user.setdefault(principal.id, set()).add(key)
+        if len(self._keys_by_user) > 2 * self._cache.max_size:
+            self._prune_index()
+
+    def invalidate_user(self, user_id: int) -> None:
+        for key in self._keys_by_user.pop(user_id, ()):
+            self._cache.pop(key)
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._keys_by_user.clear()
+
+    def _prune_index(self) -> None:
+        live = {user_id: {key for key in keys if key in self._cache}
+                for user_id, keys in self._keys_by_user.items()}
+        self._keys_by_user = {user_id: keys for user_id, keys in live.items() if keys}
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+class TokenVersionCache:
+    """Current users.token_version per user id, so stateless tokens are checked without a query per request."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._cache = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    async def is_current(self, db: AsyncSession, user_id: int, version: int) -> bool:
+        current = self._cache.get(user_id)
+        if current is None:
+            current = await db.scalar(select(User.token_version).where(User.id == user_id))
+            if current is None:
+                return False
+            self._cache.set(user_id, current)
+        return current == version
+
+    def invalidate_user(self, user_id: int) -> None:
+        self._cache.pop(user_id)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+token_versions = TokenVersionCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TOKEN_VERSION_CACHE_TTL_SECONDS,
+)
+metrics.register("principal_cache", principal_cache.stats)
+metrics.register("token_version_cache", token_versions.stats)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop everything cached about a user after a write to them or their profile."""
+    principal_cache.invalidate_user(user_id)
+    token_versions.invalidate_user(user_id)
@@ -6,9 +6,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.core import security
+from app.core.hashing import password_hasher
 from app.core.config import settings
 from app.core.db import SessionDep
-from app.users import schemas, service, User
+from app.users import schemas, service
+from app.users.principal import Principal, invalidate_user, principal_claims
 from app.users.dependencies import get_current_user
 
 router = APIRouter(prefix="/users", tags=["Users"])
@@ -19,8 +21,10 @@ async def login(
         db: SessionDep
 ):
     user = await service.get_user_by_email(db, email=form_data.username)
+    # Hand the pooled connection back before bcrypt runs; the user row is already loaded.
+    await db.close()
 
-    if not user or not security.verify_password(form_data.password, user.password_hash):
+    if not user or not await password_hasher.verify(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -28,8 +32,9 @@ async def login(
         )
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    claims = principal_claims(user) if settings.STATELESS_TOKENS else {"sub": user.email}
     access_token = security.create_access_token(
-        data={"sub": user.email},
+        data=claims,
         expires_delta=access_token_expires
     )
 
@@ -37,5 +42,15 @@ async def login(
 
 
 @router.get("/me", response_model=schemas.UserResponse)
-async def read_users_me(current_user: User = Depends(get_current_user)):
-    return current_user
\ No newline at end of file
+async def read_users_me(current_user: Principal = Depends(get_current_user)):
+    return current_user
+
+
+@router.post("/me/revoke-tokens", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_my_tokens(
+        db: SessionDep,
+        current_user: Principal = Depends(get_current_user)
+):
+    """Sign out everywhere: stateless tokens issued before this call stop being accepted."""
+    await service.revoke_tokens(db, current_user.id)
+    invalidate_user(current_user.id)
\ No newline at end of file
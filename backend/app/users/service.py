@@ -1,4 +1,4 @@
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -12,4 +12,12 @@ async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
     ).filter(User.email == email)
 
     result = await db.execute(query)
-    return result.scalars().first()
\ No newline at end of file
+    return result.scalars().first()
+
+
+async def revoke_tokens(db: AsyncSession, user_id: int) -> None:
+    """Invalidate every stateless token issued to the user by bumping their token version."""
+    await db.execute(
+        update(User).where(User.id == user_id).values(token_version=User.token_version + 1)
+    )
+    await db.commit()
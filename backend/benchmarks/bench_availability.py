@@ -0,0 +1,84 @@
+"""check_availability latency as one doctor's history grows.
+
+Grows a single doctor's appointment history to 100k rows and times the
+conflict check at each size, printing the SQLite query plan once.
+
+    python benchmarks/bench_availability.py --sizes 1000 10000 100000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.getcwd())
+
+
+async def run(sizes: list[int], probes: int):
+    from sqlalchemy import insert, text
+    from sqlalchemy.dialects import sqlite
+
+    from app.core.db import Base, async_session_factory, engine
+    from app.main import app  # noqa: F401  registers every mapper
+    from app.appointments import service
+    from app.appointments.models import Appointment, AppointmentStatus
+    from app.clients.models import Client
+    from app.doctors.models import Doctor
+    from app.pets.models import Pet
+    from app.users.models import User, UserRole
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [
+            {"id": 1, "email": "d@bench", "password_hash": "x", "role": UserRole.DOCTOR},
+            {"id": 2, "email": "c@bench", "password_hash": "x", "role": UserRole.CLIENT},
+        ])
+        await conn.execute(insert(Doctor), [{"id": 1, "user_id": 1, "full_name": "Doc"}])
+        await conn.execute(insert(Client), [{"id": 1, "user_id": 2, "full_name": "Client"}])
+        await conn.execute(insert(Pet), [{"id": 1, "owner_id": 1, "name": "Pet"}])
+
+    day_zero = datetime(2020, 1, 1, 9, 0)
+    written = 0
+    for size in sizes:
+        rows = []
+        for n in range(written, size):
+            day, slot = divmod(n, 11)
+            rows.append({
+                "date_time": day_zero + timedelta(days=day, minutes=45 * slot), "doctor_id": 1, "client_id": 1,
+                "pet_id": 1, "reason": "bench",
+                "status": AppointmentStatus.CANCELLED if n % 10 == 0 else AppointmentStatus.COMPLETED,
+            })
+        async with engine.begin() as conn:
+            await conn.execute(insert(Appointment), rows)
+            await conn.execute(text("ANALYZE"))
+        written = size
+
+        async with async_session_factory() as db:
+            last_day = day_zero + timedelta(days=(size - 1) // 11)
+            targets = [last_day + timedelta(minutes=20 * (i % 30)) for i in range(probes)]
+            started = time.perf_counter()
+            for when in targets:
+                await service.check_availability(db, 1, when)
+            elapsed = time.perf_counter() - started
+        print(f"{size:>8,} rows  {elapsed / probes * 1e6:8.1f} us/check")
+
+    stmt = service.select(Appointment.id).where(
+        Appointment.doctor_id == 1, service.ACTIVE_APPOINTMENT,
+        Appointment.date_time > day_zero, Appointment.date_time < day_zero + timedelta(minutes=45),
+    ).limit(1)
+    sql = str(stmt.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+    async with engine.connect() as conn:
+        plan = (await conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))).all()
+    print("plan:", "; ".join(row[-1] for row in plan))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--probes", type=int, default=2_000)
+    args = parser.parse_args()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    asyncio.run(run(args.sizes, args.probes))
@@ -0,0 +1,54 @@
+"""Front-desk client search latency on a large client table.
+
+Seeds a temporary database with n clients (the seed also builds the FTS5
+index), then times clients.service.search_clients for names, partial phone
+numbers and emails, from selective to very common terms.
+
+    python benchmarks/bench_client_search.py --clients 100000 --rounds 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+QUERIES = ["alice", "mia lee", "smith", "client4242@", "6660042", "+1 (666) 004-2424", "client12", "seed.vet"]
+
+
+async def run(clients: int, rounds: int):
+    from app.clients import service
+    from app.core.db import Base, async_session_factory, engine
+    from app.core.seed import seed
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(doctors=10, clients=clients, pets_per_client=0, appointments=0,
+               days_back=1, days_ahead=1, rng_seed=1, batch_size=20_000, bcrypt_rounds=4)
+
+    print(f"\n{clients:,} clients")
+    async with async_session_factory() as db:
+        for query in QUERIES:
+            _, found, _ = await service.search_clients(db, query)
+            timings = []
+            for _ in range(rounds):
+                started = time.perf_counter()
+                await service.search_clients(db, query)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            print(f"  {query!r:>22}: {found:3} hits  p50 {statistics.median(timings):6.2f} ms  "
+                  f"p95 {timings[int(len(timings) * 0.95) - 1]:6.2f} ms")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ["SWEEPER_ENABLED"] = "false"
+    asyncio.run(run(args.clients, args.rounds))
@@ -0,0 +1,65 @@
+"""Public doctor list: uncached query + serialization vs a directory-cache hit.
+
+Seeds a temporary database with n doctors, then times get_doctor_directory
+with the cache cleared before every call (miss) and with it warm (hit), plus
+the whole GET /doctors/ request through the ASGI app on a warm cache.
+
+    python benchmarks/bench_doctor_directory.py --doctors 300 --rounds 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+
+async def run(doctors: int, rounds: int):
+    from httpx import ASGITransport, AsyncClient
+
+    from app.core.db import Base, async_session_factory, engine
+    from app.core.seed import seed
+    from app.doctors import service
+    from app.main import app
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(doctors=doctors, clients=10, pets_per_client=1, appointments=0,
+               days_back=1, days_ahead=1, rng_seed=1, batch_size=20_000, bcrypt_rounds=4)
+
+    async with async_session_factory() as db:
+        _, body = await service.get_doctor_directory(db, 0, doctors)
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            service.directory_cache.clear()
+            await service.get_doctor_directory(db, 0, doctors)
+        miss_us = (time.perf_counter() - started) / rounds * 1e6
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            await service.get_doctor_directory(db, 0, doctors)
+        hit_us = (time.perf_counter() - started) / rounds * 1e6
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        await client.get(f"/doctors/?limit={doctors}")
+        started = time.perf_counter()
+        for _ in range(rounds):
+            await client.get(f"/doctors/?limit={doctors}")
+        request_us = (time.perf_counter() - started) / rounds * 1e6
+
+    print(f"{doctors:,} doctors ({len(body) / 1024:.1f} KiB): miss {miss_us:8.1f} us  hit {hit_us:6.1f} us  "
+          f"GET /doctors/ (hit) {request_us:8.1f} us")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--doctors", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ["SWEEPER_ENABLED"] = "false"
+    asyncio.run(run(args.doctors, args.rounds))
@@ -0,0 +1,67 @@
+"""Request cost of conditional GETs: full 200 responses vs 304 Not Modified.
+
+Seeds a temporary database, then requests the doctor list, one doctor's slots
+and an admin appointment page through the ASGI app, first without and then
+with the ETag from the previous response in If-None-Match.
+
+    python benchmarks/bench_etag.py --rows 500 --rounds 200
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+
+async def run(rows: int, rounds: int):
+    from httpx import ASGITransport, AsyncClient
+
+    from app.core.db import Base, engine
+    from app.core.seed import seed
+    from app.main import app
+    from app.users.dependencies import get_current_user
+    from app.users.models import UserRole
+    from app.users.principal import Principal
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(doctors=300, clients=2_000, pets_per_client=2, appointments=100_000,
+               days_back=365, days_ahead=30, rng_seed=1, batch_size=20_000, bcrypt_rounds=4)
+    app.dependency_overrides[get_current_user] = lambda: Principal(id=0, email="bench@vet", role=UserRole.ADMIN)
+
+    day = (datetime.date.today() + datetime.timedelta(days=7)).isoformat()
+    urls = {
+        "doctors": "/doctors/?limit=300",
+        "slots": f"/appointments/slots?doctor_id=1&date={day}",
+        "appointments": f"/appointments/?limit={rows}&totals=exact",
+        "appointments compact": f"/appointments/?limit={rows}&view=compact&totals=cached",
+    }
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for name, url in urls.items():
+            first = await client.get(url)
+            etag = first.headers["etag"]
+
+            timings = {}
+            for label, headers in (("200", {}), ("304", {"If-None-Match": etag})):
+                started = time.perf_counter()
+                for _ in range(rounds):
+                    response = await client.get(url, headers=headers)
+                assert response.status_code == int(label)
+                timings[label] = (time.perf_counter() - started) / rounds * 1000
+            print(f"{name:>22}: 200 {timings['200']:7.2f} ms ({len(first.content) / 1024:6.1f} KiB)  "
+                  f"304 {timings['304']:6.2f} ms  x{timings['200'] / timings['304']:5.1f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500, help="appointments per page")
+    parser.add_argument("--rounds", type=int, default=100)
+    args = parser.parse_args()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ["SWEEPER_ENABLED"] = "false"
+    asyncio.run(run(args.rows, args.rounds))
@@ -0,0 +1,57 @@
+"""Memory of idle schedule-event subscribers and the cost of one publish.
+
+Subscribes n readers, each waiting in `next_batch` like an open SSE stream,
+spread over a few hundred doctors, then publishes events for random doctors
+and reports memory per subscriber and publish time.
+
+    python benchmarks/bench_events.py --subscribers 1000 10000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.getcwd())
+
+from app.appointments.events import ScheduleEvents, client_topic, doctor_topic
+
+
+async def run(sizes: list[int], doctors: int, events: int):
+    rng = random.Random(5)
+    for size in sizes:
+        bus = ScheduleEvents(max_subscribers=size, max_pending=64)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        subscriptions = [
+            bus.subscribe((doctor_topic(rng.randrange(doctors)), client_topic(i))) for i in range(size)
+        ]
+        readers = [asyncio.create_task(s.next_batch(timeout=3600)) for s in subscriptions]
+        await asyncio.sleep(0)
+        per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / size
+        tracemalloc.stop()
+
+        payload = {"id": 1, "doctor_id": 0, "date_time": "2030-01-07T09:00:00+00:00", "duration_minutes": 45}
+        started = time.perf_counter()
+        for _ in range(events):
+            doctor_id = rng.randrange(doctors)
+            bus.publish("booked", (doctor_topic(doctor_id), client_topic(rng.randrange(size))), payload)
+        publish_us = (time.perf_counter() - started) / events * 1e6
+
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+        stats = bus.stats()
+        print(f"{size:>8,} idle subscribers  {per_subscriber:7.0f} B each  publish {publish_us:6.2f} us  "
+              f"delivered {stats['delivered']:,}  dropped {stats['dropped']:,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--doctors", type=int, default=300)
+    parser.add_argument("--events", type=int, default=2_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.subscribers, args.doctors, args.events))
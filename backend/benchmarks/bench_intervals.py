@@ -0,0 +1,55 @@
+"""BusyIntervals insert and overlap lookups against a linear scan.
+
+Inserts n random bookings of 15-240 minutes into one busy calendar, then
+times overlap queries, both with the sorted-interval structure and with the
+scan over every booking that a naive conflict check would do.
+
+    python benchmarks/bench_intervals.py --sizes 100 1000 10000 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from app.appointments.intervals import BusyIntervals
+
+
+def run(sizes: list[int], queries: int):
+    rng = random.Random(3)
+    for size in sizes:
+        horizon = size * 60  # minutes; keeps the calendar about half busy
+        bookings = []
+        for _ in range(size):
+            start = rng.randrange(horizon)
+            bookings.append((start, start + rng.choice((15, 30, 45, 60, 90, 120, 240))))
+        probes = [(start, start + 45) for start in (rng.randrange(horizon) for _ in range(queries))]
+
+        busy = BusyIntervals()
+        started = time.perf_counter()
+        for start, end in bookings:
+            busy.add(start, end)
+        insert_us = (time.perf_counter() - started) / size * 1e6
+
+        started = time.perf_counter()
+        fast = [busy.overlaps(start, end) for start, end in probes]
+        lookup_us = (time.perf_counter() - started) / queries * 1e6
+
+        scan_probes = probes[:max(1, queries * 1000 // size)]
+        started = time.perf_counter()
+        slow = [any(s < end and start < e for s, e in bookings) for start, end in scan_probes]
+        scan_us = (time.perf_counter() - started) / len(scan_probes) * 1e6
+
+        assert fast[:len(slow)] == slow
+        print(f"{size:>8,} bookings  insert {insert_us:6.2f} us  overlaps {lookup_us:6.2f} us  "
+              f"scan {scan_us:10.2f} us  ({len(busy):,} merged blocks)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=20_000)
+    args = parser.parse_args()
+    run(args.sizes, args.queries)
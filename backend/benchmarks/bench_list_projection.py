@@ -0,0 +1,71 @@
+"""Full vs compact GET /appointments pages: CPU time and peak memory per 1,000 rows.
+
+Seeds a temporary database, then fetches the same admin page through the
+service and serializes it with the endpoint's response model, once per view.
+
+    python benchmarks/bench_list_projection.py --rows 1000 --rounds 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.getcwd())
+
+
+async def run(rows: int, rounds: int):
+    from pydantic import TypeAdapter
+
+    from app.core.db import Base, async_session_factory, engine
+    from app.core.seed import seed
+    from app.core.totals import TotalsMode
+    from app.appointments import service
+    from app.appointments.router import AppointmentPage
+    from app.appointments.schemas import AppointmentView
+    from app.users.models import UserRole
+    from app.users.principal import Principal
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(doctors=50, clients=max(rows // 4, 10), pets_per_client=2, appointments=rows * 2,
+               days_back=365, days_ahead=30, rng_seed=1, batch_size=20_000, bcrypt_rounds=4)
+
+    admin = Principal(id=0, email="bench@vet", role=UserRole.ADMIN)
+    adapter = TypeAdapter(AppointmentPage)
+
+    async def page(view: AppointmentView) -> bytes:
+        async with async_session_factory() as db:
+            items, total, next_cursor = await service.get_appointments_for_user(
+                db, admin, 1, rows, None, None, totals=TotalsMode.NONE, view=view,
+            )
+        body = {"view": view.value, "items": items, "total": total, "next_cursor": next_cursor}
+        return adapter.dump_json(adapter.validate_python(body, from_attributes=True))
+
+    print(f"\n{rows:,} rows per page")
+    for view in AppointmentView:
+        size = len(await page(view))  # warm-up
+        started = time.perf_counter()
+        for _ in range(rounds):
+            await page(view)
+        per_page = (time.perf_counter() - started) / rounds
+
+        tracemalloc.start()
+        await page(view)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        scale = 1000 / rows
+        print(f"  {view.value:>7}: {per_page * 1000 * scale:7.1f} ms  {peak * scale / 1024:8.0f} KiB peak  "
+              f"{size * scale / 1024:6.0f} KiB body  (per 1,000 rows)")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    asyncio.run(run(args.rows, args.rounds))
@@ -0,0 +1,73 @@
+"""Login throughput vs. latency of an unrelated endpoint.
+
+Runs concurrent logins against the app in-process while a probe keeps hitting
+GET /doctors/, then prints logins/s and the probe's p50/p99 latency.
+
+    python benchmarks/bench_login.py --executor inline   # bcrypt on the event loop
+    python benchmarks/bench_login.py --executor thread --workers 4
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--executor", default="thread", choices=["inline", "thread", "process"])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--logins", type=int, default=16, help="concurrent login loops")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    return parser.parse_args()
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def run(args):
+    from httpx import ASGITransport, AsyncClient
+    from app.main import app, lifespan
+
+    logins = 0
+    probe_ms: list[float] = []
+
+    async with lifespan(app):
+        deadline = time.perf_counter() + args.seconds
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            async def login_loop():
+                nonlocal logins
+                while time.perf_counter() < deadline:
+                    resp = await client.post("/users/login", data={"username": "alice@example.com", "password": "client123"})
+                    if resp.status_code == 200:
+                        logins += 1
+
+            async def probe_loop():
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    await client.get("/doctors/")
+                    probe_ms.append((time.perf_counter() - started) * 1000)
+                    await asyncio.sleep(0.01)
+
+            await asyncio.gather(probe_loop(), *(login_loop() for _ in range(args.logins)))
+
+    print(f"executor={args.executor} workers={args.workers} concurrent_logins={args.logins}")
+    print(f"logins/s        {logins / args.seconds:8.1f}")
+    print(f"probe p50 (ms)  {statistics.median(probe_ms):8.1f}")
+    print(f"probe p99 (ms)  {percentile(probe_ms, 0.99):8.1f}")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["PASSWORD_HASH_EXECUTOR"] = args.executor
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    os.environ["PASSWORD_HASH_MAX_CONCURRENCY"] = str(args.workers)
+    asyncio.run(run(args))
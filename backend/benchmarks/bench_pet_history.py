@@ -0,0 +1,83 @@
+"""GET /pets/{id}/history page latency as a pet's history grows.
+
+Seeds a temporary database with background appointments, gives one pet per
+size a history of that many visits, then times appointments.service.get_pet_history
+on the newest page and on a page `--depth` visits back. Both should stay flat
+across sizes.
+
+    python benchmarks/bench_pet_history.py --sizes 10 1000 20000 --rounds 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.getcwd())
+
+
+async def time_page(db, pet_id: int, admin, limit: int, cursor, rounds: int) -> tuple[float, float]:
+    from app.appointments.service import get_pet_history
+
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await get_pet_history(db, pet_id, admin, limit, cursor)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+async def run(sizes: list[int], limit: int, depth: int, rounds: int):
+    from sqlalchemy import insert, select
+
+    from app.appointments.models import Appointment, AppointmentStatus
+    from app.appointments.service import get_pet_history
+    from app.core.db import Base, async_session_factory, engine
+    from app.core.seed import seed
+    from app.pets.models import Pet
+    from app.users.models import UserRole
+    from app.users.principal import Principal
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(doctors=50, clients=1_000, pets_per_client=2, appointments=100_000,
+               days_back=365, days_ahead=30, rng_seed=1, batch_size=20_000, bcrypt_rounds=4)
+
+    admin = Principal(id=0, email="bench@vet", role=UserRole.ADMIN)
+    async with async_session_factory() as db:
+        pets = (await db.execute(select(Pet.id, Pet.owner_id).order_by(Pet.id).limit(len(sizes)))).all()
+        start = datetime(2020, 1, 1, 9, 0)
+        for (pet_id, owner_id), size in zip(pets, sizes):
+            await db.execute(insert(Appointment), [
+                {"date_time": start + timedelta(hours=i), "reason": "Follow-up", "doctor_notes": "Stable.",
+                 "status": AppointmentStatus.COMPLETED, "client_id": owner_id, "doctor_id": 1 + i % 20, "pet_id": pet_id}
+                for i in range(size)
+            ])
+        await db.commit()
+
+        print(f"\npages of {limit}, 100,000 other appointments")
+        for (pet_id, _), size in zip(pets, sizes):
+            first_p50, first_p95 = await time_page(db, pet_id, admin, limit, None, rounds)
+            line = f"  {size:>7,} visits: newest page p50 {first_p50:6.2f} ms  p95 {first_p95:6.2f} ms"
+            _, deep_cursor = await get_pet_history(db, pet_id, admin, depth)
+            if deep_cursor:
+                deep_p50, deep_p95 = await time_page(db, pet_id, admin, limit, deep_cursor, rounds)
+                line += f"  | {depth:,} back p50 {deep_p50:6.2f} ms  p95 {deep_p95:6.2f} ms"
+            print(line)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 20_000])
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ["SWEEPER_ENABLED"] = "false"
+    asyncio.run(run(args.sizes, args.limit, args.depth, args.rounds))
@@ -0,0 +1,80 @@
+"""Staff pet search latency on a large pets table, on the first page and deep in the results.
+
+Seeds a temporary database with n clients and their pets, then times
+pets.service.search_pets for each filter combination: once from the start and
+once from a cursor `--depth` rows in, which should cost the same with keyset
+pagination.
+
+    python benchmarks/bench_pet_search.py --clients 50000 --pets-per-client 4 --rounds 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+
+def filter_cases():
+    from app.pets.models import PetSpecies
+    from app.pets.schemas import PetSearchFilters
+
+    return {
+        "all": PetSearchFilters(),
+        "name=sn": PetSearchFilters(name="sn"),
+        "species=RABBIT": PetSearchFilters(species=PetSpecies.RABBIT),
+        "species=RABBIT name=snow": PetSearchFilters(species=PetSpecies.RABBIT, name="snow"),
+        "breed=labrador": PetSearchFilters(breed="labrador"),
+        "owner=mia lee": PetSearchFilters(owner="mia lee"),
+    }
+
+
+async def time_page(db, filters, limit: int, cursor, rounds: int) -> tuple[float, float]:
+    from app.pets.service import search_pets
+
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await search_pets(db, filters, limit, cursor)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+async def run(clients: int, pets_per_client: int, limit: int, depth: int, rounds: int):
+    from app.core.db import Base, async_session_factory, engine
+    from app.core.seed import seed
+    from app.pets.service import search_pets
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(doctors=10, clients=clients, pets_per_client=pets_per_client, appointments=0,
+               days_back=1, days_ahead=1, rng_seed=1, batch_size=20_000, bcrypt_rounds=4)
+
+    print(f"\n{clients:,} clients, ~{clients * pets_per_client:,} pets, pages of {limit}")
+    async with async_session_factory() as db:
+        for label, filters in filter_cases().items():
+            first_p50, first_p95 = await time_page(db, filters, limit, None, rounds)
+            _, deep_cursor = await search_pets(db, filters, depth)
+            line = f"  {label:>26}: first page p50 {first_p50:6.2f} ms  p95 {first_p95:6.2f} ms"
+            if deep_cursor:
+                deep_p50, deep_p95 = await time_page(db, filters, limit, deep_cursor, rounds)
+                line += f"  | after {depth:,} rows p50 {deep_p50:6.2f} ms  p95 {deep_p95:6.2f} ms"
+            print(line)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=50_000)
+    parser.add_argument("--pets-per-client", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=5_000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ["SWEEPER_ENABLED"] = "false"
+    asyncio.run(run(args.clients, args.pets_per_client, args.limit, args.depth, args.rounds))
@@ -0,0 +1,100 @@
+"""Whole-clinic availability from the schedule index.
+
+Books a synthetic month for every doctor (about half of all slots taken),
+then times the cold load and the warm free-slot computation over all
+doctors and days, against a per-slot set lookup as the baseline.
+
+    python benchmarks/bench_schedule_index.py --doctors 300 --days 31
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.getcwd())
+
+
+async def run(doctors: int, days: int, rounds: int):
+    from sqlalchemy import insert
+
+    from app.core.db import Base, async_session_factory, engine
+    from app.main import app  # noqa: F401  registers every mapper
+    from app.appointments.models import Appointment, AppointmentStatus
+    from app.appointments.schedule import SLOTS_PER_DAY, ScheduleIndex, slot_start, unpack_days
+    from app.clients.models import Client
+    from app.doctors.models import Doctor
+    from app.pets.models import Pet
+    from app.users.models import User, UserRole
+
+    rng = random.Random(7)
+    first_day = date(2030, 1, 1)
+    last_day = first_day + timedelta(days=days - 1)
+    booked = set()
+    for doctor_id in range(1, doctors + 1):
+        for offset in range(days):
+            for slot in range(SLOTS_PER_DAY):
+                if rng.random() < 0.5:
+                    booked.add((doctor_id, slot_start(first_day + timedelta(days=offset), slot)))
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [{"id": i, "email": f"u{i}@bench", "password_hash": "x",
+                                           "role": UserRole.DOCTOR} for i in range(1, doctors + 2)])
+        await conn.execute(insert(Doctor), [{"id": i, "user_id": i, "full_name": f"Doc {i}"}
+                                            for i in range(1, doctors + 1)])
+        await conn.execute(insert(Client), [{"id": 1, "user_id": doctors + 1, "full_name": "Client"}])
+        await conn.execute(insert(Pet), [{"id": 1, "owner_id": 1, "name": "Pet"}])
+        await conn.execute(insert(Appointment), [
+            {"date_time": when, "doctor_id": doctor_id, "client_id": 1, "pet_id": 1, "reason": "bench",
+             "status": AppointmentStatus.PLANNED}
+            for doctor_id, when in booked
+        ])
+
+    doctor_ids = list(range(1, doctors + 1))
+    index = ScheduleIndex(ttl_seconds=3600, max_doctors=doctors, max_days=days)
+    async with async_session_factory() as db:
+        started = time.perf_counter()
+        await index.ensure_loaded(db, doctor_ids, first_day, last_day)
+        cold = time.perf_counter() - started
+
+    def with_index() -> int:
+        return sum(bin(index.free_bits(doctor_id, first_day, days)).count("1") for doctor_id in doctor_ids)
+
+    def with_set() -> int:
+        free = 0
+        for doctor_id in doctor_ids:
+            for offset in range(days):
+                day = first_day + timedelta(days=offset)
+                for slot in range(SLOTS_PER_DAY):
+                    if (doctor_id, slot_start(day, slot)) not in booked:
+                        free += 1
+        return free
+
+    assert with_index() == with_set() == doctors * days * SLOTS_PER_DAY - len(booked)
+    print(f"{doctors} doctors x {days} days, {len(booked):,} bookings, cold load {cold * 1000:.1f} ms")
+    for label, fn in (("bitmap", with_index), ("set", with_set)):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        print(f"  {label:>6}: {(time.perf_counter() - started) / rounds * 1000:8.2f} ms per clinic-month")
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for doctor_id in doctor_ids:
+            unpack_days(index.free_bits(doctor_id, first_day, days, not_before=datetime(2030, 1, 10, 12)), days)
+    print(f"  unpack: {(time.perf_counter() - started) / rounds * 1000:8.2f} ms per clinic-month (per-day masks)")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--doctors", type=int, default=300)
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    asyncio.run(run(args.doctors, args.days, args.rounds))
@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import Select, create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.appointments.models import Appointment, AppointmentStatus
+from app.appointments.schedule import schedule_index
+from app.appointments.service import calendar_cache
+from app.clients.models import Client
+from app.clients.search import create_search_table
+from app.core.db import Base
+from app.doctors.models import Doctor, DoctorSpecialization
+from app.pets.models import Pet, PetSpecies
+from app.users.models import User, UserRole
+from app.users.principal import Principal, ProfileRef
+
+
+@pytest.fixture(autouse=True)
+def fresh_schedule_index():
+    """The schedule index is process-wide; every test gets its own database, so start it empty."""
+    schedule_index.clear()
+    calendar_cache.clear()
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    """Sessions on a fresh file-backed SQLite database with the full schema, FTS5 table included."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_search_table)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db(session_factory):
+    async with session_factory() as session:
+        yield session
+
+
+@dataclass
+class Clinic:
+    doctors: list[Doctor]
+    clients: list[Client]
+    pets: list[Pet]  # pets[i] belongs to clients[i]
+
+    def appointment(
+        self,
+        date_time: datetime,
+        doctor: int = 0,
+        client: int = 0,
+        minutes: int = 45,
+        status: AppointmentStatus = AppointmentStatus.PLANNED,
+        **fields,
+    ) -> Appointment:
+        """An unsaved appointment of doctors[doctor] with clients[client] and their pet."""
+        return Appointment(
+            date_time=date_time, duration_minutes=minutes, status=status, reason=fields.pop("reason", "Checkup"),
+            doctor_id=self.doctors[doctor].id, client_id=self.clients[client].id, pet_id=self.pets[client].id,
+            **fields,
+        )
+
+    def as_doctor(self, i: int) -> Principal:
+        doctor = self.doctors[i]
+        return Principal(id=doctor.user_id, email=f"doctor{i}@vet.com", role=UserRole.DOCTOR,
+                         doctor_profile=ProfileRef(id=doctor.id, full_name=doctor.full_name))
+
+    def as_client(self, i: int) -> Principal:
+        client = self.clients[i]
+        return Principal(id=client.user_id, email=f"client{i}@mail.com", role=UserRole.CLIENT,
+                         client_profile=ProfileRef(id=client.id, full_name=client.full_name))
+
+
+@pytest_asyncio.fixture
+async def clinic(db):
+    """Two doctors (therapist, surgeon) and two clients with one pet each."""
+    doctors = [
+        Doctor(user=User(email=f"doctor{i}@vet.com", password_hash="-", role=UserRole.DOCTOR),
+               full_name=name, specialization=specialization)
+        for i, (name, specialization) in enumerate([
+            ("Dr. Adams", DoctorSpecialization.THERAPIST), ("Dr. Baker", DoctorSpecialization.SURGEON),
+        ])
+    ]
+    clients = [
+        Client(user=User(email=f"client{i}@mail.com", password_hash="-", role=UserRole.CLIENT),
+               full_name=name, phone_number="5550000")
+        for i, name in enumerate(["Ann Lee", "Bob Ray"])
+    ]
+    pets = [Pet(name=name, species=PetSpecies.DOG, owner=owner) for name, owner in zip(["Rex", "Max"], clients)]
+    db.add_all([*doctors, *clients, *pets])
+    await db.commit()
+    db.expunge_all()  # detached, so a rollback in the code under test cannot expire them
+    return Clinic(doctors, clients, pets)
+
+
+@pytest.fixture
+def statements(db):
+    """SQL statements sent through `db` during the test; clear it before the part being measured."""
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    engine = db.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture(scope="module")
+def plan_engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def query_plan(plan_engine):
+    """EXPLAIN QUERY PLAN of a statement against an empty schema, one step per line."""
+    def explain(stmt: Select) -> str:
+        sql = str(stmt.compile(plan_engine, compile_kwargs={"literal_binds": True}))
+        with plan_engine.connect() as conn:
+            return "\n".join(row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql))
+    return explain
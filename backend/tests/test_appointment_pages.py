@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException, Response
+from sqlalchemy import insert
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.appointments import router
+from app.appointments.models import Appointment, AppointmentStatus
+from app.appointments.schemas import AppointmentView
+from app.appointments.service import MAX_PAGE_SIZE, get_appointments_for_user
+from app.core.pagination import encode_cursor
+from app.core.totals import TotalsMode
+from app.users.models import UserRole
+from app.users.principal import Principal
+
+ADMIN = Principal(id=0, email="admin@vet.com", role=UserRole.ADMIN)
+NINE = datetime(2030, 1, 7, 9)
+
+
+async def _page(db, user=ADMIN, page=1, limit=2, cursor=None, start_date=None, end_date=None):
+    return await get_appointments_for_user(db, user, page, limit, start_date, end_date, cursor, TotalsMode.NONE)
+
+
+async def _walk(db, **kwargs) -> list[int]:
+    """Ids of every row, following next_cursor from the first page."""
+    ids, cursor = [], None
+    while True:
+        items, _, cursor = await _page(db, cursor=cursor, **kwargs)
+        ids += [item.id for item in items]
+        if cursor is None:
+            return ids
+
+
+@pytest_asyncio.fixture
+async def visits(db, clinic) -> list[Appointment]:
+    """Seven visits in list order; the middle five share one start time (different doctors and clients)."""
+    rows = [clinic.appointment(NINE - timedelta(days=1))]
+    rows += [clinic.appointment(NINE, doctor=i % 2, client=i // 2 % 2) for i in range(5)]
+    rows.append(clinic.appointment(NINE + timedelta(days=1), client=1))
+    db.add_all(rows)
+    await db.commit()
+    db.expunge_all()
+    return rows
+
+
+@pytest.mark.asyncio
+async def test_cursor_walks_rows_with_equal_start_times_once_each(db, visits):
+    assert await _walk(db) == [visit.id for visit in visits]
+    assert await _walk(db, limit=1) == [visit.id for visit in visits]
+
+
+@pytest.mark.asyncio
+async def test_cursor_combines_with_date_range_and_role(db, clinic, visits):
+    in_range = await _walk(db, start_date=NINE, end_date=NINE + timedelta(hours=1))
+    assert in_range == [visit.id for visit in visits[1:6]]
+
+    ann = clinic.as_client(0)
+    assert await _walk(db, user=ann, start_date=NINE) == [
+        visit.id for visit in visits[1:6] if visit.client_id == clinic.clients[0].id
+    ]
+
+
+@pytest.mark.asyncio
+async def test_page_number_falls_back_to_offset(db, visits):
+    items, _, cursor = await _page(db, page=2, limit=3)
+    assert [item.id for item in items] == [visit.id for visit in visits[3:6]]
+    # The cursor of an OFFSET page continues from its last row.
+    rest, _, last = await _page(db, limit=3, cursor=cursor)
+    assert [item.id for item in rest] == [visits[6].id] and last is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    encode_cursor("yesterday", 1),
+    encode_cursor(NINE, "one"),
+    encode_cursor(NINE),
+])
+async def test_malformed_cursor_is_rejected(db, cursor):
+    with pytest.raises(HTTPException) as exc:
+        await _page(db, cursor=cursor)
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_oversized_limit_is_clamped_not_rejected(db, clinic):
+    visit = clinic.appointment(NINE)
+    await db.execute(insert(Appointment), [
+        {"date_time": NINE + timedelta(minutes=i), "status": AppointmentStatus.PLANNED, "reason": "-",
+         "doctor_id": visit.doctor_id, "client_id": visit.client_id, "pet_id": visit.pet_id}
+        for i in range(MAX_PAGE_SIZE + 5)
+    ])
+    await db.commit()
+
+    page = await router.read_appointments(
+        Response(), db, page=1, limit=10_000, cursor=None, totals=TotalsMode.EXACT, view=AppointmentView.FULL,
+        start_date=None, end_date=None, if_none_match=None, current_user=ADMIN,
+    )
+    assert len(page["items"]) == MAX_PAGE_SIZE
+    assert page["total"] == MAX_PAGE_SIZE + 5 and page["next_cursor"] is not None
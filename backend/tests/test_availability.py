@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.appointments.models import AppointmentStatus
+from app.appointments.service import check_availability, overlap_candidates_query
+
+TEN = datetime(2030, 5, 6, 10, 0)
+
+
+async def _free(db, clinic, start: datetime, minutes: int = 45, doctor: int = 0) -> bool:
+    return await check_availability(db, clinic.doctors[doctor].id, start, timedelta(minutes=minutes))
+
+
+@pytest.mark.asyncio
+async def test_back_to_back_bookings_are_allowed(db, clinic):
+    db.add(clinic.appointment(TEN, minutes=45))
+    await db.commit()
+
+    assert await _free(db, clinic, TEN + timedelta(minutes=45))
+    assert await _free(db, clinic, TEN - timedelta(minutes=45))
+    assert not await _free(db, clinic, TEN + timedelta(minutes=44))
+    assert not await _free(db, clinic, TEN - timedelta(minutes=44))
+    assert await _free(db, clinic, TEN, doctor=1)  # other doctors are unaffected
+
+
+@pytest.mark.asyncio
+async def test_a_longer_earlier_booking_reaches_into_later_slots(db, clinic):
+    db.add(clinic.appointment(TEN - timedelta(hours=1), minutes=120))  # 09:00-11:00
+    await db.commit()
+
+    assert not await _free(db, clinic, TEN + timedelta(minutes=45), minutes=15)  # 10:45 is still covered
+    assert await _free(db, clinic, TEN + timedelta(hours=1))
+
+
+@pytest.mark.asyncio
+async def test_cancelled_bookings_are_ignored(db, clinic):
+    db.add(clinic.appointment(TEN, status=AppointmentStatus.CANCELLED))
+    db.add(clinic.appointment(TEN + timedelta(hours=2), status=AppointmentStatus.COMPLETED))
+    await db.commit()
+
+    assert await _free(db, clinic, TEN)
+    assert not await _free(db, clinic, TEN + timedelta(hours=2))
+
+
+def test_candidates_are_one_range_probe_on_the_active_index(query_plan):
+    plan = query_plan(overlap_candidates_query(1, TEN, TEN + timedelta(minutes=45)))
+    index = "ix_appointments_doctor_id_date_time_active"
+    assert f"USING INDEX {index} (doctor_id=? AND date_time>? AND date_time<?)" in plan
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.core.cache import TTLCache
+from app.users.models import UserRole
+from app.users.models import User
+from app.users.principal import Principal, PrincipalCache, ProfileRef, principal_claims
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_and_counts():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl_seconds=5, clock=clock)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    clock.now = 5
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_principal_cache_invalidates_by_user_id():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    principal = Principal(id=7, email="a@b.c", role=UserRole.CLIENT, client_profile=ProfileRef(3, "A"))
+    cache.set("a@b.c", None, principal)
+    cache.set("a@b.c", "client", principal)
+    assert cache.get("a@b.c", None) is principal
+
+    cache.invalidate_user(7)
+    assert cache.get("a@b.c", None) is None
+    assert cache.get("a@b.c", "client") is None
+
+
+def test_principal_round_trips_through_claims():
+    user = User(id=7, email="a@b.c", role=UserRole.CLIENT, token_version=3)
+    user.client_profile = None
+    user.doctor_profile = None
+    claims = principal_claims(user)
+    assert claims == {"sub": "a@b.c", "uid": 7, "role": "client", "ver": 3}
+
+    claims["cid"] = 11
+    principal = Principal.from_claims(claims)
+    assert principal.id == 7 and principal.role == UserRole.CLIENT
+    assert principal.client_profile == ProfileRef(11)
+    assert principal.doctor_profile is None
+
+
+def test_verified_token_cache_reuses_claims():
+    from datetime import timedelta
+    from app.core import security
+
+    token = security.create_access_token({"sub": "a@b.c"}, expires_delta=timedelta(minutes=5))
+    hits = security._verified_tokens.hits
+    first = security.decode_access_token(token)
+    second = security.decode_access_token(token)
+    assert first is second and first["sub"] == "a@b.c"
+    assert security._verified_tokens.hits == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_coalesces_concurrent_misses():
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(5)))
+    assert results == ["value"] * 5
+    assert calls == 1
+    assert cache.stats()["coalesced"] == 4
+    assert await cache.get_or_load("k", loader) == "value" and calls == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_drops_result_invalidated_mid_load():
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+
+    async def loader():
+        cache.pop("k")
+        return "stale"
+
+    assert await cache.get_or_load("k", loader) == "stale"
+    assert "k" not in cache
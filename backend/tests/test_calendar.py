@@ -0,0 +1,73 @@
+from datetime import date, datetime
+
+import pytest
+
+from app.appointments.schedule import SLOTS_PER_DAY
+from app.appointments.service import get_calendar_load
+
+DAY = date(2030, 3, 4)
+
+
+async def _load(db, clinic, *appointments) -> dict:
+    db.add_all(appointments)
+    await db.commit()
+    result = await get_calendar_load(db, DAY, DAY, doctor_ids=[clinic.doctors[0].id])
+    (entry,) = result["doctors"]
+    return {"booked": entry["booked"][0], "free": entry["free_slots"][0]}
+
+
+@pytest.mark.asyncio
+async def test_off_grid_visit_blocks_every_slot_it_overlaps(db, clinic):
+    # 09:30-10:15 straddles the 09:00 and 09:45 slots.
+    load = await _load(db, clinic, clinic.appointment(datetime(2030, 3, 4, 9, 30)))
+    assert load == {"booked": 1, "free": SLOTS_PER_DAY - 2}
+
+
+@pytest.mark.asyncio
+async def test_short_visits_in_different_slots_block_one_slot_each(db, clinic):
+    load = await _load(
+        db, clinic,
+        clinic.appointment(datetime(2030, 3, 4, 9, 0), minutes=15),
+        clinic.appointment(datetime(2030, 3, 4, 10, 0), minutes=15),
+    )
+    assert load == {"booked": 2, "free": SLOTS_PER_DAY - 2}
+
+
+@pytest.mark.asyncio
+async def test_every_doctor_is_listed_and_grid_days_are_counted_in_sql(db, clinic, statements):
+    db.add_all([
+        clinic.appointment(datetime(2030, 3, 4, 9, 0)),
+        clinic.appointment(datetime(2030, 3, 4, 9, 45)),
+        clinic.appointment(datetime(2030, 3, 5, 16, 30)),
+    ])
+    await db.commit()
+    statements.clear()
+
+    result = await get_calendar_load(db, DAY, date(2030, 3, 6))
+
+    # Grid-aligned days need no second query; the doctor without bookings is fully free.
+    assert len(statements) == 1
+    assert result["doctors"] == [
+        {"doctor_id": clinic.doctors[0].id, "booked": [2, 1, 0],
+         "free_slots": [SLOTS_PER_DAY - 2, SLOTS_PER_DAY - 1, SLOTS_PER_DAY]},
+        {"doctor_id": clinic.doctors[1].id, "booked": [0, 0, 0], "free_slots": [SLOTS_PER_DAY] * 3},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_only_off_grid_days_are_merged(db, clinic, statements):
+    db.add_all([
+        clinic.appointment(datetime(2030, 3, 4, 9, 0)),
+        clinic.appointment(datetime(2030, 3, 5, 9, 0), minutes=90),
+        clinic.appointment(datetime(2030, 3, 5, 9, 0), doctor=1),
+    ])
+    await db.commit()
+    statements.clear()
+
+    result = await get_calendar_load(db, DAY, date(2030, 3, 5))
+
+    assert len(statements) == 2
+    assert [entry["free_slots"] for entry in result["doctors"]] == [
+        [SLOTS_PER_DAY - 1, SLOTS_PER_DAY - 2],
+        [SLOTS_PER_DAY, SLOTS_PER_DAY - 1],
+    ]
@@ -0,0 +1,84 @@
+import pytest
+from fastapi import HTTPException
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.clients import search, service
+from app.clients.schemas import ClientCreate, ClientUpdate
+from app.clients.search import search_terms
+
+
+def test_phone_like_terms_are_reduced_to_digits():
+    assert search_terms("+1 (555) 123-4567") == ["555", "1234567"]
+    assert search_terms("Ann LEE  a.b@x.com") == ["ann", "lee", "a.b@x.com"]
+    assert search_terms("a 12") == []
+
+
+async def _names(db, query: str) -> list[str]:
+    items, _, _ = await service.search_clients(db, query)
+    return [client.full_name for client in items]
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_create_update_and_delete(db):
+    anna = await service.create_client(db, ClientCreate(
+        email="anna.k@mail.com", password="secret1", full_name="Anna Kovalenko", phone_number="+380 67 123 45 67",
+    ))
+    await service.create_client(db, ClientCreate(
+        email="bohdan@mail.com", password="secret1", full_name="Bohdan Annenko", phone_number="+380 50 765 43 21",
+    ))
+
+    assert await _names(db, "koval") == ["Anna Kovalenko"]
+    assert await _names(db, "067 123") == ["Anna Kovalenko"]
+    assert await _names(db, "bohdan@") == ["Bohdan Annenko"]
+    assert sorted(await _names(db, "ann")) == ["Anna Kovalenko", "Bohdan Annenko"]
+
+    await service.update_client(db, anna.id, ClientUpdate(full_name="Anna Shevchenko"))
+    assert await _names(db, "koval") == []
+    assert await _names(db, "shevch") == ["Anna Shevchenko"]
+    assert await _names(db, "anna.k") == ["Anna Shevchenko"]  # email still indexed
+
+    await service.delete_client(db, anna.id)
+    assert await _names(db, "ann") == ["Bohdan Annenko"]
+
+
+@pytest.mark.asyncio
+async def test_name_hits_rank_above_email_hits(db):
+    await service.create_client(db, ClientCreate(
+        email="petrenko.fan@mail.com", password="secret1", full_name="Olha Bondar", phone_number="+380 44 000 00 01",
+    ))
+    await service.create_client(db, ClientCreate(
+        email="o.p@mail.com", password="secret1", full_name="Oleh Petrenko", phone_number="+380 44 000 00 02",
+    ))
+    assert await _names(db, "petrenko") == ["Oleh Petrenko", "Olha Bondar"]
+
+
+@pytest.mark.asyncio
+async def test_best_matches_are_kept_when_the_cap_truncates(db, monkeypatch):
+    monkeypatch.setattr(search, "MAX_RANKED_MATCHES", 2)
+    monkeypatch.setattr(service, "MAX_RANKED_MATCHES", 2)
+    for i in range(3):
+        await service.create_client(db, ClientCreate(
+            email=f"kravets.{i}@mail.com", password="secret1", full_name=f"Olena Bilyk {i}",
+            phone_number=f"+380 44 000 00 1{i}",
+        ))
+    # The name hit has the highest id, so capping before ranking would have dropped it.
+    await service.create_client(db, ClientCreate(
+        email="o.k@mail.com", password="secret1", full_name="Oksana Kravets", phone_number="+380 44 000 00 20",
+    ))
+
+    items, total, truncated = await service.search_clients(db, "kravets")
+    assert [client.full_name for client in items] == ["Oksana Kravets", "Olena Bilyk 0"]
+    assert (total, truncated) == (2, True)
+
+    items, total, truncated = await service.search_clients(db, "kravets", skip=1, limit=5)
+    assert [client.full_name for client in items] == ["Olena Bilyk 0"]
+
+    _, total, truncated = await service.search_clients(db, "oksana")
+    assert (total, truncated) == (1, False)
+
+
+@pytest.mark.asyncio
+async def test_query_without_a_usable_term_is_rejected(db):
+    with pytest.raises(HTTPException) as exc:
+        await service.search_clients(db, "ab 12")
+    assert exc.value.status_code == 400
@@ -0,0 +1,39 @@
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.doctors import service
+from app.doctors.models import Doctor
+from app.doctors.schemas import DoctorUpdate
+from app.users.models import User, UserRole
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def doctor(db):
+    db.add(User(id=1, email="dr@vet.com", password_hash="-", role=UserRole.DOCTOR))
+    db.add(Doctor(id=1, user_id=1, full_name="Dr. One"))
+    await db.commit()
+    service.directory_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_directory_is_served_from_cache_until_a_doctor_changes(db):
+    etag, body = await service.get_doctor_directory(db, 0, 100)
+    assert [d["full_name"] for d in json.loads(body)] == ["Dr. One"]
+    assert await service.get_doctor_directory(None, 0, 100) == (etag, body)  # no query on a hit
+
+    await service.update_doctor(db, 1, DoctorUpdate(full_name="Dr. Renamed"))
+    new_etag, new_body = await service.get_doctor_directory(db, 0, 100)
+    assert new_etag != etag
+    assert json.loads(new_body)[0]["full_name"] == "Dr. Renamed"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load(db):
+    coalesced = service.directory_cache.coalesced
+    results = await asyncio.gather(*(service.get_doctor_directory(db, 0, 100) for _ in range(5)))
+    assert len(set(results)) == 1
+    assert service.directory_cache.coalesced - coalesced == 4
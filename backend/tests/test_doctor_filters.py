@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import insert
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.doctors.models import Doctor, DoctorSpecialization
+from app.doctors.schemas import DoctorFilters, DoctorSort, DoctorUpdate
+from app.doctors.service import build_doctor_query, get_doctors, update_doctor
+
+
+@pytest.mark.parametrize("filters, index", [
+    (DoctorFilters(sort=DoctorSort.NAME), "ix_doctors_full_name_key"),
+    (DoctorFilters(name="Sm", sort=DoctorSort.NAME), "ix_doctors_full_name_key (full_name_key>? AND full_name_key<?)"),
+    (DoctorFilters(min_experience=5, max_experience=10, sort=DoctorSort.EXPERIENCE),
+     "ix_doctors_experience_years (experience_years>? AND experience_years<?)"),
+    (DoctorFilters(sort=DoctorSort.EXPERIENCE_DESC), "ix_doctors_experience_years"),
+    (DoctorFilters(specialization=DoctorSpecialization.SURGEON, sort=DoctorSort.NAME),
+     "ix_doctors_specialization_full_name_key (specialization=?)"),
+    (DoctorFilters(specialization=DoctorSpecialization.SURGEON, name="sm", sort=DoctorSort.NAME),
+     "ix_doctors_specialization_full_name_key (specialization=? AND full_name_key>? AND full_name_key<?)"),
+    (DoctorFilters(specialization=DoctorSpecialization.DENTIST, min_experience=3, sort=DoctorSort.EXPERIENCE_DESC),
+     "ix_doctors_specialization_experience_years (specialization=? AND experience_years>?)"),
+])
+def test_filters_and_sorts_are_index_scans_without_a_sort_step(query_plan, filters, index):
+    plan = query_plan(build_doctor_query(filters))
+    assert f"USING INDEX {index}" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_name_prefix_is_a_range_seek_under_any_sort(query_plan):
+    # Sorting the few matches by id afterwards is fine; the scan itself must not be.
+    plan = query_plan(build_doctor_query(DoctorFilters(name="Sm")))
+    assert "USING INDEX ix_doctors_full_name_key (full_name_key>? AND full_name_key<?)" in plan
+    assert "SCAN doctors" not in plan
+
+
+async def _names(db, name: str, sort: DoctorSort = DoctorSort.NAME) -> list[str]:
+    return [doctor.full_name for doctor in await get_doctors(db, 0, 100, DoctorFilters(name=name, sort=sort))]
+
+
+@pytest.mark.asyncio
+async def test_name_prefix_ignores_case_beyond_ascii(db, clinic):
+    await update_doctor(db, clinic.doctors[0].id, DoctorUpdate(full_name="Іванов Олег"))
+    await update_doctor(db, clinic.doctors[1].id, DoctorUpdate(full_name="STRAßER Jan"))
+    # Bulk inserts leave the key to the column default.
+    await db.execute(insert(Doctor), [{"user_id": clinic.clients[0].user_id, "full_name": "іванченко Ігор"}])
+    await db.commit()
+
+    assert await _names(db, "іва") == ["Іванов Олег", "іванченко Ігор"]
+    assert await _names(db, "ІВАНЧ") == ["іванченко Ігор"]
+    assert await _names(db, "strass") == ["STRAßER Jan"]
+    assert await _names(db, "Adams") == []
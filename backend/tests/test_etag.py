@@ -0,0 +1,33 @@
+import pytest
+from fastapi import HTTPException, Response
+
+from app.core.etag import apply_etag, etag_matches, make_etag
+
+
+def test_etag_is_stable_and_sensitive_to_every_part():
+    assert make_etag("slots", 1, 2047) == make_etag("slots", 1, 2047)
+    assert make_etag("slots", 1, 2047) != make_etag("slots", 1, 2046)
+    assert make_etag("slots", 1, 2047).startswith('"')
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"x", "abc"', True),
+    ('"abcd"', False),
+    ("*", True),
+])
+def test_if_none_match_uses_weak_comparison(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+
+
+def test_apply_etag_tags_response_or_raises_not_modified():
+    response = Response()
+    apply_etag(response, '"old"', '"new"', cache_control="private, no-cache")
+    assert response.headers["etag"] == '"new"'
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    with pytest.raises(HTTPException) as exc:
+        apply_etag(Response(), '"new"', '"new"')
+    assert exc.value.status_code == 304 and exc.value.headers["ETag"] == '"new"'
@@ -0,0 +1,147 @@
+import asyncio
+import json
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.appointments import service
+from app.appointments.events import ScheduleEvents, client_topic, doctor_topic, schedule_events
+from app.appointments.schedule import slot_start
+from app.appointments.schemas import AppointmentCreate, AppointmentSeriesCreate
+
+TOMORROW = datetime.now(timezone.utc).date() + timedelta(days=1)
+
+
+@pytest.mark.asyncio
+async def test_event_reaches_each_matching_subscriber_once():
+    bus = ScheduleEvents(max_subscribers=10, max_pending=8)
+    both = bus.subscribe([doctor_topic(1), client_topic(7)])
+    other = bus.subscribe([doctor_topic(2)])
+
+    bus.publish("booked", [doctor_topic(1), client_topic(7)], {"id": 3})
+
+    batch = await both.next_batch(timeout=1)
+    assert [(kind, json.loads(data)) for kind, data in batch] == [("booked", {"id": 3})]
+    assert await other.next_batch(timeout=0.01) == []
+
+
+@pytest.mark.asyncio
+async def test_waiting_reader_wakes_on_publish():
+    bus = ScheduleEvents(max_subscribers=10, max_pending=8)
+    subscription = bus.subscribe([doctor_topic(1)])
+    reader = asyncio.create_task(subscription.next_batch(timeout=5))
+    await asyncio.sleep(0)
+
+    bus.publish("cancelled", [doctor_topic(1)], {"id": 4})
+    assert [kind for kind, _ in await asyncio.wait_for(reader, 1)] == ["cancelled"]
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_dropped_without_affecting_others():
+    bus = ScheduleEvents(max_subscribers=10, max_pending=2)
+    slow = bus.subscribe([doctor_topic(1)])
+    fast = bus.subscribe([doctor_topic(1)])
+
+    for i in range(3):
+        bus.publish("booked", [doctor_topic(1)], {"id": i})
+        if i < 2:
+            await fast.next_batch(timeout=1)
+    assert len(await fast.next_batch(timeout=1)) == 1
+
+    assert slow.overflowed and await slow.next_batch(timeout=1) == []
+    assert bus.stats()["subscribers"] == 1 and bus.stats()["dropped"] == 1
+
+    bus.unsubscribe(slow)  # the stream's own cleanup must not double-count
+    assert bus.stats()["subscribers"] == 1
+
+
+def test_subscriber_limit():
+    bus = ScheduleEvents(max_subscribers=1, max_pending=2)
+    first = bus.subscribe([doctor_topic(1)])
+    assert bus.subscribe([doctor_topic(1)]) is None
+    bus.unsubscribe(first)
+    assert bus.subscribe([doctor_topic(1)]) is not None
+
+
+@pytest.fixture
+def published(db, monkeypatch):
+    """(kind, status, commits so far) of every event the app publishes while the test runs."""
+    commits = 0
+    events = []
+
+    def committed(session):
+        nonlocal commits
+        commits += 1
+
+    def publish(kind, topics, payload):
+        events.append((kind, payload["status"], commits))
+
+    event.listen(db.sync_session, "after_commit", committed)
+    monkeypatch.setattr(schedule_events, "publish", publish)
+    yield events
+    event.remove(db.sync_session, "after_commit", committed)
+
+
+@pytest.mark.asyncio
+async def test_bookings_publish_after_their_commit(db, clinic, published):
+    await service.create_appointment(db, AppointmentCreate(
+        doctor_id=clinic.doctors[0].id, pet_id=clinic.pets[0].id, date_time=slot_start(TOMORROW, 0),
+    ), client_id=clinic.clients[0].id)
+    assert published == [("booked", "planned", 1)]
+
+    published.clear()
+    await service.create_appointment_series_for_client(db, AppointmentSeriesCreate(
+        doctor_id=clinic.doctors[0].id, pet_id=clinic.pets[0].id,
+        date_times=[slot_start(TOMORROW, 1), slot_start(TOMORROW, 2)],
+    ), clinic.as_client(0))
+    assert published == [("booked", "planned", 2)] * 2
+
+
+@pytest.mark.asyncio
+async def test_transitions_and_deletes_publish_after_their_commit(db, clinic, published):
+    first, second = clinic.appointment(slot_start(TOMORROW, 0)), clinic.appointment(slot_start(TOMORROW, 1))
+    db.add_all([first, second])
+    await db.commit()
+    db.expunge_all()
+    published.clear()
+
+    await service.cancel_appointment(db, first.id, clinic.as_client(0))
+    await service.complete_appointment(db, second.id, clinic.as_doctor(0))
+    await service.delete_appointment(db, first.id)
+    assert published == [("cancelled", "cancelled", 2), ("completed", "completed", 3), ("deleted", "cancelled", 4)]
+
+
+@pytest.mark.asyncio
+async def test_failed_writes_publish_nothing(db, clinic, published):
+    visit = clinic.appointment(slot_start(TOMORROW, 0))
+    db.add(visit)
+    await db.commit()
+    db.expunge(visit)
+
+    with pytest.raises(HTTPException):
+        await service.create_appointment(db, AppointmentCreate(
+            doctor_id=clinic.doctors[0].id, pet_id=clinic.pets[1].id, date_time=slot_start(TOMORROW, 0),
+        ), client_id=clinic.clients[1].id)
+    with pytest.raises(HTTPException):
+        await service.cancel_appointment(db, visit.id, clinic.as_client(1))
+    assert published == []
+
+
+@pytest.mark.asyncio
+async def test_stream_subscribes_once_read_and_unsubscribes_on_close():
+    stream = service.stream_schedule_events(frozenset([doctor_topic(1)]))
+    assert await stream.__anext__() == "retry: 5000\n\n"
+    assert schedule_events.stats()["subscribers"] == 0  # a client gone by now leaves nothing behind
+
+    reader = asyncio.create_task(stream.__anext__())
+    await asyncio.sleep(0)
+    assert schedule_events.stats()["subscribers"] == 1
+    schedule_events.publish("booked", [doctor_topic(1)], {"id": 5})
+    assert (await asyncio.wait_for(reader, 1)).startswith("event: booked\n")
+
+    await stream.aclose()
+    assert schedule_events.stats()["subscribers"] == 0
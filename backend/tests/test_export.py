@@ -0,0 +1,136 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete
+
+from app.main import app
+from app.appointments import service
+from app.appointments.models import Appointment, AppointmentStatus
+from app.appointments.service import EXPORT_FIELDS, _format_csv, _format_ndjson
+from app.core.db import get_db
+from app.users.dependencies import get_current_user
+from app.users.models import UserRole
+from app.users.principal import Principal
+
+ADMIN = Principal(id=0, email="admin@vet.com", role=UserRole.ADMIN)
+NINE = datetime(2030, 1, 7, 9)
+
+ROWS = [
+    (1, datetime(2030, 1, 7, 9), 45, AppointmentStatus.PLANNED, 'Limping, "badly"', None,
+     2, "Ann Lee", 3, "Dr. Who", 4, "Rex"),
+    (2, datetime(2030, 1, 7, 9, 45), 30, AppointmentStatus.COMPLETED, "Checkup", "All good\nnext year",
+     2, "Ann Lee", 3, "Dr. Who", 5, "Luna"),
+]
+
+
+def test_ndjson_rows_are_self_contained_objects():
+    lines = _format_ndjson(ROWS).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert list(records[0]) == EXPORT_FIELDS
+    assert records[0]["date_time"] == "2030-01-07T09:00:00+00:00"
+    assert records[1]["status"] == "completed" and records[1]["doctor_notes"] == "All good\nnext year"
+
+
+def test_csv_quotes_free_text():
+    parsed = list(csv.reader(io.StringIO(_format_csv(ROWS))))
+    assert len(parsed) == 2
+    assert parsed[0][4] == 'Limping, "badly"'
+    assert parsed[1][5] == "All good\nnext year"
+    assert len(parsed[0]) == len(EXPORT_FIELDS)
+    assert parsed[0][-1] != parsed[1][-1]
+
+
+@pytest_asyncio.fixture
+async def export(session_factory, monkeypatch):
+    """GET /appointments/export through the app as `user`, returning (status code, body text)."""
+    monkeypatch.setattr(service, "async_session_factory", session_factory)
+    caller = {"user": ADMIN}
+
+    async def session():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_current_user] = lambda: caller["user"]
+
+    async def get(user=ADMIN, **params) -> tuple[int, str]:
+        caller["user"] = user
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/appointments/export", params=params)
+        return response.status_code, response.text
+
+    yield get
+    app.dependency_overrides.clear()
+
+
+@pytest_asyncio.fixture
+async def visits(db, clinic) -> list[Appointment]:
+    """Five visits in export order; the second and third start at the same time."""
+    rows = [
+        clinic.appointment(NINE),
+        clinic.appointment(NINE + timedelta(days=1), doctor=1, client=1),
+        clinic.appointment(NINE + timedelta(days=1)),
+        clinic.appointment(NINE + timedelta(days=2), doctor=1, status=AppointmentStatus.CANCELLED),
+        clinic.appointment(NINE + timedelta(days=3)),
+    ]
+    db.add_all(rows)
+    await db.commit()
+    return rows
+
+
+def _records(body: str) -> list[dict]:
+    return [json.loads(line) for line in body.splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_export_is_admin_only(export, clinic, visits):
+    assert (await export(user=clinic.as_doctor(0)))[0] == 403
+    assert (await export(user=clinic.as_client(0)))[0] == 403
+
+
+@pytest.mark.asyncio
+async def test_export_filters_by_dates_and_doctors(export, clinic, visits):
+    code, body = await export()
+    assert code == 200
+    assert [record["id"] for record in _records(body)] == [visit.id for visit in visits]
+
+    _, body = await export(start_date=(NINE + timedelta(days=1)).isoformat(),
+                           end_date=(NINE + timedelta(days=2)).isoformat())
+    assert [record["id"] for record in _records(body)] == [visit.id for visit in visits[1:4]]
+
+    _, body = await export(doctor_ids=[clinic.doctors[1].id])
+    assert [record["id"] for record in _records(body)] == [visits[1].id, visits[3].id]
+
+
+@pytest.mark.asyncio
+async def test_export_resumes_from_a_cursor_without_gaps_or_duplicates(export, visits):
+    _, body = await export(format="csv")
+    header, *rows = list(csv.reader(io.StringIO(body)))
+    assert header == EXPORT_FIELDS and len(rows) == len(visits)
+
+    # Cut after the first of the two rows that share a start time.
+    _, rest = await export(format="csv", cursor=rows[1][-1])
+    resumed = list(csv.reader(io.StringIO(rest)))
+    assert resumed == rows[2:]  # no header on resume
+
+
+@pytest.mark.asyncio
+async def test_export_resumes_after_the_last_row_was_deleted(export, db, visits):
+    _, body = await export()
+    cursor = _records(body)[1]["cursor"]
+    await db.execute(delete(Appointment).where(Appointment.id == visits[1].id))
+    await db.commit()
+
+    _, rest = await export(cursor=cursor)
+    assert [record["id"] for record in _records(rest)] == [visit.id for visit in visits[2:]]
+
+
+@pytest.mark.asyncio
+async def test_export_rejects_a_malformed_cursor(export, visits):
+    assert (await export(cursor="not-a-cursor"))[0] == 400
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.appointments.schedule import SLOTS_PER_DAY, slot_start
+from app.appointments.service import find_free_slots
+from app.doctors.models import DoctorSpecialization
+
+TODAY = datetime.now(timezone.utc).date()
+TOMORROW = TODAY + timedelta(days=1)
+
+
+def _at(day, slot):
+    return slot_start(day, slot).replace(tzinfo=timezone.utc)
+
+
+def _found(slots) -> list[tuple[int, datetime]]:
+    return [(slot["doctor_id"], slot["date_time"]) for slot in slots]
+
+
+@pytest.mark.asyncio
+async def test_slots_are_ordered_by_time_then_doctor_skipping_booked_ones(db, clinic):
+    adams, baker = clinic.doctors[0].id, clinic.doctors[1].id
+    db.add(clinic.appointment(slot_start(TOMORROW, 0), doctor=0))
+    await db.commit()
+
+    slots = await find_free_slots(db, TOMORROW, TOMORROW, 4, doctor_ids=[baker, adams])
+    assert _found(slots) == [
+        (baker, _at(TOMORROW, 0)),
+        (adams, _at(TOMORROW, 1)), (baker, _at(TOMORROW, 1)),
+        (adams, _at(TOMORROW, 2)),
+    ]
+    assert slots[0]["doctor_name"] == "Dr. Baker" and slots[0]["specialization"] == DoctorSpecialization.SURGEON
+
+
+@pytest.mark.asyncio
+async def test_specialization_selects_doctors_and_limit_caps_results(db, clinic):
+    slots = await find_free_slots(db, TOMORROW, TOMORROW + timedelta(days=1), 100,
+                                  specialization=DoctorSpecialization.THERAPIST)
+    assert {doctor_id for doctor_id, _ in _found(slots)} == {clinic.doctors[0].id}
+    assert len(slots) == 2 * SLOTS_PER_DAY
+
+    assert len(await find_free_slots(db, TOMORROW, TOMORROW, 3, doctor_ids=[clinic.doctors[0].id])) == 3
+
+
+@pytest.mark.asyncio
+async def test_slots_already_started_are_excluded(db, clinic):
+    started = datetime.now(timezone.utc)
+    slots = await find_free_slots(db, TODAY, TOMORROW, 100, doctor_ids=[clinic.doctors[0].id])
+
+    assert all(when > started for _, when in _found(slots))
+    assert [when for _, when in _found(slots) if when.date() == TOMORROW] == [
+        _at(TOMORROW, slot) for slot in range(SLOTS_PER_DAY)
+    ]
@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.hashing import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_run_on_pool():
+    hasher = PasswordHasher("thread", workers=2, max_concurrency=2, max_queue=10)
+    try:
+        hashed = await hasher.hash("secret123")
+        assert await hasher.verify("secret123", hashed)
+        assert not await hasher.verify("wrong", hashed)
+        assert hasher.stats()["completed"] == 3
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queue_overflow_is_rejected():
+    hasher = PasswordHasher("thread", workers=1, max_concurrency=1, max_queue=1)
+    try:
+        hashed = await hasher.hash("secret123")
+        results = await asyncio.gather(
+            *(hasher.verify("secret123", hashed) for _ in range(4)),
+            return_exceptions=True,
+        )
+        rejected = [r for r in results if isinstance(r, HTTPException)]
+        assert rejected and all(r.status_code == 503 for r in rejected)
+        assert hasher.stats()["rejected"] == len(rejected)
+        assert hasher.stats()["queue_depth"] == 0
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,54 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.appointments.intervals import BusyIntervals
+from app.appointments.schedule import APPOINTMENT_DURATION, SLOTS_PER_DAY, busy_mask, slot_start
+
+
+def overlaps_any(intervals, start, end):
+    return start < end and any(s < end and start < e and s < e for s, e in intervals)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_overlaps_matches_brute_force(seed):
+    rng = random.Random(seed)
+    busy = BusyIntervals()
+    oracle = []
+    for _ in range(200):
+        start = rng.randrange(0, 1000)
+        end = start + rng.randrange(0, 60)
+        if rng.random() < 0.5:
+            busy.add(start, end)
+            oracle.append((start, end))
+        assert busy.overlaps(start, end) == overlaps_any(oracle, start, end)
+
+    for _ in range(500):
+        start = rng.randrange(-50, 1100)
+        end = start + rng.randrange(0, 80)
+        assert busy.overlaps(start, end) == overlaps_any(oracle, start, end)
+
+    blocks = list(busy)
+    assert all(s < e for s, e in blocks)
+    assert all(e1 < s2 for (_, e1), (s2, _) in zip(blocks, blocks[1:]))
+    assert blocks == list(BusyIntervals(oracle))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_busy_mask_matches_brute_force(seed):
+    rng = random.Random(seed)
+    day = date(2030, 1, 7)
+    day_start = slot_start(day, 0) - timedelta(hours=2)
+    bookings = []
+    for _ in range(rng.randrange(0, 8)):
+        start = day_start + timedelta(minutes=5 * rng.randrange(0, 140))
+        bookings.append((start, start + timedelta(minutes=rng.choice([15, 30, 45, 60, 90, 240]))))
+
+    expected = 0
+    for slot in range(SLOTS_PER_DAY):
+        begins = slot_start(day, slot)
+        if overlaps_any(bookings, begins, begins + APPOINTMENT_DURATION):
+            expected |= 1 << slot
+    assert busy_mask(BusyIntervals(bookings)) == expected
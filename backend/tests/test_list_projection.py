@@ -0,0 +1,48 @@
+from datetime import datetime
+
+import pytest
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.appointments.models import AppointmentStatus
+from app.appointments.schemas import AppointmentSummary, AppointmentView
+from app.appointments.service import get_appointments_for_user
+from app.core.totals import TotalsMode
+from app.users.models import UserRole
+from app.users.principal import Principal
+
+ADMIN = Principal(id=0, email="admin@vet.com", role=UserRole.ADMIN)
+
+
+@pytest.mark.asyncio
+async def test_compact_page_is_one_column_select(db, clinic, statements):
+    db.add_all([
+        clinic.appointment(datetime(2030, 1, 7, 9), doctor=0, client=0, reason="Limping"),
+        clinic.appointment(datetime(2030, 1, 7, 11), doctor=1, client=1, status=AppointmentStatus.COMPLETED),
+        clinic.appointment(datetime(2030, 1, 8, 9), doctor=0, client=1),
+    ])
+    await db.commit()
+    statements.clear()
+
+    items, total, next_cursor = await get_appointments_for_user(
+        db, ADMIN, 1, 2, None, None, totals=TotalsMode.NONE, view=AppointmentView.COMPACT,
+    )
+
+    assert len(statements) == 1
+    assert total is None and next_cursor is not None
+    assert all(isinstance(item, AppointmentSummary) for item in items)
+    first, second = items
+    assert first._asdict() == {
+        "id": first.id, "date_time": datetime(2030, 1, 7, 9), "duration_minutes": 45,
+        "status": AppointmentStatus.PLANNED, "reason": "Limping",
+        "client_id": clinic.clients[0].id, "client_name": "Ann Lee",
+        "doctor_id": clinic.doctors[0].id, "doctor_name": "Dr. Adams",
+        "pet_id": clinic.pets[0].id, "pet_name": "Rex",
+    }
+    assert (second.doctor_name, second.client_name, second.pet_name, second.status) == (
+        "Dr. Baker", "Bob Ray", "Max", AppointmentStatus.COMPLETED,
+    )
+
+    rest, _, last_cursor = await get_appointments_for_user(
+        db, ADMIN, 1, 2, None, None, next_cursor, TotalsMode.NONE, AppointmentView.COMPACT,
+    )
+    assert [item.date_time for item in rest] == [datetime(2030, 1, 8, 9)] and last_cursor is None
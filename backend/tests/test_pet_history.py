@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.appointments.models import Appointment, AppointmentStatus
+from app.appointments.service import build_pet_history_query, get_pet_history
+from app.clients.models import Client
+from app.doctors.models import Doctor
+from app.pets.models import Pet, PetSpecies
+from app.users.models import User, UserRole
+from app.users.principal import Principal, ProfileRef
+
+START = datetime(2026, 3, 2, 9, 0)
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def history(db):
+    doctor = Doctor(user=User(email="doc@vet.com", password_hash="x", role=UserRole.DOCTOR), full_name="Dr. House")
+    owner = Client(user=User(email="owner@mail.com", password_hash="x", role=UserRole.CLIENT), full_name="Ann Lee")
+    snowball = Pet(name="Snowball", species=PetSpecies.RABBIT, owner=owner)
+    other = Pet(name="Rex", species=PetSpecies.DOG, owner=owner)
+    db.add_all([doctor, owner, snowball, other])
+    await db.flush()
+    # Two visits share a start time, so the id breaks the tie.
+    times = [START + timedelta(days=i) for i in range(5)] + [START + timedelta(days=4)]
+    db.add_all([
+        Appointment(date_time=when, reason=f"visit {i}", doctor_notes=f"notes {i}", status=AppointmentStatus.COMPLETED,
+                    client_id=owner.id, doctor_id=doctor.id, pet_id=snowball.id)
+        for i, when in enumerate(times)
+    ])
+    db.add(Appointment(date_time=START, reason="other pet", client_id=owner.id, doctor_id=doctor.id, pet_id=other.id))
+    await db.commit()
+
+
+STAFF = Principal(id=1, email="doc@vet.com", role=UserRole.DOCTOR, doctor_profile=ProfileRef(id=1))
+
+
+@pytest.mark.asyncio
+async def test_history_pages_newest_first_one_query_each(db, statements):
+    statements.clear()
+    reasons, cursor, pages = [], None, 0
+    while True:
+        page, cursor = await get_pet_history(db, 1, STAFF, limit=4, cursor=cursor)
+        reasons += [visit.reason for visit in page]
+        pages += 1
+        if cursor is None:
+            break
+
+    assert reasons == ["visit 5", "visit 4", "visit 3", "visit 2", "visit 1", "visit 0"]
+    assert page[-1].doctor_name == "Dr. House" and page[-1].doctor_notes == "notes 0"
+    assert len(statements) == 2 * pages  # the pet lookup and one projection select per page
+
+
+@pytest.mark.asyncio
+async def test_history_access(db):
+    owner = Principal(id=2, email="owner@mail.com", role=UserRole.CLIENT, client_profile=ProfileRef(id=1))
+    stranger = Principal(id=3, email="x@mail.com", role=UserRole.CLIENT, client_profile=ProfileRef(id=99))
+
+    assert len((await get_pet_history(db, 2, owner, limit=10))[0]) == 1
+    with pytest.raises(HTTPException) as denied:
+        await get_pet_history(db, 1, stranger, limit=10)
+    assert denied.value.status_code == 403
+    with pytest.raises(HTTPException) as missing:
+        await get_pet_history(db, 404, STAFF, limit=10)
+    assert missing.value.status_code == 404
+
+
+@pytest.mark.parametrize("before", [None, (START + timedelta(days=3), 9)])
+def test_history_query_seeks_the_pet_index_without_a_sort_step(query_plan, before):
+    plan = query_plan(build_pet_history_query(1, before).limit(21))
+    assert "SEARCH appointments USING INDEX ix_appointments_pet_id_date_time_id (pet_id=?" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,90 @@
+import pytest
+import pytest_asyncio
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.clients.models import Client
+from app.pets.models import Pet, PetSpecies
+from app.pets.schemas import PetSearchFilters
+from app.pets.service import build_pet_search_query, search_pets
+from app.users.models import User, UserRole
+
+
+@pytest.mark.parametrize("filters, index", [
+    (PetSearchFilters(), "ix_pets_name_key (name_key>?)"),
+    (PetSearchFilters(name="sn"), "ix_pets_name_key (name_key>? AND name_key<?)"),
+    (PetSearchFilters(species=PetSpecies.RABBIT), "ix_pets_species_name_key (species=? AND name_key>?)"),
+    (PetSearchFilters(species=PetSpecies.RABBIT, name="Sn"),
+     "ix_pets_species_name_key (species=? AND name_key>? AND name_key<?)"),
+    (PetSearchFilters(breed="Labrador"), "ix_pets_breed_key_name_key (breed_key=? AND name_key>?)"),
+])
+def test_next_page_is_an_index_seek_without_a_sort_step(query_plan, filters, index):
+    plan = query_plan(build_pet_search_query(filters, after=("max", 40)).limit(21))
+    assert f"SEARCH pets USING INDEX {index}" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_owner_name_seeks_clients_then_their_pets(query_plan):
+    plan = query_plan(build_pet_search_query(PetSearchFilters(owner="smi")).limit(21))
+    assert "USING INDEX ix_clients_full_name_key (full_name_key>? AND full_name_key<?)" in plan
+    assert "USING INDEX ix_pets_owner_id_name_key (owner_id=?)" in plan
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def pets(db):
+    for i, (owner, pets) in enumerate([
+        ("John Smith", [("Snowball", PetSpecies.RABBIT, "Lop"), ("rex", PetSpecies.DOG, "Labrador")]),
+        ("Anna Smirnova", [("snowball", PetSpecies.RABBIT, "lop"), ("Snowy", PetSpecies.CAT, None)]),
+        ("Bob Lee", [("Snowball", PetSpecies.CAT, None), ("Max", PetSpecies.DOG, "labrador")]),
+    ]):
+        user = User(email=f"owner{i}@mail.com", password_hash="x", role=UserRole.CLIENT)
+        client = Client(user=user, full_name=owner, phone_number="5550000")
+        client.pets = [Pet(name=name, species=species, breed=breed) for name, species, breed in pets]
+        db.add(client)
+    await db.commit()
+    db.expunge_all()
+
+
+def _found(pets) -> list[tuple[str, str]]:
+    return [(pet.name, pet.owner.full_name) for pet in pets]
+
+
+@pytest.mark.asyncio
+async def test_filters_combine(db):
+    rabbits, _ = await search_pets(db, PetSearchFilters(name="SNOW", species=PetSpecies.RABBIT))
+    assert _found(rabbits) == [("Snowball", "John Smith"), ("snowball", "Anna Smirnova")]
+
+    labradors, _ = await search_pets(db, PetSearchFilters(breed="LABRADOR"))
+    assert _found(labradors) == [("Max", "Bob Lee"), ("rex", "John Smith")]
+
+    annas, _ = await search_pets(db, PetSearchFilters(owner="anna", name="snow"))
+    assert _found(annas) == [("snowball", "Anna Smirnova"), ("Snowy", "Anna Smirnova")]
+
+
+@pytest.mark.asyncio
+async def test_cursor_walks_every_match_once_with_owners_in_the_same_query(db, statements):
+    statements.clear()
+    seen, cursor = [], None
+    while True:
+        page, cursor = await search_pets(db, PetSearchFilters(name="s"), limit=2, cursor=cursor)
+        seen += _found(page)
+        if cursor is None:
+            break
+
+    assert seen == [
+        ("Snowball", "John Smith"), ("snowball", "Anna Smirnova"), ("Snowball", "Bob Lee"), ("Snowy", "Anna Smirnova"),
+    ]
+    assert len(statements) == 2  # one per page, owners included
+
+
+@pytest.mark.asyncio
+async def test_names_match_case_insensitively_beyond_ascii(db):
+    owner = Client(user=User(email="owner9@mail.com", password_hash="x", role=UserRole.CLIENT),
+                   full_name="Ірина Шевченко", phone_number="5550000")
+    owner.pets = [Pet(name="Ёжик", species=PetSpecies.EXOTIC, breed="Африканский")]
+    db.add(owner)
+    await db.commit()
+
+    hedgehogs, _ = await search_pets(db, PetSearchFilters(name="ёж", breed="АФРИКАНСКИЙ"))
+    assert _found(hedgehogs) == [("Ёжик", "Ірина Шевченко")]
+    by_owner, _ = await search_pets(db, PetSearchFilters(owner="ІРИНА"))
+    assert _found(by_owner) == [("Ёжик", "Ірина Шевченко")]
@@ -0,0 +1,141 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.appointments import service
+from app.appointments.schedule import (
+    DAY_BITS, FULL_DAY, SLOTS_PER_DAY, ScheduleIndex, iter_bits, slot_mask, slot_start, unpack_days,
+)
+from app.clients.service import delete_client
+from app.doctors.service import delete_doctor
+
+DAY = date(2030, 1, 7)
+MINUTES_45 = timedelta(minutes=45)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def execute(self, stmt):
+        self.queries += 1
+        return FakeResult(self.rows)
+
+
+def test_slot_mask_covers_overlapped_slots():
+    assert slot_mask(slot_start(DAY, 0), MINUTES_45) == 0b1
+    assert slot_mask(slot_start(DAY, 2) + timedelta(minutes=10), MINUTES_45) == 0b1100
+    assert slot_mask(slot_start(DAY, 10), timedelta(hours=2)) == 1 << 10
+    assert slot_mask(datetime(2030, 1, 7, 7), timedelta(hours=1)) == 0
+    assert list(iter_bits(0b100101)) == [0, 2, 5]
+
+
+@pytest.mark.asyncio
+async def test_free_bits_track_loads_and_bookings():
+    db = FakeSession([(1, slot_start(DAY, 0), 45), (1, slot_start(DAY + timedelta(days=1), 3), 90)])
+    index = ScheduleIndex(ttl_seconds=60, max_doctors=10, max_days=30)
+    await index.ensure_loaded(db, [1, 2], DAY, DAY + timedelta(days=1))
+    await index.ensure_loaded(db, [1], DAY, DAY)
+    assert db.queries == 1
+
+    first, second = unpack_days(index.free_bits(1, DAY, 2), 2)
+    assert first == FULL_DAY & ~0b1
+    assert second == FULL_DAY & ~0b11000
+    assert index.free_bits(2, DAY, 2) == FULL_DAY | FULL_DAY << DAY_BITS
+
+    index.mark_booked(2, slot_start(DAY, 4), MINUTES_45)
+    assert unpack_days(index.free_bits(2, DAY, 1), 1) == [FULL_DAY & ~0b10000]
+
+    index.mark_released(1, slot_start(DAY, 0))
+    db.rows = []
+    await index.ensure_loaded(db, [1], DAY, DAY)
+    assert db.queries == 2 and index.free_bits(1, DAY, 1) == FULL_DAY
+
+
+def test_free_bits_drop_elapsed_slots():
+    index = ScheduleIndex(ttl_seconds=60, max_doctors=10, max_days=30)
+    now = slot_start(DAY, 3)
+    today, tomorrow = unpack_days(index.free_bits(1, DAY, 2, not_before=now), 2)
+    assert list(iter_bits(today)) == list(range(4, SLOTS_PER_DAY))
+    assert tomorrow == FULL_DAY
+    assert index.free_bits(1, DAY - timedelta(days=3), 2, not_before=now) == 0
+
+
+@pytest.mark.asyncio
+async def test_index_evicts_least_recently_used_doctors():
+    db = FakeSession([])
+    index = ScheduleIndex(ttl_seconds=60, max_doctors=2, max_days=30)
+    await index.ensure_loaded(db, [1], DAY, DAY)
+    await index.ensure_loaded(db, [2], DAY, DAY)
+    await index.ensure_loaded(db, [1], DAY, DAY)  # 1 is now the most recently used
+    await index.ensure_loaded(db, [3], DAY, DAY)
+
+    assert 1 in index and 3 in index and 2 not in index
+    assert index.stats()["evicted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_day_window_slides_towards_requested_days():
+    db = FakeSession([(1, slot_start(DAY, 0), 45)])
+    index = ScheduleIndex(ttl_seconds=60, max_doctors=10, max_days=10)
+    await index.ensure_loaded(db, [1], DAY, DAY + timedelta(days=3))
+    assert index.stats()["days"] == 4
+
+    db.rows = []
+    await index.ensure_loaded(db, [1], DAY + timedelta(days=12), DAY + timedelta(days=12))
+    assert index.stats()["days"] == 10  # days 3..12; the oldest were dropped
+    assert index.free_bits(1, DAY + timedelta(days=3), 1) == FULL_DAY
+
+    with pytest.raises(ValueError):
+        await index.ensure_loaded(db, [1], DAY, DAY + timedelta(days=10))
+
+
+@pytest.mark.asyncio
+async def test_slot_lookups_reject_unknown_doctors_and_far_dates(db, clinic):
+    today = datetime.now(timezone.utc).date()
+    doctor_id = clinic.doctors[0].id
+    assert await service.slots_version(db, doctor_id, today.isoformat())
+
+    for doctor, day, code in [
+        (999, today, 404),
+        (doctor_id, today - timedelta(days=2), 400),
+        (doctor_id, date(9999, 12, 31), 400),
+    ]:
+        with pytest.raises(HTTPException) as exc:
+            await service.get_slots_by_date_string(db, doctor, day.isoformat())
+        assert exc.value.status_code == code
+    assert 999 not in service.schedule_index
+
+
+@pytest.mark.asyncio
+async def test_deleting_a_client_or_doctor_frees_their_cached_slots(db, clinic):
+    day = date.today() + timedelta(days=30)
+    doctor_id = clinic.doctors[0].id
+    db.add_all([clinic.appointment(slot_start(day, 1)), clinic.appointment(slot_start(day, 2), client=1)])
+    await db.commit()
+    db.expunge_all()
+
+    async def calendar() -> dict[int, int]:
+        load = await service.get_calendar_load(db, day, day)
+        return {entry["doctor_id"]: entry["free_slots"][0] for entry in load["doctors"]}
+
+    assert not await service._free_slot_bits(db, doctor_id, day) & 0b110
+    assert (await calendar())[doctor_id] == SLOTS_PER_DAY - 2
+
+    await delete_client(db, clinic.clients[0].id)
+    assert await service._free_slot_bits(db, doctor_id, day) & 0b110 == 0b010
+    assert (await calendar())[doctor_id] == SLOTS_PER_DAY - 1
+
+    await delete_doctor(db, doctor_id)
+    assert doctor_id not in await calendar()
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.appointments.intervals import BusyIntervals
+from app.appointments.models import ACTIVE_APPOINTMENT, Appointment
+from app.appointments.schedule import SLOTS_PER_DAY, slot_start
+from app.core import seed
+from app.core.db import Base
+from app.pets.models import Pet
+
+NOW = datetime(2030, 1, 10, 12, tzinfo=timezone.utc)
+SCALE = {"doctors": 3, "clients": 20, "pets_per_client": 2, "appointments": 150, "days_back": 10, "days_ahead": 5}
+
+
+async def _seeded(tmp_path, monkeypatch, name: str, rng_seed: int):
+    """Engine of a fresh database filled by seed.seed() at a small scale."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(seed, "engine", engine)
+    monkeypatch.setattr(seed, "async_session_factory", async_sessionmaker(engine, expire_on_commit=False))
+    await seed.seed(**SCALE, rng_seed=rng_seed, batch_size=64, bcrypt_rounds=4, now=NOW)
+    return engine
+
+
+async def _dump(engine) -> dict[str, list[tuple]]:
+    """Every seeded table, row by row; the password hash is salted, so it is left out."""
+    tables = {
+        "users": "id, email, role", "doctors": "*", "clients": "*", "pets": "*", "appointments": "*",
+        "client_search": "rowid, *",
+    }
+    async with engine.connect() as conn:
+        return {
+            table: (await conn.execute(text(f"SELECT {columns} FROM {table} ORDER BY 1"))).all()
+            for table, columns in tables.items()
+        }
+
+
+@pytest.mark.asyncio
+async def test_same_seed_gives_the_same_rows(tmp_path, monkeypatch):
+    first = await _seeded(tmp_path, monkeypatch, "first.db", rng_seed=7)
+    second = await _seeded(tmp_path, monkeypatch, "second.db", rng_seed=7)
+    other = await _seeded(tmp_path, monkeypatch, "other.db", rng_seed=8)
+    try:
+        rows = await _dump(first)
+        assert len(rows["appointments"]) == SCALE["appointments"]
+        assert rows == await _dump(second)
+        assert rows["appointments"] != (await _dump(other))["appointments"]
+    finally:
+        for engine in (first, second, other):
+            await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_seeded_rows_satisfy_keys_and_never_overlap(tmp_path, monkeypatch):
+    engine = await _seeded(tmp_path, monkeypatch, "seed.db", rng_seed=42)
+    try:
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("PRAGMA foreign_key_check"))).all() == []
+            # The visit's pet belongs to the visit's client.
+            owners = dict((await conn.execute(select(Pet.id, Pet.owner_id))).all())
+            visits = (await conn.execute(select(
+                Appointment.doctor_id, Appointment.client_id, Appointment.pet_id,
+                Appointment.date_time, Appointment.duration_minutes,
+            ).where(ACTIVE_APPOINTMENT).order_by(Appointment.doctor_id, Appointment.date_time))).all()
+    finally:
+        await engine.dispose()
+
+    assert visits
+    first_day = (NOW - timedelta(days=SCALE["days_back"])).date()
+    grid = {
+        slot_start(first_day + timedelta(days=d), slot).replace(tzinfo=None)
+        for d in range(SCALE["days_back"] + SCALE["days_ahead"]) for slot in range(SLOTS_PER_DAY)
+    }
+    busy: dict[int, BusyIntervals] = {}
+    for doctor_id, client_id, pet_id, starts_at, minutes in visits:
+        assert owners[pet_id] == client_id
+        assert starts_at in grid  # on the same slot grid the booking checks use
+        ends_at = starts_at + timedelta(minutes=minutes)
+        doctor_busy = busy.setdefault(doctor_id, BusyIntervals())
+        assert not doctor_busy.overlaps(starts_at, ends_at)
+        doctor_busy.add(starts_at, ends_at)
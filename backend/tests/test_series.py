@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import func, select
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.appointments.models import Appointment
+from app.appointments.schemas import AppointmentSeriesCreate
+from app.appointments.service import create_appointment_series_for_client, series_conflict_query
+
+
+def test_recurrence_expands_to_utc_occurrences():
+    series = AppointmentSeriesCreate(
+        doctor_id=1, pet_id=1, recurrence={"first": "2030-01-01T10:00:00+02:00", "every_days": 7, "count": 3},
+    )
+    first = datetime(2030, 1, 1, 8, tzinfo=timezone.utc)
+    assert series.occurrences() == [first, first + timedelta(days=7), first + timedelta(days=14)]
+
+
+def test_explicit_dates_are_sorted_and_unique():
+    series = AppointmentSeriesCreate(doctor_id=1, pet_id=1, date_times=["2030-01-02T10:00:00Z", "2030-01-01T10:00:00Z"])
+    assert [dt.day for dt in series.occurrences()] == [1, 2]
+
+    with pytest.raises(ValidationError):
+        AppointmentSeriesCreate(doctor_id=1, pet_id=1, date_times=["2030-01-01T10:00:00Z"] * 2)
+
+
+@pytest.mark.parametrize("schedule", [
+    {},
+    {"date_times": ["2030-01-01T10:00:00Z"], "recurrence": {"first": "2030-01-01T10:00:00Z", "every_days": 1, "count": 2}},
+    {"date_times": ["2000-01-01T10:00:00Z"]},
+    {"recurrence": {"first": "2030-01-01T10:00:00Z", "every_days": 1, "count": 50}},
+])
+def test_invalid_series_is_rejected(schedule):
+    with pytest.raises(ValidationError):
+        AppointmentSeriesCreate(doctor_id=1, pet_id=1, **schedule)
+
+
+def _weekly(clinic, count: int = 3) -> AppointmentSeriesCreate:
+    return AppointmentSeriesCreate(
+        doctor_id=clinic.doctors[0].id, pet_id=clinic.pets[0].id, reason="Physio",
+        recurrence={"first": "2030-01-01T10:00:00Z", "every_days": 7, "count": count},
+    )
+
+
+async def _count(db) -> int:
+    return await db.scalar(select(func.count()).select_from(Appointment))
+
+
+@pytest.mark.asyncio
+async def test_series_is_inserted_and_returned_with_relationships(db, clinic):
+    booked = await create_appointment_series_for_client(db, _weekly(clinic), clinic.as_client(0))
+
+    assert [a.date_time for a in booked] == [datetime(2030, 1, d, 10) for d in (1, 8, 15)]
+    assert {(a.client.full_name, a.doctor.full_name, a.pet.name, a.reason) for a in booked} == {
+        ("Ann Lee", "Dr. Adams", "Rex", "Physio"),
+    }
+    assert await _count(db) == 3
+
+
+@pytest.mark.asyncio
+async def test_clash_with_an_existing_booking_books_nothing(db, clinic):
+    # Another client's 90-minute visit starting before the second occurrence reaches into it.
+    db.add(clinic.appointment(datetime(2030, 1, 8, 9), client=1, minutes=90))
+    await db.commit()
+
+    with pytest.raises(HTTPException) as exc:
+        await create_appointment_series_for_client(db, _weekly(clinic), clinic.as_client(0))
+    assert exc.value.status_code == 409
+    assert "2030-01-08T10:00:00" in exc.value.detail
+    assert await _count(db) == 1
+
+
+@pytest.mark.asyncio
+async def test_occurrences_overlapping_each_other_are_rejected(db, clinic):
+    series = AppointmentSeriesCreate(
+        doctor_id=clinic.doctors[0].id, pet_id=clinic.pets[0].id, duration_minutes=45,
+        date_times=["2030-01-01T10:00:00Z", "2030-01-01T10:30:00Z"],
+    )
+    with pytest.raises(HTTPException) as exc:
+        await create_appointment_series_for_client(db, series, clinic.as_client(0))
+    assert exc.value.status_code == 400
+    assert await _count(db) == 0
+
+
+def test_conflict_probe_is_one_index_range_per_occurrence(query_plan):
+    starts = [datetime(2030, 1, 1, 10) + timedelta(days=90 * i) for i in range(3)]
+    plan = query_plan(series_conflict_query(1, starts, timedelta(minutes=45)))
+    ranges = "USING INDEX ix_appointments_doctor_id_date_time_active (doctor_id=? AND date_time>? AND date_time<?)"
+    assert plan.count(ranges) == 3
@@ -0,0 +1,81 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.appointments.events import doctor_topic, schedule_events
+from app.appointments.models import Appointment, AppointmentStatus
+from app.appointments.sweeper import AppointmentSweeper
+
+NOW = datetime(2030, 1, 10, 12, tzinfo=timezone.utc)
+
+
+def _sweeper(session_factory, **kwargs) -> AppointmentSweeper:
+    options = {"interval_seconds": 60, "grace": timedelta(hours=24), "batch_size": 2, "lease_seconds": 120}
+    return AppointmentSweeper(session_factory=session_factory, **{**options, **kwargs})
+
+
+async def _add(session_factory, *rows: tuple[timedelta, AppointmentStatus]) -> None:
+    async with session_factory() as db:
+        await db.execute(insert(Appointment), [
+            {"date_time": NOW - age, "status": status, "reason": "-", "client_id": 1, "doctor_id": 1, "pet_id": 1}
+            for age, status in rows
+        ])
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_sweeps_only_planned_rows_past_grace_in_batches(session_factory):
+    await _add(
+        session_factory,
+        *[(timedelta(days=d), AppointmentStatus.PLANNED) for d in range(2, 7)],
+        (timedelta(hours=3), AppointmentStatus.PLANNED),
+        (timedelta(days=3), AppointmentStatus.CANCELLED),
+        (timedelta(days=3), AppointmentStatus.COMPLETED),
+    )
+    sweeper = _sweeper(session_factory)
+
+    assert await sweeper.sweep_once(now=NOW) == 5
+    assert sweeper.batches == 3  # 2 + 2 + 1
+    assert await sweeper.sweep_once(now=NOW) == 0
+
+    async with session_factory() as db:
+        statuses = (await db.scalars(select(Appointment.status).order_by(Appointment.id))).all()
+    assert statuses == [AppointmentStatus.NO_SHOW] * 5 + [
+        AppointmentStatus.PLANNED, AppointmentStatus.CANCELLED, AppointmentStatus.COMPLETED,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_only_the_lease_holder_sweeps(session_factory):
+    await _add(session_factory, (timedelta(days=2), AppointmentStatus.PLANNED))
+    first, second = _sweeper(session_factory), _sweeper(session_factory)
+
+    assert await first.sweep_once(now=NOW) == 1
+    await _add(session_factory, (timedelta(days=2), AppointmentStatus.PLANNED))
+    assert await second.sweep_once(now=NOW) == 0
+    assert second.skipped == 1 and not second.lease_held
+
+    # Once the holder's lease lapses, the next worker to ask takes over.
+    first.lease_seconds = -1
+    assert await first.sweep_once(now=NOW) == 1
+    assert await second.sweep_once(now=NOW) == 0
+    assert second.lease_held and second.skipped == 1
+
+
+@pytest.mark.asyncio
+async def test_swept_rows_are_published_as_no_shows(session_factory):
+    await _add(session_factory, *[(timedelta(days=d), AppointmentStatus.PLANNED) for d in (2, 3, 4)])
+    subscription = schedule_events.subscribe([doctor_topic(1)])
+    try:
+        assert await _sweeper(session_factory).sweep_once(now=NOW) == 3
+        batch = await subscription.next_batch(timeout=1)
+    finally:
+        schedule_events.unsubscribe(subscription)
+
+    events = [(kind, json.loads(data)) for kind, data in batch]
+    assert {kind for kind, _ in events} == {"no_show"}
+    assert sorted(payload["id"] for _, payload in events) == [1, 2, 3]
+    assert {payload["status"] for _, payload in events} == {"no_show"}
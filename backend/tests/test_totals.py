@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.core.cache import TTLCache
+from app.core.totals import RowCounters, TotalsMode, count_total, row_counts
+from app.pets.models import Pet
+
+
+class FakeSession:
+    def __init__(self, count):
+        self.count = count
+        self.queries = 0
+
+    async def scalar(self, stmt):
+        self.queries += 1
+        await asyncio.sleep(0)
+        return self.count
+
+
+def test_update_keeps_expiry_and_skips_missing_keys():
+    now = [0.0]
+    cache = TTLCache(max_size=10, ttl_seconds=10, clock=lambda: now[0])
+    cache.set("k", 1)
+    now[0] = 5
+    cache.update("k", lambda v: v + 1)
+    cache.update("missing", lambda v: v + 1)
+    assert cache.get("k") == 2 and "missing" not in cache
+    now[0] = 11
+    assert cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_counters_load_once_then_follow_writes():
+    counters = RowCounters(max_size=10, ttl_seconds=60)
+    db = FakeSession(count=3)
+    query = select(func.count()).select_from(Pet)
+
+    assert await counters.get_or_count(db, ("pets", "owner", 1), query) == 3
+    counters.adjust(("pets", "owner", 1), +2)
+    counters.adjust(("pets", "owner", 2), +1)
+    assert await counters.get_or_count(db, ("pets", "owner", 1), query) == 5
+    assert db.queries == 1
+
+
+@pytest.mark.asyncio
+async def test_adjust_during_load_discards_the_loaded_count():
+    counters = RowCounters(max_size=10, ttl_seconds=60)
+    db = FakeSession(count=3)
+    query = select(func.count()).select_from(Pet)
+
+    loading = asyncio.create_task(counters.get_or_count(db, "k", query))
+    await asyncio.sleep(0)
+    counters.adjust("k", +1)
+    assert await loading == 3
+    db.count = 4
+    assert await counters.get_or_count(db, "k", query) == 4
+
+
+@pytest.mark.asyncio
+async def test_count_total_modes():
+    db = FakeSession(count=7)
+    query = select(func.count()).select_from(Pet)
+    row_counts.clear()
+
+    assert await count_total(db, TotalsMode.NONE, query, "k") is None
+    assert await count_total(db, TotalsMode.EXACT, query, "k") == 7
+    assert await count_total(db, TotalsMode.CACHED, query, None) == 7
+    assert await count_total(db, TotalsMode.CACHED, query, "k") == 7
+    assert await count_total(db, TotalsMode.CACHED, query, "k") == 7
+    assert db.queries == 3
@@ -0,0 +1,102 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.main import app  # noqa: F401  registers every mapper
+from app.appointments import service
+from app.appointments.models import Appointment, AppointmentStatus
+from app.appointments.schedule import slot_start
+
+TOMORROW = datetime.now(timezone.utc).date() + timedelta(days=1)
+
+
+@pytest_asyncio.fixture
+async def visit(db, clinic):
+    """A planned visit of doctors[0] with clients[0], tomorrow in grid slot 2."""
+    appointment = clinic.appointment(slot_start(TOMORROW, 2))
+    db.add(appointment)
+    await db.commit()
+    db.expunge(appointment)
+    return appointment
+
+
+async def _status_error(call) -> int:
+    with pytest.raises(HTTPException) as exc:
+        await call
+    return exc.value.status_code
+
+
+@pytest.mark.asyncio
+async def test_owner_cancels_and_doctor_completes_planned_visits(db, clinic, visit):
+    cancelled = await service.cancel_appointment(db, visit.id, clinic.as_client(0))
+    assert cancelled.status == AppointmentStatus.CANCELLED
+
+    other = clinic.appointment(slot_start(TOMORROW, 5))
+    db.add(other)
+    await db.commit()
+    completed = await service.complete_appointment(db, other.id, clinic.as_doctor(0))
+    assert completed.status == AppointmentStatus.COMPLETED
+    assert completed.client.full_name == "Ann Lee"  # returned with its relationships loaded
+
+
+@pytest.mark.asyncio
+async def test_second_of_two_competing_transitions_conflicts(session_factory, clinic, visit):
+    async def cancel():
+        async with session_factory() as db:
+            return await service.cancel_appointment(db, visit.id, clinic.as_client(0))
+
+    async def complete():
+        async with session_factory() as db:
+            return await service.complete_appointment(db, visit.id, clinic.as_doctor(0))
+
+    results = await asyncio.gather(cancel(), complete(), return_exceptions=True)
+    won = [r for r in results if not isinstance(r, Exception)]
+    lost = [r for r in results if isinstance(r, Exception)]
+    assert len(won) == 1 and len(lost) == 1
+    assert isinstance(lost[0], HTTPException) and lost[0].status_code == 409
+
+    # Once a visit has left PLANNED, neither transition applies again.
+    async with session_factory() as db:
+        assert await _status_error(service.cancel_appointment(db, visit.id, clinic.as_client(0))) == 409
+
+
+@pytest.mark.asyncio
+async def test_only_the_visits_own_client_and_doctor_may_transition_it(db, clinic, visit):
+    assert await _status_error(service.cancel_appointment(db, visit.id, clinic.as_client(1))) == 403
+    assert await _status_error(service.complete_appointment(db, visit.id, clinic.as_doctor(1))) == 403
+    assert await _status_error(service.cancel_appointment(db, visit.id, clinic.as_doctor(0))) == 403
+    assert await _status_error(service.complete_appointment(db, visit.id, clinic.as_client(0))) == 403
+
+    assert await db.scalar(select(Appointment.status).where(Appointment.id == visit.id)) == AppointmentStatus.PLANNED
+
+
+@pytest.mark.asyncio
+async def test_missing_visit_is_404(db, clinic):
+    assert await _status_error(service.cancel_appointment(db, 404, clinic.as_client(0))) == 404
+    assert await _status_error(service.complete_appointment(db, 404, clinic.as_doctor(0))) == 404
+
+
+@pytest.mark.asyncio
+async def test_no_show_can_be_completed_but_not_cancelled(db, clinic):
+    no_show = clinic.appointment(datetime(2030, 1, 7, 9), status=AppointmentStatus.NO_SHOW)
+    db.add(no_show)
+    await db.commit()
+    db.expunge(no_show)
+
+    assert await _status_error(service.cancel_appointment(db, no_show.id, clinic.as_client(0))) == 409
+    completed = await service.complete_appointment(db, no_show.id, clinic.as_doctor(0))
+    assert completed.status == AppointmentStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_cancelled_slot_is_offered_again(db, clinic, visit):
+    doctor_id, day = clinic.doctors[0].id, TOMORROW.isoformat()
+    booked = slot_start(TOMORROW, 2).replace(tzinfo=timezone.utc).isoformat()
+
+    assert booked not in await service.get_slots_by_date_string(db, doctor_id, day)
+    await service.cancel_appointment(db, visit.id, clinic.as_client(0))
+    assert booked in await service.get_slots_by_date_string(db, doctor_id, day)
@@ -1,24 +1,64 @@
 import { api } from '../../../shared/api/api';
-import type { Appointment, AppointmentCreate } from '../model/types';
+import { API_URL } from '../../../shared/config/config';
+import type { Appointment, AppointmentCreate, AppointmentStatus } from '../model/types';
 
 export interface PaginatedResponse<T> {
     items: T[];
     total: number;
+    next_cursor?: string | null;
 }
 
 export interface GetAppointmentsParams {
     page?: number;
     limit?: number;
+    cursor?: string;
     start_date?: string;
     end_date?: string;
 }
 
+export interface DoctorCalendarLoad {
+    doctor_id: number;
+    booked: number[];
+    free_slots: number[];
+}
+
+export interface CalendarLoad {
+    start_date: string;
+    end_date: string;
+    slots_per_day: number;
+    doctors: DoctorCalendarLoad[];
+}
+
+export interface ScheduleEvent {
+    // 'overflow' means events were lost: reload the view, the stream then reconnects.
+    type: 'booked' | 'cancelled' | 'completed' | 'no_show' | 'deleted' | 'overflow';
+    id?: number;
+    doctor_id?: number;
+    date_time?: string;
+    duration_minutes?: number;
+    status?: AppointmentStatus;
+}
+
 export const appointmentApi = {
     getAll: async (params: GetAppointmentsParams = {}) => {
         const response = await api.get<PaginatedResponse<Appointment>>('/appointments/', { params });
         return response.data;
     },
 
+    // Whole date range (calendar views): follows next_cursor until the range is exhausted.
+    getRange: async (start_date: string, end_date: string) => {
+        const params: GetAppointmentsParams = { start_date, end_date, limit: 500 };
+        const first = await appointmentApi.getAll(params);
+        const items = [...first.items];
+        let cursor = first.next_cursor;
+        while (cursor) {
+            const next = await appointmentApi.getAll({ ...params, cursor });
+            items.push(...next.items);
+            cursor = next.next_cursor;
+        }
+        return { items, total: first.total };
+    },
+
     getById: async (id: number) => {
         const response = await api.get<Appointment>(`/appointments/${id}`);
         return response.data;
@@ -29,6 +69,14 @@ export const appointmentApi = {
         return response.data;
     },
 
+    getCalendarLoad: async (start_date: string, end_date: string, doctor_ids?: number[]) => {
+        const response = await api.get<CalendarLoad>('/appointments/calendar', {
+            params: { start_date, end_date, doctor_ids },
+            paramsSerializer: { indexes: null }
+        });
+        return response.data;
+    },
+
     getSlots: async (doctorId: number, date: string) => {
         const response = await api.get<string[]>('/appointments/slots', {
             params: { doctor_id: doctorId, date }
@@ -48,5 +96,43 @@ export const appointmentApi = {
 
     delete: async (id: number) => {
         await api.delete(`/appointments/${id}`);
+    },
+
+    // Live schedule changes for these doctors and the user's own profile. EventSource cannot
+    // send the Authorization header, so the stream is read with fetch. Returns an unsubscribe function.
+    subscribe: (doctorIds: number[], onEvent: (event: ScheduleEvent) => void) => {
+        const controller = new AbortController();
+        const query = new URLSearchParams(doctorIds.map((id) => ['doctor_ids', String(id)]));
+
+        const connect = async () => {
+            while (!controller.signal.aborted) {
+                try {
+                    const response = await fetch(`${API_URL}/appointments/events?${query}`, {
+                        headers: { Authorization: `Bearer ${localStorage.getItem('token') ?? ''}` },
+                        signal: controller.signal,
+                    });
+                    if (!response.ok || !response.body) return;
+                    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+                    let buffer = '';
+                    for (;;) {
+                        const { value, done } = await reader.read();
+                        if (done) break;
+                        buffer += value;
+                        const frames = buffer.split('\n\n');
+                        buffer = frames.pop() ?? '';
+                        for (const frame of frames) {
+                            const type = frame.match(/^event: (.*)$/m)?.[1];
+                            const data = frame.match(/^data: (.*)$/m)?.[1];
+                            if (type && data) onEvent({ ...JSON.parse(data), type });
+                        }
+                    }
+                } catch {
+                    if (controller.signal.aborted) return;
+                }
+                await new Promise((resolve) => setTimeout(resolve, 5000));
+            }
+        };
+        void connect();
+        return () => controller.abort();
     }
 };
\ No newline at end of file
@@ -1,7 +1,8 @@
 export const AppointmentStatus = {
     PLANNED: 'planned',
     COMPLETED: 'completed',
-    CANCELLED: 'cancelled'
+    CANCELLED: 'cancelled',
+    NO_SHOW: 'no_show'
 }
 
 export type AppointmentStatus = typeof AppointmentStatus[keyof typeof AppointmentStatus];
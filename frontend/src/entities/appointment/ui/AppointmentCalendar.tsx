@@ -449,6 +449,7 @@ const AppointmentDetailModal = ({
         planned: 'bg-blue-100 text-blue-800',
         completed: 'bg-green-100 text-green-800',
         cancelled: 'bg-red-100 text-red-800',
+        no_show: 'bg-amber-100 text-amber-800',
     };
 
     return (
@@ -39,6 +39,8 @@ export const AppointmentList = ({ appointments, isLoading }: AppointmentListProp
                 return 'bg-green-50 text-green-700 ring-green-600/20';
             case AppointmentStatus.CANCELLED:
                 return 'bg-red-50 text-red-700 ring-red-600/20';
+            case AppointmentStatus.NO_SHOW:
+                return 'bg-amber-50 text-amber-700 ring-amber-600/20';
             default:
                 return 'bg-gray-50 text-gray-700 ring-gray-600/20';
         }
@@ -6,6 +6,12 @@ export interface Client {
     address?: string;
 }
 
+export interface ClientSearchPage {
+    items: Client[];
+    total: number;
+    truncated: boolean;
+}
+
 export interface ClientCreate {
     email: string;
     password: string;
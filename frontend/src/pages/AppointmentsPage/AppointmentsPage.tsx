@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Views, type View } from 'react-big-calendar';
 import { startOfMonth, endOfMonth } from 'date-fns';
@@ -37,23 +37,16 @@ export const AppointmentsPage = () => {
     const fetchAppointments = useCallback(async () => {
         setIsLoading(true);
         try {
-            let params = {};
+            let data;
 
             if (viewMode === 'calendar') {
                 // В режиме календаря грузим диапазон (например, месяц)
                 // react-big-calendar иногда запрашивает дни с предыдущего месяца, поэтому берем с запасом
-                params = {
-                    start_date: dateRange.start.toISOString(),
-                    end_date: dateRange.end.toISOString()
-                };
+                data = await appointmentApi.getRange(dateRange.start.toISOString(), dateRange.end.toISOString());
             } else {
-                params = {
-                    page: page,
-                    limit: limit
-                };
+                data = await appointmentApi.getAll({ page: page, limit: limit });
             }
 
-            const data = await appointmentApi.getAll(params);
             const filteredItems = viewMode === 'calendar'
                 ? data.items.filter((apt: Appointment) => apt.status !== 'cancelled')
                 : data.items;
@@ -71,6 +64,15 @@ export const AppointmentsPage = () => {
         fetchAppointments();
     }, [fetchAppointments]);
 
+    // Clients see their own bookings change live; admins have no profile to subscribe to.
+    // The ref keeps one stream open while the page or range changes.
+    const refetch = useRef(fetchAppointments);
+    refetch.current = fetchAppointments;
+    useEffect(() => {
+        if (user?.role !== 'client') return;
+        return appointmentApi.subscribe([], () => refetch.current());
+    }, [user?.role]);
+
     // --- HANDLERS ---
     const handleCancel = async (id: number) => {
         if (!window.confirm(t('appointments.actions.confirm_cancel'))) return;
@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { Views, type View } from 'react-big-calendar';
 import { startOfMonth, endOfMonth } from 'date-fns';
 import { useTranslation } from 'react-i18next';
@@ -38,23 +38,16 @@ export const DoctorSchedulePage = () => {
     const fetchAppointments = useCallback(async () => {
         setIsLoading(true);
         try {
-            let params = {};
+            let data;
 
             if (viewMode === 'calendar') {
                 // В режиме календаря грузим диапазон
-                params = {
-                    start_date: dateRange.start.toISOString(),
-                    end_date: dateRange.end.toISOString()
-                };
+                data = await appointmentApi.getRange(dateRange.start.toISOString(), dateRange.end.toISOString());
             } else {
                 // В режиме списка грузим пагинацию
-                params = {
-                    page: page,
-                    limit: limit
-                };
+                data = await appointmentApi.getAll({ page: page, limit: limit });
             }
 
-            const data = await appointmentApi.getAll(params);
             // Фильтруем отмененные записи для календаря
             const filteredItems = viewMode === 'calendar' 
                 ? data.items.filter((apt: Appointment) => apt.status !== 'cancelled')
@@ -73,6 +66,14 @@ export const DoctorSchedulePage = () => {
         fetchAppointments();
     }, [fetchAppointments]);
 
+    // Bookings, cancellations and no-shows of this doctor appear without a reload.
+    const refetch = useRef(fetchAppointments);
+    refetch.current = fetchAppointments;
+    useEffect(() => {
+        if (user?.role !== UserRole.DOCTOR) return;
+        return appointmentApi.subscribe([], () => refetch.current());
+    }, [user?.role]);
+
     // Callback календаря при смене месяца/недели
     const onRangeChange = useCallback((range: Date[] | { start: Date; end: Date }) => {
         let start: Date, end: Date;
@@ -3,9 +3,9 @@ import { useTranslation } from 'react-i18next';
 import { Header } from '../../widgets/Header/Header';
 import { EditClientForm } from '../../widgets/EditClientForm/EditClientForm';
 import { api } from '../../shared/api/api';
-import { Button, Alert } from '../../shared/ui';
+import { Button, Alert, Input } from '../../shared/ui';
 import { Modal } from '../../shared/ui/Modal/Modal';
-import type { Client } from '../../entities/client/model/types';
+import type { Client, ClientSearchPage } from '../../entities/client/model/types';
 
 export const ManageClientsPage = () => {
     const { t } = useTranslation();
@@ -13,12 +13,24 @@ export const ManageClientsPage = () => {
     const [isLoading, setIsLoading] = useState(true);
     const [error, setError] = useState('');
     const [editingClient, setEditingClient] = useState<Client | null>(null);
+    const [query, setQuery] = useState('');
+    const [truncated, setTruncated] = useState(false);
+
+    // Name, phone digits or email; the server needs at least 3 characters.
+    const searchTerm = query.trim().length >= 3 ? query.trim() : '';
 
     const fetchClients = async () => {
         setIsLoading(true);
         try {
-            const res = await api.get<Client[]>('/clients/');
-            setClients(res.data);
+            if (searchTerm) {
+                const res = await api.get<ClientSearchPage>('/clients/search', { params: { q: searchTerm } });
+                setClients(res.data.items);
+                setTruncated(res.data.truncated);
+            } else {
+                const res = await api.get<Client[]>('/clients/');
+                setClients(res.data);
+                setTruncated(false);
+            }
         } catch (e) {
             console.error(e);
             setError(t('clients.errors.fetch_failed'));
@@ -39,8 +51,9 @@ export const ManageClientsPage = () => {
     };
 
     useEffect(() => {
-        fetchClients();
-    }, []);
+        const timer = setTimeout(fetchClients, searchTerm ? 200 : 0);
+        return () => clearTimeout(timer);
+    }, [searchTerm]);
 
     return (
         <div className="min-h-screen bg-gray-50 pb-12">
@@ -51,6 +64,17 @@ export const ManageClientsPage = () => {
                     <Button onClick={fetchClients} variant="outline">{t('clients.refresh')}</Button>
                 </div>
 
+                <div className="mb-6 max-w-md">
+                    <Input
+                        type="search"
+                        value={query}
+                        onChange={(e) => setQuery(e.target.value)}
+                        placeholder={t('clients.search_placeholder')}
+                    />
+                </div>
+
+                {truncated && <Alert variant="info" className="mb-6">{t('clients.search_truncated')}</Alert>}
+
                 {error && <Alert variant="error" title={t('common.error')}>{error}</Alert>}
 
                 <div className="bg-white rounded-3xl shadow-xl shadow-gray-200/50 border border-gray-100 overflow-hidden">